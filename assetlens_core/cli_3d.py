@@ -5,16 +5,18 @@ import os
 import shutil
 import subprocess
 from pathlib import Path
+from typing import Annotated
 
 import typer
 
 from .config.assembly_rules import default_assembly_rules
 from .config.config import load_3d_config
-from .eval.evaluation_3d import evaluate_3d
+from .domain.mask_rle import validate_mask_encoding
+from .eval.evaluation_3d import evaluate_3d, merge_eval_3d_partials
 from .pipelines.assembly_graph_builder import build_assembly_graph, write_assembly_graph
 from .pipelines.bom_builder import bom_from_assembly_graph
 from .pipelines.pipeline_3d_dataset import convert_asset_id_images_to_labels, write_meta_json
-from .pipelines.pipeline_3d_parts import run_3d_batch
+from .pipelines.pipeline_3d_parts import load_run_3d, run_3d_batch
 
 
 app = typer.Typer(no_args_is_help=True)
@@ -31,15 +33,52 @@ def run_cmd(config: Path = typer.Option(..., "--config")) -> None:
 def eval_cmd(
     config: Path = typer.Option(..., "--config"),
     labels: Path = typer.Option(..., "--labels"),
+    from_run: Annotated[
+        bool,
+        typer.Option("--from-run/--rerun", help="Score run_3d.jsonl in output_dir, or re-run the pipeline first."),
+    ] = True,
+    model_ids: Annotated[
+        list[str] | None,
+        typer.Option("--models", help="Only score these labelled model ids (repeatable)."),
+    ] = None,
+    sample: Annotated[
+        float | None,
+        typer.Option("--sample", help="Only score this fraction of labelled models, chosen by --sample-seed."),
+    ] = None,
+    sample_seed: Annotated[int, typer.Option("--sample-seed")] = 0,
+    bootstrap: Annotated[
+        int,
+        typer.Option("--bootstrap", help="Add confidence intervals from this many bootstrap resamples (0 = off)."),
+    ] = 0,
 ) -> None:
     cfg = load_3d_config(config)
-    outputs = run_3d_batch(cfg)
-    summary = evaluate_3d(labels_path=labels, models=outputs.models, output_dir=cfg.output_dir)
+    if from_run:
+        outputs = load_run_3d(cfg.output_dir, cfg.run_id)
+    else:
+        outputs = run_3d_batch(cfg)
+    summary = evaluate_3d(
+        labels_path=labels,
+        models=outputs.models,
+        output_dir=cfg.output_dir,
+        model_ids=model_ids,
+        sample_fraction=sample,
+        sample_seed=sample_seed,
+        bootstrap=bootstrap,
+    )
     typer.echo(
         f"OK: count_acc={summary.count_accuracy:.3f} precision={summary.precision:.3f} recall={summary.recall:.3f} f1={summary.f1:.3f}"
     )
 
 
+@app.command("eval-merge")
+def eval_merge_cmd(
+    partials: Annotated[list[Path], typer.Argument(help="eval_3d_partial.json files to combine.")],
+    out: Annotated[Path, typer.Option("--out")],
+) -> None:
+    summary = merge_eval_3d_partials(partial_paths=partials, output_dir=out)
+    typer.echo(f"OK: merged {len(partials)} partials over {summary.num_models} models f1={summary.f1:.3f}")
+
+
 def _get_blender_exe() -> str:
     exe_env = os.environ.get("BLENDER_BIN")
     if exe_env:
@@ -106,6 +145,7 @@ def _run_blender_render(
     views: int,
     res: int,
     seed: int,
+    id_format: str = "color",
 ) -> None:
     if blender_exe is None:
         raise ValueError("blender_exe must not be None.")
@@ -132,6 +172,8 @@ def _run_blender_render(
         str(int(res)),
         "--seed",
         str(int(seed)),
+        "--id-format",
+        str(id_format),
     ]
 
     proc = subprocess.run(cmd, capture_output=True, text=True)
@@ -155,6 +197,13 @@ def dataset_cmd(
     views: int = typer.Option(12, "--views"),
     res: int = typer.Option(1024, "--res"),
     seed: int = typer.Option(0, "--seed"),
+    mask_encoding: Annotated[str, typer.Option("--mask-encoding")] = "indices",
+    labels_store: Annotated[bool, typer.Option("--labels-store/--no-labels-store")] = True,
+    workers: Annotated[int, typer.Option("--workers")] = 1,
+    id_format: Annotated[str, typer.Option("--id-format")] = "color",
+    visibility: Annotated[bool, typer.Option("--visibility/--no-visibility")] = True,
+    color_decode: Annotated[str, typer.Option("--color-decode")] = "exact",
+    max_color_distance: Annotated[float | None, typer.Option("--max-color-distance")] = None,
 ) -> None:
     if out is None:
         raise ValueError("--out must not be None.")
@@ -164,6 +213,13 @@ def dataset_cmd(
         raise ValueError("--res must be 8 or greater.")
     if seed < 0:
         raise ValueError("--seed must be zero or greater.")
+    if workers < 1:
+        raise ValueError("--workers must be one or greater.")
+    if id_format not in ("color", "index"):
+        raise ValueError("--id-format must be 'color' or 'index'.")
+    if color_decode not in ("exact", "nearest"):
+        raise ValueError("--color-decode must be 'exact' or 'nearest'.")
+    validate_mask_encoding(mask_encoding)
 
     blender_exe = _get_blender_exe()
     script_path = _find_blender_script()
@@ -184,6 +240,7 @@ def dataset_cmd(
             views=views,
             res=res,
             seed=seed,
+            id_format=id_format,
         )
 
         id_dir = asset_out_dir / "images_id"
@@ -193,15 +250,27 @@ def dataset_cmd(
         if rgb_dir.exists() is not True:
             raise RuntimeError(f"images_rgb missing after render: {rgb_dir}")
 
-        mapping_path = asset_out_dir / "color_to_part.json"
+        if id_format == "index":
+            mapping_path = asset_out_dir / "part_index.json"
+        else:
+            mapping_path = asset_out_dir / "color_to_part.json"
         if mapping_path.exists() is not True:
-            raise RuntimeError(f"color_to_part.json missing after render: {mapping_path}")
+            raise RuntimeError(f"{mapping_path.name} missing after render: {mapping_path}")
 
         scene_graph_path = asset_out_dir / "scene_graph.json"
         if scene_graph_path.exists() is not True:
             raise RuntimeError(f"scene_graph.json missing after render: {scene_graph_path}")
 
-        convert_asset_id_images_to_labels(asset_dir=asset_out_dir)
+        convert_asset_id_images_to_labels(
+            asset_dir=asset_out_dir,
+            mask_encoding=mask_encoding,
+            write_store=labels_store,
+            workers=workers,
+            id_format=id_format,
+            write_visibility=visibility,
+            color_decode=color_decode,
+            max_color_distance=max_color_distance,
+        )
         write_meta_json(glb_path=glb_path, asset_dir=asset_out_dir, seed=seed, views=views, res=res)
 
     typer.echo(f"OK: rendered dataset for {len(glb_paths)} GLB assets to {out}")
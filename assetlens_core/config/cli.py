@@ -1,12 +1,13 @@
 from __future__ import annotations
 
 from pathlib import Path
+from typing import Annotated
 
 import typer
 
 from .config import load_2d_config
-from ..eval.evaluation_2d import evaluate_2d
-from ..pipelines.pipeline_2d_assets import run_2d_batch
+from ..eval.evaluation_2d import evaluate_2d, evaluate_2d_runs, evaluate_2d_stream, merge_eval_2d_partials
+from ..pipelines.pipeline_2d_assets import iter_run_2d, refresh_dataset_manifest, run_2d_batch
 
 
 app = typer.Typer(no_args_is_help=True)
@@ -19,19 +20,136 @@ def run_cmd(config: Path = typer.Option(..., "--config")) -> None:
     typer.echo(f"OK: ran 2D pipeline for {outputs.summary.num_images} images")
 
 
+@app.command("manifest")
+def manifest_cmd(config: Path = typer.Option(..., "--config")) -> None:
+    cfg = load_2d_config(config)
+    manifest = refresh_dataset_manifest(cfg)
+    typer.echo(f"OK: dataset manifest lists {len(manifest.entries)} images")
+
+
 @app.command("eval")
 def eval_cmd(
     config: Path = typer.Option(..., "--config"),
     labels: Path = typer.Option(..., "--labels"),
+    from_run: Annotated[
+        bool,
+        typer.Option("--from-run/--rerun", help="Score run_2d.jsonl in output_dir, or re-run the pipeline first."),
+    ] = True,
+    workers: Annotated[int, typer.Option("--workers", help="Score images on this many processes.")] = 1,
+    cache: Annotated[
+        bool,
+        typer.Option("--cache/--no-cache", help="Reuse per-image scores from output_dir/eval_2d_cache."),
+    ] = True,
+    cache_max_mb: Annotated[int, typer.Option("--cache-max-mb")] = 256,
+    confusion: Annotated[
+        bool,
+        typer.Option("--confusion", help="Also match across labels and write eval_2d_confusion.json."),
+    ] = False,
+    images: Annotated[
+        list[str] | None,
+        typer.Option("--images", help="Only score these labelled image names (repeatable)."),
+    ] = None,
+    sample: Annotated[
+        float | None,
+        typer.Option("--sample", help="Only score this fraction of labelled images, chosen by --sample-seed."),
+    ] = None,
+    sample_seed: Annotated[int, typer.Option("--sample-seed")] = 0,
+    bootstrap: Annotated[
+        int,
+        typer.Option("--bootstrap", help="Add confidence intervals from this many bootstrap resamples (0 = off)."),
+    ] = 0,
+    boundary: Annotated[
+        bool,
+        typer.Option("--boundary", help="Also report boundary IoU of matched pairs (slower)."),
+    ] = False,
 ) -> None:
+    if workers < 1:
+        raise ValueError("--workers must be one or greater.")
+    if cache_max_mb < 0:
+        raise ValueError("--cache-max-mb must be zero or greater.")
     cfg = load_2d_config(config)
-    outputs = run_2d_batch(cfg)
-    summary = evaluate_2d(labels_path=labels, detections=outputs.detections, output_dir=cfg.output_dir)
+    if from_run:
+        summary = evaluate_2d_stream(
+            labels_path=labels,
+            detections=iter_run_2d(cfg.output_dir, cfg.run_id),
+            output_dir=cfg.output_dir,
+            workers=workers,
+            cache=cache,
+            cache_max_bytes=cache_max_mb * 1024 * 1024,
+            confusion=confusion,
+            images=images,
+            sample_fraction=sample,
+            sample_seed=sample_seed,
+            bootstrap=bootstrap,
+            boundary=boundary,
+        )
+    else:
+        outputs = run_2d_batch(cfg)
+        summary = evaluate_2d(
+            labels_path=labels,
+            detections=outputs.detections,
+            output_dir=cfg.output_dir,
+            workers=workers,
+            cache=cache,
+            cache_max_bytes=cache_max_mb * 1024 * 1024,
+            confusion=confusion,
+            images=images,
+            sample_fraction=sample,
+            sample_seed=sample_seed,
+            bootstrap=bootstrap,
+            boundary=boundary,
+        )
     typer.echo(
         f"OK: mean_iou={summary.mean_iou:.3f} precision={summary.precision_at_50:.3f} recall={summary.recall_at_50:.3f} f1={summary.f1_at_50:.3f}"
     )
 
 
+@app.command("eval-compare")
+def eval_compare_cmd(
+    configs: Annotated[list[Path], typer.Argument(help="Run configs to compare; the first is the baseline.")],
+    labels: Annotated[Path, typer.Option("--labels")],
+    out: Annotated[Path, typer.Option("--out")],
+    workers: Annotated[int, typer.Option("--workers", help="Score images on this many processes.")] = 1,
+    cache: Annotated[
+        bool,
+        typer.Option("--cache/--no-cache", help="Reuse per-image scores from OUT/eval_2d_cache."),
+    ] = True,
+    cache_max_mb: Annotated[int, typer.Option("--cache-max-mb")] = 256,
+    boundary: Annotated[
+        bool,
+        typer.Option("--boundary", help="Also report boundary IoU of matched pairs (slower)."),
+    ] = False,
+) -> None:
+    if workers < 1:
+        raise ValueError("--workers must be one or greater.")
+    if cache_max_mb < 0:
+        raise ValueError("--cache-max-mb must be zero or greater.")
+    cfgs = [load_2d_config(path) for path in configs]
+    summaries = evaluate_2d_runs(
+        labels_path=labels,
+        runs=[iter_run_2d(cfg.output_dir, cfg.run_id) for cfg in cfgs],
+        output_dir=out,
+        workers=workers,
+        cache=cache,
+        cache_max_bytes=cache_max_mb * 1024 * 1024,
+        boundary=boundary,
+    )
+    for run_id, summary in summaries.items():
+        typer.echo(f"{run_id}: mean_iou={summary.mean_iou:.3f} f1={summary.f1_at_50:.3f} ap={summary.ap_50_95:.3f}")
+    typer.echo(f"OK: compared {len(summaries)} runs; wrote {out / 'eval_2d_compare.json'}")
+
+
+@app.command("eval-merge")
+def eval_merge_cmd(
+    partials: Annotated[list[Path], typer.Argument(help="eval_2d_partial.json files to combine.")],
+    out: Annotated[Path, typer.Option("--out")],
+) -> None:
+    summary = merge_eval_2d_partials(partial_paths=partials, output_dir=out)
+    typer.echo(
+        f"OK: merged {len(partials)} partials over {summary.num_images} images mean_iou={summary.mean_iou:.3f} ap={summary.ap_50_95:.3f}"
+    )
+
+
 from ..cli_3d import app as assetlens3d_app
 
 
@@ -3,12 +3,17 @@ from __future__ import annotations
 import hashlib
 import json
 from pathlib import Path
-from typing import TypeVar, Type
+from typing import Literal, TypeVar, Type
 
 import yaml
 from pydantic import BaseModel, ConfigDict, Field, model_validator
 
 
+# Settings that change how outputs are written or executed, not what they
+# contain; they are left out of the derived run_id.
+_RUN_ID_IGNORED_FIELDS_2D = ("run_id", "mask_encoding", "workers", "batch_size", "manifest_path")
+
+
 class TwoDFakeRunnerConfig(BaseModel):
     model_config = ConfigDict(extra="forbid")
 
@@ -33,7 +38,11 @@ class AssetLens2DConfig(BaseModel):
     output_dir: Path = Field(default=Path("outputs"))
     dataset_dir: Path = Field(default=Path("poc_data/2d_cells"))
     image_glob: str = Field(default="images/*.png")
+    manifest_path: Path | None = Field(default=None)
     labels_path: Path | None = Field(default=None)
+    mask_encoding: Literal["indices", "rle"] = Field(default="indices")
+    workers: int = Field(1, ge=1)
+    batch_size: int = Field(8, ge=1)
     thresholds: TwoDThresholds = Field(default_factory=TwoDThresholds)
     fake_runner: TwoDFakeRunnerConfig = Field(default_factory=TwoDFakeRunnerConfig)
     include_classes: list[str] = Field(
@@ -66,7 +75,8 @@ class AssetLens2DConfig(BaseModel):
             return self
 
         payload = self.model_dump(mode="json")
-        payload.pop("run_id", None)
+        for key in _RUN_ID_IGNORED_FIELDS_2D:
+            payload.pop(key, None)
         data = json.dumps(payload, sort_keys=True, separators=(",", ":"))
         digest = hashlib.sha256(data.encode("utf-8")).hexdigest()
         self.run_id = digest[:12]
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import TypeVar
+
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def ordered_map(
+    fn: Callable[[T], R],
+    items: Iterable[T],
+    workers: int,
+    max_pending: int | None = None,
+) -> Iterator[R]:
+    if fn is None:
+        raise ValueError("fn must not be None.")
+    if items is None:
+        raise ValueError("items must not be None.")
+    if workers is None:
+        raise ValueError("workers must not be None.")
+    if workers < 1:
+        raise ValueError("workers must be one or greater.")
+
+    if workers == 1:
+        for item in items:
+            yield fn(item)
+        return
+
+    if max_pending is None:
+        max_pending = workers * 2
+    if max_pending < 1:
+        raise ValueError("max_pending must be one or greater.")
+
+    # Results are yielded strictly in input order; at most max_pending tasks
+    # are in flight so finished results never pile up unboundedly.
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending: deque[Future] = deque()
+        for item in items:
+            pending.append(pool.submit(fn, item))
+            if len(pending) >= max_pending:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
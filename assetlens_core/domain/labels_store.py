@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import json
+import shutil
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from .mask_2d import Mask2D
+
+
+LABELS_STORE_VERSION = "1"
+
+# np.load only memory-maps plain .npy files (members of an .npz archive are
+# always read into memory), so the store is a directory of .npy columns.
+_ARRAY_NAMES = (
+    "image_offsets",
+    "image_ids",
+    "label_ids",
+    "bboxes",
+    "mask_frames",
+    "mask_boxes",
+    "mask_offsets",
+    "mask_bits",
+)
+
+
+def labels_store_path(labels_path: Path) -> Path:
+    if labels_path is None:
+        raise ValueError("labels_path must not be None.")
+    return labels_path.parent / f"{labels_path.stem}_store"
+
+
+def _source_stat(labels_path: Path) -> dict[str, int]:
+    st = labels_path.stat()
+    return {"size": int(st.st_size), "mtime_ns": int(st.st_mtime_ns)}
+
+
+class LabelsStoreWriter:
+    def __init__(self, store_dir: Path) -> None:
+        if store_dir is None:
+            raise ValueError("store_dir must not be None.")
+
+        self.store_dir = store_dir
+        self.images: list[str] = []
+        self.label_ids: dict[str, int] = {}
+        self._image_offsets: list[int] = [0]
+        self._image_ids: list[int] = []
+        self._det_labels: list[int] = []
+        self._bboxes: list[tuple[int, int, int, int]] = []
+        self._frames: list[tuple[int, int]] = []
+        self._boxes: list[tuple[int, int, int, int, int]] = []
+        self._mask_offsets: list[int] = [0]
+        self._bits_tmp = tempfile.TemporaryFile()
+
+    def add_image(self, image_name: str, entries: list[tuple[str, tuple[int, int, int, int], Mask2D]]) -> None:
+        if image_name is None:
+            raise ValueError("image_name must not be None.")
+        if entries is None:
+            raise ValueError("entries must not be None.")
+        if self.images and image_name <= self.images[-1]:
+            raise ValueError(f"images must be added in ascending name order: {image_name}")
+
+        image_id = len(self.images)
+        self.images.append(image_name)
+
+        for label, bbox, mask in entries:
+            if label not in self.label_ids:
+                self.label_ids[label] = len(self.label_ids)
+            self._image_ids.append(image_id)
+            self._det_labels.append(self.label_ids[label])
+            self._bboxes.append((int(bbox[0]), int(bbox[1]), int(bbox[2]), int(bbox[3])))
+            self._frames.append((mask.width, mask.height))
+            self._boxes.append((mask.x0, mask.y0, mask.box_w, mask.box_h, mask.area))
+
+            raw = np.ascontiguousarray(mask.bits, dtype=np.uint8).tobytes()
+            self._bits_tmp.write(raw)
+            self._mask_offsets.append(self._mask_offsets[-1] + len(raw))
+
+        self._image_offsets.append(len(self._image_ids))
+
+    def close(self, labels_path: Path) -> Path:
+        if labels_path is None:
+            raise ValueError("labels_path must not be None.")
+        if labels_path.exists() is not True:
+            raise FileNotFoundError(f"labels file not found: {labels_path}")
+
+        if self.store_dir.exists():
+            shutil.rmtree(self.store_dir)
+        self.store_dir.mkdir(parents=True)
+
+        columns = {
+            "image_offsets": np.asarray(self._image_offsets, dtype=np.int64),
+            "image_ids": np.asarray(self._image_ids, dtype=np.int32),
+            "label_ids": np.asarray(self._det_labels, dtype=np.int32),
+            "bboxes": np.asarray(self._bboxes, dtype=np.int32).reshape(-1, 4),
+            "mask_frames": np.asarray(self._frames, dtype=np.int32).reshape(-1, 2),
+            "mask_boxes": np.asarray(self._boxes, dtype=np.int64).reshape(-1, 5),
+            "mask_offsets": np.asarray(self._mask_offsets, dtype=np.int64),
+        }
+        for name, arr in columns.items():
+            np.save(self.store_dir / f"{name}.npy", arr)
+
+        total = self._mask_offsets[-1]
+        bits = np.lib.format.open_memmap(
+            self.store_dir / "mask_bits.npy", mode="w+", dtype=np.uint8, shape=(total,)
+        )
+        self._bits_tmp.seek(0)
+        pos = 0
+        while pos < total:
+            chunk = self._bits_tmp.read(1 << 24)
+            if not chunk:
+                break
+            bits[pos : pos + len(chunk)] = np.frombuffer(chunk, dtype=np.uint8)
+            pos += len(chunk)
+        bits.flush()
+        del bits
+        self._bits_tmp.close()
+
+        labels = sorted(self.label_ids, key=lambda k: self.label_ids[k])
+        index = {
+            "version": LABELS_STORE_VERSION,
+            "images": self.images,
+            "labels": labels,
+            "source": {"name": labels_path.name, **_source_stat(labels_path)},
+        }
+        (self.store_dir / "index.json").write_text(json.dumps(index, indent=2, sort_keys=True), encoding="utf-8")
+        return self.store_dir
+
+
+class LabelsStore:
+    def __init__(self, store_dir: Path) -> None:
+        if store_dir is None:
+            raise ValueError("store_dir must not be None.")
+        index_path = store_dir / "index.json"
+        if index_path.exists() is not True:
+            raise FileNotFoundError(f"labels store index not found: {index_path}")
+
+        index = json.loads(index_path.read_text(encoding="utf-8"))
+        if index.get("version") != LABELS_STORE_VERSION:
+            raise ValueError(f"unsupported labels store version in {index_path}: {index.get('version')}")
+
+        self.store_dir = store_dir
+        self.source = dict(index.get("source", {}))
+        self.labels: list[str] = list(index["labels"])
+        self.images: list[str] = list(index["images"])
+        self._image_pos = {name: i for i, name in enumerate(self.images)}
+        self._arrays = {name: np.load(store_dir / f"{name}.npy", mmap_mode="r") for name in _ARRAY_NAMES}
+
+    def is_fresh_for(self, labels_path: Path) -> bool:
+        if labels_path is None:
+            raise ValueError("labels_path must not be None.")
+        if labels_path.exists() is not True:
+            return False
+        stat = _source_stat(labels_path)
+        if self.source.get("size") != stat["size"]:
+            return False
+        return self.source.get("mtime_ns") == stat["mtime_ns"]
+
+    def image_names(self) -> list[str]:
+        return list(self.images)
+
+    def entries(self, image_name: str) -> list[tuple[str, tuple[int, int, int, int], Mask2D]]:
+        if image_name is None:
+            raise ValueError("image_name must not be None.")
+        if image_name not in self._image_pos:
+            raise KeyError(f"image not in labels store: {image_name}")
+
+        a = self._arrays
+        pos = self._image_pos[image_name]
+        start = int(a["image_offsets"][pos])
+        end = int(a["image_offsets"][pos + 1])
+
+        label_ids = np.asarray(a["label_ids"][start:end])
+        bboxes = np.asarray(a["bboxes"][start:end])
+        frames = np.asarray(a["mask_frames"][start:end])
+        boxes = np.asarray(a["mask_boxes"][start:end])
+        offsets = np.asarray(a["mask_offsets"][start : end + 1])
+
+        out: list[tuple[str, tuple[int, int, int, int], Mask2D]] = []
+        for k in range(end - start):
+            x0, y0, box_w, box_h, area = (int(v) for v in boxes[k])
+            row_bytes = (box_w + 7) // 8
+            bits = np.asarray(a["mask_bits"][int(offsets[k]) : int(offsets[k + 1])]).reshape(box_h, row_bytes)
+            mask = Mask2D(int(frames[k][0]), int(frames[k][1]), x0, y0, box_w, box_h, area, bits)
+            bbox = (int(bboxes[k][0]), int(bboxes[k][1]), int(bboxes[k][2]), int(bboxes[k][3]))
+            out.append((self.labels[int(label_ids[k])], bbox, mask))
+        return out
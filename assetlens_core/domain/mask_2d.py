@@ -0,0 +1,247 @@
+from __future__ import annotations
+
+import numpy as np
+
+from .mask_rle import indices_to_rle, rle_to_indices, rle_total
+
+
+class Mask2D:
+    # Bitmap covers only the tight bbox; rows are packed along x.
+    __slots__ = ("width", "height", "x0", "y0", "box_w", "box_h", "area", "bits")
+
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        x0: int,
+        y0: int,
+        box_w: int,
+        box_h: int,
+        area: int,
+        bits: np.ndarray,
+    ) -> None:
+        if width is None:
+            raise ValueError("mask width must not be None.")
+        if height is None:
+            raise ValueError("mask height must not be None.")
+        if int(width) < 1:
+            raise ValueError("mask width must be one or greater.")
+        if int(height) < 1:
+            raise ValueError("mask height must be one or greater.")
+        if bits is None:
+            raise ValueError("bits must not be None.")
+        if box_w < 0:
+            raise ValueError("box_w must be zero or greater.")
+        if box_h < 0:
+            raise ValueError("box_h must be zero or greater.")
+        if x0 < 0:
+            raise ValueError("x0 must be zero or greater.")
+        if y0 < 0:
+            raise ValueError("y0 must be zero or greater.")
+        if x0 + box_w > width:
+            raise ValueError("mask bbox exceeds frame width.")
+        if y0 + box_h > height:
+            raise ValueError("mask bbox exceeds frame height.")
+
+        self.width = int(width)
+        self.height = int(height)
+        self.x0 = int(x0)
+        self.y0 = int(y0)
+        self.box_w = int(box_w)
+        self.box_h = int(box_h)
+        self.area = int(area)
+        self.bits = bits
+
+    @classmethod
+    def empty(cls, width: int, height: int) -> "Mask2D":
+        return cls(width, height, 0, 0, 0, 0, 0, np.zeros((0, 0), dtype=np.uint8))
+
+    @classmethod
+    def from_box(cls, x: int, y: int, box_w: int, box_h: int, width: int, height: int) -> "Mask2D":
+        if box_w < 1 or box_h < 1:
+            return cls.empty(width, height)
+        local = np.ones((int(box_h), int(box_w)), dtype=bool)
+        return cls(width, height, x, y, box_w, box_h, int(box_w) * int(box_h), np.packbits(local, axis=1))
+
+    @classmethod
+    def from_local(cls, local: np.ndarray, x0: int, y0: int, width: int, height: int) -> "Mask2D":
+        if local is None:
+            raise ValueError("local must not be None.")
+        if local.ndim != 2:
+            raise ValueError("local must be a 2D array.")
+
+        local = local.astype(bool, copy=False)
+        rows = np.flatnonzero(local.any(axis=1))
+        if rows.size == 0:
+            return cls.empty(width, height)
+        cols = np.flatnonzero(local.any(axis=0))
+
+        r0 = int(rows[0])
+        r1 = int(rows[-1]) + 1
+        c0 = int(cols[0])
+        c1 = int(cols[-1]) + 1
+        tight = local[r0:r1, c0:c1]
+        return cls(
+            width,
+            height,
+            int(x0) + c0,
+            int(y0) + r0,
+            c1 - c0,
+            r1 - r0,
+            int(tight.sum()),
+            np.packbits(tight, axis=1),
+        )
+
+    @classmethod
+    def from_dense(cls, mask: np.ndarray) -> "Mask2D":
+        if mask is None:
+            raise ValueError("mask must not be None.")
+        if mask.ndim != 2:
+            raise ValueError("mask must be a 2D array.")
+        h, w = mask.shape
+        return cls.from_local(mask, 0, 0, w, h)
+
+    @classmethod
+    def from_indices(cls, indices: "np.ndarray | list[int]", width: int, height: int) -> "Mask2D":
+        if indices is None:
+            raise ValueError("indices must not be None.")
+        if width is None:
+            raise ValueError("mask width must not be None.")
+        if height is None:
+            raise ValueError("mask height must not be None.")
+        if int(width) < 1:
+            raise ValueError("mask width must be one or greater.")
+        if int(height) < 1:
+            raise ValueError("mask height must be one or greater.")
+
+        width = int(width)
+        height = int(height)
+        flat = np.asarray(indices, dtype=np.int64).ravel()
+        flat = flat[(flat >= 0) & (flat < width * height)]
+        if flat.size == 0:
+            return cls.empty(width, height)
+
+        ys = flat // width
+        xs = flat % width
+        x0 = int(xs.min())
+        y0 = int(ys.min())
+        box_w = int(xs.max()) - x0 + 1
+        box_h = int(ys.max()) - y0 + 1
+
+        local = np.zeros((box_h, box_w), dtype=bool)
+        local[ys - y0, xs - x0] = True
+        return cls(width, height, x0, y0, box_w, box_h, int(local.sum()), np.packbits(local, axis=1))
+
+    @classmethod
+    def from_rle(cls, counts: list[int], width: int, height: int) -> "Mask2D":
+        if counts is None:
+            raise ValueError("counts must not be None.")
+        if width is None:
+            raise ValueError("mask width must not be None.")
+        if height is None:
+            raise ValueError("mask height must not be None.")
+        if rle_total(counts) > int(width) * int(height):
+            raise ValueError("RLE counts cover more than width * height pixels.")
+        return cls.from_indices(rle_to_indices(counts), width, height)
+
+    @property
+    def bbox(self) -> tuple[int, int, int, int]:
+        return (self.x0, self.y0, self.box_w, self.box_h)
+
+    def crop(self) -> np.ndarray:
+        if self.box_w == 0:
+            return np.zeros((self.box_h, 0), dtype=bool)
+        return np.unpackbits(self.bits, axis=1, count=self.box_w).astype(bool)
+
+    def window(self, x0: int, y0: int, x1: int, y1: int) -> np.ndarray:
+        out = np.zeros((max(y1 - y0, 0), max(x1 - x0, 0)), dtype=bool)
+        ix0 = max(x0, self.x0)
+        iy0 = max(y0, self.y0)
+        ix1 = min(x1, self.x0 + self.box_w)
+        iy1 = min(y1, self.y0 + self.box_h)
+        if ix1 <= ix0 or iy1 <= iy0:
+            return out
+
+        rows = self.bits[iy0 - self.y0 : iy1 - self.y0]
+        local = np.unpackbits(rows, axis=1, count=ix1 - self.x0)[:, ix0 - self.x0 :]
+        out[iy0 - y0 : iy1 - y0, ix0 - x0 : ix1 - x0] = local.astype(bool)
+        return out
+
+    def to_indices(self) -> np.ndarray:
+        if self.area == 0:
+            return np.zeros(0, dtype=np.int64)
+        ys, xs = np.nonzero(self.crop())
+        return (ys.astype(np.int64) + self.y0) * self.width + (xs.astype(np.int64) + self.x0)
+
+    def to_list(self) -> list[int]:
+        return self.to_indices().tolist()
+
+    def to_rle(self) -> list[int]:
+        return indices_to_rle(self.to_indices(), self.width, self.height)
+
+    def intersection(self, other: "Mask2D") -> int:
+        if other is None:
+            raise ValueError("other mask must not be None.")
+        if (self.width, self.height) != (other.width, other.height):
+            raise ValueError(
+                f"mask frames differ: {self.width}x{self.height} vs {other.width}x{other.height}"
+            )
+
+        ix0 = max(self.x0, other.x0)
+        iy0 = max(self.y0, other.y0)
+        ix1 = min(self.x0 + self.box_w, other.x0 + other.box_w)
+        iy1 = min(self.y0 + self.box_h, other.y0 + other.box_h)
+        if ix1 <= ix0 or iy1 <= iy0:
+            return 0
+
+        a = self.window(ix0, iy0, ix1, iy1)
+        b = other.window(ix0, iy0, ix1, iy1)
+        return int(np.count_nonzero(a & b))
+
+    def iou(self, other: "Mask2D") -> float:
+        inter = self.intersection(other)
+        union = self.area + other.area - inter
+        if union == 0:
+            return 0.0
+        return float(inter / union)
+
+    def nbytes(self) -> int:
+        return int(self.bits.nbytes)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Mask2D) is not True:
+            return NotImplemented
+        if (self.width, self.height, self.bbox, self.area) != (other.width, other.height, other.bbox, other.area):
+            return False
+        return bool(np.array_equal(self.bits, other.bits))
+
+    def __hash__(self) -> int:
+        return hash((self.width, self.height, self.bbox, self.area, self.bits.tobytes()))
+
+    def __repr__(self) -> str:
+        return f"Mask2D(frame={self.width}x{self.height}, bbox={self.bbox}, area={self.area})"
+
+
+def mask_from_entry(obj: dict, context: str) -> Mask2D:
+    if obj is None:
+        raise ValueError("mask entry must not be None.")
+    if context is None:
+        raise ValueError("context must not be None.")
+
+    mask_w = int(obj.get("mask_width", 0))
+    mask_h = int(obj.get("mask_height", 0))
+    if mask_w < 1:
+        raise ValueError(f"mask_width missing/invalid for {context}")
+    if mask_h < 1:
+        raise ValueError(f"mask_height missing/invalid for {context}")
+
+    if "mask_rle" in obj:
+        counts = obj.get("mask_rle")
+        if isinstance(counts, list) is not True:
+            raise ValueError(f"mask_rle must be a list for {context}")
+        return Mask2D.from_rle(counts, mask_w, mask_h)
+
+    indices = obj.get("mask_indices", [])
+    if isinstance(indices, list) is not True:
+        raise ValueError(f"mask_indices must be a list for {context}")
+    return Mask2D.from_indices(indices, mask_w, mask_h)
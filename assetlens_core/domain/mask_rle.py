@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import numpy as np
+
+
+MASK_ENCODING_INDICES = "indices"
+MASK_ENCODING_RLE = "rle"
+MASK_ENCODINGS = (MASK_ENCODING_INDICES, MASK_ENCODING_RLE)
+
+
+def validate_mask_encoding(encoding: str) -> str:
+    if encoding is None:
+        raise ValueError("mask encoding must not be None.")
+    if encoding not in MASK_ENCODINGS:
+        raise ValueError(f"unknown mask encoding: {encoding} (expected one of {', '.join(MASK_ENCODINGS)})")
+    return encoding
+
+
+def indices_to_rle(indices: "np.ndarray | list[int]", width: int, height: int) -> list[int]:
+    if indices is None:
+        raise ValueError("indices must not be None.")
+    if width < 1:
+        raise ValueError("width must be one or greater.")
+    if height < 1:
+        raise ValueError("height must be one or greater.")
+
+    total = int(width) * int(height)
+    flat = np.asarray(indices, dtype=np.int64).ravel()
+    flat = flat[(flat >= 0) & (flat < total)]
+    if flat.size == 0:
+        return [total]
+    flat = np.unique(flat)
+
+    breaks = np.flatnonzero(np.diff(flat) != 1)
+    starts = np.concatenate((flat[:1], flat[breaks + 1]))
+    ends = np.concatenate((flat[breaks], flat[-1:])) + 1
+
+    counts = np.empty(2 * len(starts), dtype=np.int64)
+    counts[0::2] = starts - np.concatenate(([0], ends[:-1]))
+    counts[1::2] = ends - starts
+
+    tail = total - int(ends[-1])
+    out = counts.tolist()
+    if tail > 0:
+        out.append(tail)
+    return out
+
+
+def rle_runs(counts: list[int]) -> tuple[np.ndarray, np.ndarray]:
+    if counts is None:
+        raise ValueError("counts must not be None.")
+
+    arr = np.asarray(counts, dtype=np.int64).ravel()
+    if arr.size == 0:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty
+    if bool((arr < 0).any()):
+        raise ValueError("RLE counts must be zero or greater.")
+
+    bounds = np.cumsum(arr)
+    starts = bounds[0::2]
+    ends = bounds[1::2]
+    starts = starts[: len(ends)]
+    keep = ends > starts
+    return starts[keep], ends[keep]
+
+
+def rle_to_indices(counts: list[int]) -> np.ndarray:
+    starts, ends = rle_runs(counts)
+    if starts.size == 0:
+        return np.zeros(0, dtype=np.int64)
+
+    lengths = ends - starts
+    offsets = np.repeat(starts - np.concatenate(([0], np.cumsum(lengths)[:-1])), lengths)
+    return np.arange(int(lengths.sum()), dtype=np.int64) + offsets
+
+
+def rle_area(counts: list[int]) -> int:
+    starts, ends = rle_runs(counts)
+    return int((ends - starts).sum())
+
+
+def rle_total(counts: list[int]) -> int:
+    if counts is None:
+        raise ValueError("counts must not be None.")
+    return int(sum(int(c) for c in counts))
+
+
+def rle_iou(a: list[int], b: list[int]) -> float:
+    if a is None:
+        raise ValueError("RLE a must not be None.")
+    if b is None:
+        raise ValueError("RLE b must not be None.")
+
+    a_starts, a_ends = rle_runs(a)
+    b_starts, b_ends = rle_runs(b)
+    area_a = int((a_ends - a_starts).sum())
+    area_b = int((b_ends - b_starts).sum())
+    if area_a + area_b == 0:
+        return 0.0
+    if a_starts.size == 0:
+        return 0.0
+    if b_starts.size == 0:
+        return 0.0
+
+    # Split the frame at every run boundary; each segment is then uniformly
+    # inside or outside each mask.
+    points = np.unique(np.concatenate((a_starts, a_ends, b_starts, b_ends)))
+    seg_start = points[:-1]
+    seg_len = np.diff(points)
+    in_a = np.searchsorted(a_starts, seg_start, side="right") - np.searchsorted(a_ends, seg_start, side="right")
+    in_b = np.searchsorted(b_starts, seg_start, side="right") - np.searchsorted(b_ends, seg_start, side="right")
+
+    inter = int((seg_len * (in_a * in_b)).sum())
+    union = area_a + area_b - inter
+    if union == 0:
+        return 0.0
+    return float(inter / union)
+
@@ -1,13 +1,28 @@
 from __future__ import annotations
 
-from pydantic import BaseModel, ConfigDict, Field
+from typing import Any
+
+from pydantic import BaseModel, ConfigDict, Field, SerializationInfo, model_serializer, model_validator
+
+from .mask_2d import Mask2D
+from .mask_rle import MASK_ENCODING_INDICES, MASK_ENCODING_RLE, validate_mask_encoding
 
 
 SCHEMA_VERSION_2D = "0.2.0"
+SCHEMA_VERSION_2D_RLE = "0.3.0"
+
+
+RUN_2D_SCHEMA_VERSIONS = (SCHEMA_VERSION_2D, SCHEMA_VERSION_2D_RLE)
+
+
+def schema_version_for_mask_encoding(encoding: str) -> str:
+    if validate_mask_encoding(encoding) == MASK_ENCODING_RLE:
+        return SCHEMA_VERSION_2D_RLE
+    return SCHEMA_VERSION_2D
 
 
 class Detection2D(BaseModel):
-    model_config = ConfigDict(extra="forbid")
+    model_config = ConfigDict(extra="forbid", arbitrary_types_allowed=True)
 
     schema_version: str = Field(default=SCHEMA_VERSION_2D)
     run_id: str
@@ -15,9 +30,39 @@ class Detection2D(BaseModel):
     label: str
     score: float = Field(ge=0.0, le=1.0)
     bbox: tuple[int, int, int, int]
-    mask_indices: list[int]
-    mask_width: int = Field(ge=1)
-    mask_height: int = Field(ge=1)
+    mask: Mask2D = Field(exclude=True)
+
+    @model_validator(mode="before")
+    @classmethod
+    def _mask_from_legacy_fields(cls, data: Any) -> Any:
+        if isinstance(data, dict) is not True:
+            return data
+        if "mask" in data:
+            return data
+
+        data = dict(data)
+        mask_w = data.pop("mask_width", None)
+        mask_h = data.pop("mask_height", None)
+        if "mask_rle" in data:
+            data["mask"] = Mask2D.from_rle(data.pop("mask_rle"), mask_w, mask_h)
+        else:
+            data["mask"] = Mask2D.from_indices(data.pop("mask_indices", []), mask_w, mask_h)
+        return data
+
+    @model_serializer(mode="wrap")
+    def _mask_to_legacy_fields(self, handler: Any, info: SerializationInfo) -> dict[str, Any]:
+        out = handler(self)
+        encoding = MASK_ENCODING_INDICES
+        if isinstance(info.context, dict):
+            encoding = validate_mask_encoding(info.context.get("mask_encoding", MASK_ENCODING_INDICES))
+
+        if encoding == MASK_ENCODING_RLE:
+            out["mask_rle"] = self.mask.to_rle()
+        else:
+            out["mask_indices"] = self.mask.to_list()
+        out["mask_width"] = self.mask.width
+        out["mask_height"] = self.mask.height
+        return out
 
 
 class Run2DSummary(BaseModel):
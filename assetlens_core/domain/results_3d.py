@@ -34,6 +34,7 @@ class Run3DSummary(BaseModel):
     num_models: int = Field(ge=0)
     num_instances: int = Field(ge=0)
     counts_by_part: dict[str, int] = Field(default_factory=dict)
+    model_paths: dict[str, str] = Field(default_factory=dict)
 
 
 class Run3DOutputs(BaseModel):
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+
+@dataclass(frozen=True, eq=False)
+class VisibilityMatrix:
+    parts: list[str]
+    views: list[str]
+    area: np.ndarray
+    bbox: np.ndarray
+
+    def _part_pos(self, part: str) -> int:
+        if part is None:
+            raise ValueError("part must not be None.")
+        if part not in self.parts:
+            raise KeyError(f"unknown part: {part}")
+        return self.parts.index(part)
+
+    def views_showing(self, part: str, min_area: int = 1) -> list[str]:
+        row = self.area[self._part_pos(part)]
+        return [self.views[i] for i in np.flatnonzero(row >= min_area).tolist()]
+
+    def parts_in_view(self, view: str, min_area: int = 1) -> list[str]:
+        if view is None:
+            raise ValueError("view must not be None.")
+        if view not in self.views:
+            raise KeyError(f"unknown view: {view}")
+        col = self.area[:, self.views.index(view)]
+        return [self.parts[i] for i in np.flatnonzero(col >= min_area).tolist()]
+
+    def never_visible(self) -> list[str]:
+        hidden = np.flatnonzero(self.area.sum(axis=1) == 0)
+        return [self.parts[i] for i in hidden.tolist()]
+
+    def best_view(self, part: str) -> str | None:
+        row = self.area[self._part_pos(part)]
+        if int(row.max(initial=0)) == 0:
+            return None
+        return self.views[int(np.argmax(row))]
+
+
+class VisibilityBuilder:
+    def __init__(self, parts: list[str]) -> None:
+        if parts is None:
+            raise ValueError("parts must not be None.")
+        self.parts = sorted(set(parts))
+        self._part_pos = {p: i for i, p in enumerate(self.parts)}
+        self.views: list[str] = []
+        self._cols: list[tuple[np.ndarray, np.ndarray]] = []
+
+    def add_view(self, view: str, dets: list[dict]) -> None:
+        if view is None:
+            raise ValueError("view must not be None.")
+        if dets is None:
+            raise ValueError("dets must not be None.")
+
+        area = np.zeros(len(self.parts), dtype=np.int64)
+        # Stored as x0, y0, x1, y1 while accumulating; -1 marks "not visible".
+        box = np.full((len(self.parts), 4), -1, dtype=np.int64)
+        for d in dets:
+            label = d["label"]
+            if label not in self._part_pos:
+                self._part_pos[label] = len(self.parts)
+                self.parts.append(label)
+                area = np.append(area, 0)
+                box = np.vstack((box, np.full((1, 4), -1, dtype=np.int64)))
+            i = self._part_pos[label]
+            x, y, w, h = (int(v) for v in d["bbox"])
+            if area[i] == 0:
+                box[i] = (x, y, x + w, y + h)
+            else:
+                box[i] = (min(box[i][0], x), min(box[i][1], y), max(box[i][2], x + w), max(box[i][3], y + h))
+            area[i] += int(d["area"])
+
+        self.views.append(view)
+        self._cols.append((area, box))
+
+    def build(self) -> VisibilityMatrix:
+        n_parts = len(self.parts)
+        n_views = len(self.views)
+        area = np.zeros((n_parts, n_views), dtype=np.int64)
+        bbox = np.full((n_parts, n_views, 4), -1, dtype=np.int32)
+        for j, (col_area, col_box) in enumerate(self._cols):
+            n = len(col_area)
+            area[:n, j] = col_area
+            seen = np.flatnonzero(col_area > 0)
+            x0 = col_box[seen, 0]
+            y0 = col_box[seen, 1]
+            bbox[seen, j] = np.stack((x0, y0, col_box[seen, 2] - x0, col_box[seen, 3] - y0), axis=1)
+
+        order = np.argsort(np.array(self.parts, dtype=str), kind="stable")
+        parts = [self.parts[i] for i in order.tolist()]
+        return VisibilityMatrix(parts=parts, views=list(self.views), area=area[order], bbox=bbox[order])
+
+
+def save_visibility(path: Path, matrix: VisibilityMatrix) -> Path:
+    if path is None:
+        raise ValueError("path must not be None.")
+    if matrix is None:
+        raise ValueError("matrix must not be None.")
+
+    np.savez_compressed(
+        path,
+        parts=np.array(matrix.parts, dtype=str),
+        views=np.array(matrix.views, dtype=str),
+        area=matrix.area,
+        bbox=matrix.bbox,
+    )
+    return path
+
+
+def load_visibility(path: Path) -> VisibilityMatrix:
+    if path is None:
+        raise ValueError("path must not be None.")
+    if path.exists() is not True:
+        raise FileNotFoundError(f"visibility file not found: {path}")
+
+    with np.load(path) as data:
+        return VisibilityMatrix(
+            parts=data["parts"].tolist(),
+            views=data["views"].tolist(),
+            area=data["area"],
+            bbox=data["bbox"],
+        )
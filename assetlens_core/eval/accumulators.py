@@ -0,0 +1,395 @@
+from __future__ import annotations
+
+import json
+import math
+from pathlib import Path
+
+import numpy as np
+
+from .pr_curves import IOU_THRESHOLDS, PrAccumulator
+
+
+PARTIAL_VERSION = "4"
+
+
+class ExactSum:
+    # Non-overlapping float partials (Shewchuk); the total is exact, so sums
+    # merged from shards in any grouping round to the same value.
+    __slots__ = ("partials",)
+
+    def __init__(self, partials: "list[float] | None" = None) -> None:
+        self.partials: list[float] = []
+        for p in partials or []:
+            self.add(p)
+
+    def add(self, value: float) -> None:
+        x = float(value)
+        out: list[float] = []
+        for y in self.partials:
+            if abs(x) < abs(y):
+                x, y = y, x
+            hi = x + y
+            lo = y - (hi - x)
+            if lo:
+                out.append(lo)
+            x = hi
+        out.append(x)
+        self.partials = out
+
+    def extend(self, values: "list[float]") -> None:
+        for v in values:
+            self.add(v)
+
+    def merge(self, other: "ExactSum") -> None:
+        if other is None:
+            raise ValueError("other must not be None.")
+        self.extend(other.partials)
+
+    def value(self) -> float:
+        return math.fsum(self.partials)
+
+
+class MatchCounts:
+    __slots__ = ("tp", "fp", "fn", "iou_sum", "boundary_sum", "iou_count")
+
+    def __init__(self) -> None:
+        self.tp = 0
+        self.fp = 0
+        self.fn = 0
+        self.iou_sum = ExactSum()
+        # Boundary IoU of the same matched pairs, so it shares iou_count.
+        self.boundary_sum = ExactSum()
+        self.iou_count = 0
+
+    def add(
+        self, ious: list[float], tp: int, fp: int, fn: int, boundary_ious: "list[float] | None" = None
+    ) -> None:
+        if ious is None:
+            raise ValueError("ious must not be None.")
+        if boundary_ious is not None and len(boundary_ious) != len(ious):
+            raise ValueError("boundary_ious must align with ious.")
+        self.tp += int(tp)
+        self.fp += int(fp)
+        self.fn += int(fn)
+        self.iou_sum.extend(ious)
+        if boundary_ious is not None:
+            self.boundary_sum.extend(boundary_ious)
+        self.iou_count += len(ious)
+
+    def merge(self, other: "MatchCounts") -> None:
+        if other is None:
+            raise ValueError("other must not be None.")
+        self.tp += other.tp
+        self.fp += other.fp
+        self.fn += other.fn
+        self.iou_sum.merge(other.iou_sum)
+        self.boundary_sum.merge(other.boundary_sum)
+        self.iou_count += other.iou_count
+
+    def to_dict(self) -> dict:
+        return {
+            "tp": self.tp,
+            "fp": self.fp,
+            "fn": self.fn,
+            "iou_sum": list(self.iou_sum.partials),
+            "boundary_sum": list(self.boundary_sum.partials),
+            "iou_count": self.iou_count,
+        }
+
+    @classmethod
+    def from_dict(cls, raw: dict) -> "MatchCounts":
+        if raw is None:
+            raise ValueError("raw must not be None.")
+        out = cls()
+        out.tp = int(raw["tp"])
+        out.fp = int(raw["fp"])
+        out.fn = int(raw["fn"])
+        out.iou_sum = ExactSum([float(v) for v in raw["iou_sum"]])
+        out.boundary_sum = ExactSum([float(v) for v in raw["boundary_sum"]])
+        out.iou_count = int(raw["iou_count"])
+        return out
+
+
+def _pr_to_dict(pr: PrAccumulator) -> dict:
+    return {
+        "num_gt": pr.num_gt,
+        "scores": pr.scores.tolist(),
+        "tp": pr.tp.T.tolist(),
+        "fp": pr.fp.T.tolist(),
+    }
+
+
+def _pr_from_dict(raw: dict, num_thresholds: int) -> PrAccumulator:
+    pr = PrAccumulator(num_thresholds=num_thresholds)
+    scores = np.asarray(raw["scores"], dtype=np.float64)
+    tp = np.asarray(raw["tp"], dtype=np.int64).reshape(len(scores), num_thresholds).T
+    fp = np.asarray(raw["fp"], dtype=np.int64).reshape(len(scores), num_thresholds).T
+    pr.add_counts(scores, tp, fp, int(raw["num_gt"]))
+    return pr
+
+
+def _per_item_to_dict(per_item: "dict[str, list[float]] | None") -> "dict[str, list[float]] | None":
+    if per_item is None:
+        return None
+    return {name: list(row) for name, row in sorted(per_item.items())}
+
+
+def _per_item_from_dict(raw: "dict | None") -> "dict[str, list[float]] | None":
+    if raw is None:
+        return None
+    return {str(name): [float(v) for v in row] for name, row in raw.items()}
+
+
+def _check_disjoint(ours: set[str], theirs: set[str]) -> None:
+    # Shards must cover disjoint items, or merged counts would include some twice.
+    overlap = sorted(ours & theirs)
+    if overlap:
+        raise ValueError(f"eval partials overlap on {overlap[0]}")
+
+
+def _covered_from_dict(raw: dict, field: str, count: int) -> set[str]:
+    names = {str(name) for name in raw[field]}
+    if len(names) != count:
+        raise ValueError(f"eval partial lists {len(names)} {field} but counts {count}.")
+    return names
+
+
+def _merge_per_item(mine: "EvalAccumulator2D | EvalAccumulator3D", other: "EvalAccumulator2D | EvalAccumulator3D") -> None:
+    attr = "per_image" if isinstance(mine, EvalAccumulator2D) else "per_model"
+    ours = getattr(mine, attr)
+    theirs = getattr(other, attr)
+    if (ours is None) != (theirs is None) or mine.bootstrap != other.bootstrap:
+        raise ValueError("cannot merge eval partials with different bootstrap settings.")
+    if theirs is None:
+        return
+    ours.update(theirs)
+
+
+class EvalAccumulator2D:
+    def __init__(self, run_id: str) -> None:
+        if run_id is None:
+            raise ValueError("run_id must not be None.")
+        self.run_id = run_id
+        self.num_images = 0
+        self.images: set[str] = set()
+        self.overall = MatchCounts()
+        self.per_label: dict[str, tuple[MatchCounts, PrAccumulator]] = {}
+        self.per_size: dict[str, MatchCounts] = {}
+        self.confusion: dict[tuple[str, str], int] | None = None
+        # Whether boundary IoU was computed for the matched pairs.
+        self.boundary = False
+        # Per-image [tp, fp, fn, iou_sum, iou_count] at IoU 0.50, kept for bootstrap intervals.
+        self.per_image: dict[str, list[float]] | None = None
+        self.bootstrap = 0
+
+    def add_confusion(self, counts: dict[tuple[str, str], int]) -> None:
+        if counts is None:
+            raise ValueError("counts must not be None.")
+        if self.confusion is None:
+            self.confusion = {}
+        for key, n in counts.items():
+            self.confusion[key] = self.confusion.get(key, 0) + int(n)
+
+    def label(self, label: str) -> tuple[MatchCounts, PrAccumulator]:
+        if label not in self.per_label:
+            self.per_label[label] = (MatchCounts(), PrAccumulator())
+        return self.per_label[label]
+
+    def size(self, bucket: str) -> MatchCounts:
+        if bucket not in self.per_size:
+            self.per_size[bucket] = MatchCounts()
+        return self.per_size[bucket]
+
+    def merge(self, other: "EvalAccumulator2D") -> None:
+        if other is None:
+            raise ValueError("other must not be None.")
+        if other.run_id != self.run_id:
+            raise ValueError(f"cannot merge eval partials from different runs: {self.run_id} vs {other.run_id}")
+        if self.boundary != other.boundary:
+            raise ValueError("cannot merge eval partials with and without boundary IoU.")
+        _check_disjoint(self.images, other.images)
+
+        self.num_images += other.num_images
+        self.images |= other.images
+        self.overall.merge(other.overall)
+        for label, (counts, pr) in other.per_label.items():
+            mine_counts, mine_pr = self.label(label)
+            mine_counts.merge(counts)
+            mine_pr.merge(pr)
+        for bucket, counts in other.per_size.items():
+            self.size(bucket).merge(counts)
+        if (self.confusion is None) != (other.confusion is None):
+            raise ValueError("cannot merge eval partials with and without a confusion matrix.")
+        if other.confusion is not None:
+            self.add_confusion(other.confusion)
+        _merge_per_item(self, other)
+
+    def to_dict(self) -> dict:
+        confusion = None
+        if self.confusion is not None:
+            confusion = [[gt, pred, n] for (gt, pred), n in sorted(self.confusion.items())]
+        return {
+            "version": PARTIAL_VERSION,
+            "kind": "eval_2d",
+            "boundary": self.boundary,
+            "confusion": confusion,
+            "bootstrap": self.bootstrap,
+            "per_image": _per_item_to_dict(self.per_image),
+            "run_id": self.run_id,
+            "num_images": self.num_images,
+            "images": sorted(self.images),
+            "iou_thresholds": list(IOU_THRESHOLDS),
+            "overall": self.overall.to_dict(),
+            "per_label": {
+                label: {**counts.to_dict(), "pr": _pr_to_dict(pr)}
+                for label, (counts, pr) in sorted(self.per_label.items())
+            },
+            "per_size": {bucket: counts.to_dict() for bucket, counts in sorted(self.per_size.items())},
+        }
+
+    @classmethod
+    def from_dict(cls, raw: dict) -> "EvalAccumulator2D":
+        _check_partial(raw, "eval_2d")
+        if list(raw.get("iou_thresholds", [])) != list(IOU_THRESHOLDS):
+            raise ValueError("eval partial uses different IoU thresholds.")
+
+        out = cls(str(raw["run_id"]))
+        out.num_images = int(raw["num_images"])
+        out.images = _covered_from_dict(raw, "images", out.num_images)
+        out.boundary = bool(raw["boundary"])
+        out.overall = MatchCounts.from_dict(raw["overall"])
+        for label, entry in raw["per_label"].items():
+            out.per_label[label] = (
+                MatchCounts.from_dict(entry),
+                _pr_from_dict(entry["pr"], len(IOU_THRESHOLDS)),
+            )
+        for bucket, entry in raw.get("per_size", {}).items():
+            out.per_size[bucket] = MatchCounts.from_dict(entry)
+        if raw.get("confusion") is not None:
+            out.add_confusion({(str(gt), str(pred)): int(n) for gt, pred, n in raw["confusion"]})
+        out.bootstrap = int(raw.get("bootstrap", 0))
+        out.per_image = _per_item_from_dict(raw.get("per_image"))
+        return out
+
+
+class EvalAccumulator3D:
+    def __init__(self, run_id: str) -> None:
+        if run_id is None:
+            raise ValueError("run_id must not be None.")
+        self.run_id = run_id
+        self.num_models = 0
+        self.models: set[str] = set()
+        self.exact_models = 0
+        self.per_part: dict[str, list[int]] = {}
+        # Per-model [tp, fp, fn], kept for bootstrap intervals.
+        self.per_model: dict[str, list[float]] | None = None
+        self.bootstrap = 0
+
+    def add_part(self, part: str, tp: int, fp: int, fn: int) -> None:
+        if part not in self.per_part:
+            self.per_part[part] = [0, 0, 0]
+        acc = self.per_part[part]
+        acc[0] += int(tp)
+        acc[1] += int(fp)
+        acc[2] += int(fn)
+
+    def merge(self, other: "EvalAccumulator3D") -> None:
+        if other is None:
+            raise ValueError("other must not be None.")
+        if other.run_id != self.run_id:
+            raise ValueError(f"cannot merge eval partials from different runs: {self.run_id} vs {other.run_id}")
+        _check_disjoint(self.models, other.models)
+
+        self.num_models += other.num_models
+        self.models |= other.models
+        self.exact_models += other.exact_models
+        for part, (tp, fp, fn) in other.per_part.items():
+            self.add_part(part, tp, fp, fn)
+        _merge_per_item(self, other)
+
+    def to_dict(self) -> dict:
+        return {
+            "version": PARTIAL_VERSION,
+            "kind": "eval_3d",
+            "bootstrap": self.bootstrap,
+            "per_model": _per_item_to_dict(self.per_model),
+            "run_id": self.run_id,
+            "num_models": self.num_models,
+            "models": sorted(self.models),
+            "exact_models": self.exact_models,
+            "per_part": {
+                part: {"tp": tp, "fp": fp, "fn": fn} for part, (tp, fp, fn) in sorted(self.per_part.items())
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, raw: dict) -> "EvalAccumulator3D":
+        _check_partial(raw, "eval_3d")
+        out = cls(str(raw["run_id"]))
+        out.num_models = int(raw["num_models"])
+        out.models = _covered_from_dict(raw, "models", out.num_models)
+        out.exact_models = int(raw["exact_models"])
+        for part, entry in raw["per_part"].items():
+            out.add_part(part, entry["tp"], entry["fp"], entry["fn"])
+        out.bootstrap = int(raw.get("bootstrap", 0))
+        out.per_model = _per_item_from_dict(raw.get("per_model"))
+        return out
+
+
+def _check_partial(raw: dict, kind: str) -> None:
+    if isinstance(raw, dict) is not True:
+        raise ValueError("eval partial root must be an object.")
+    if raw.get("kind") != kind:
+        raise ValueError(f"expected an {kind} partial, got {raw.get('kind')!r}")
+    if raw.get("version") != PARTIAL_VERSION:
+        raise ValueError(f"unsupported eval partial version: {raw.get('version')!r}")
+
+
+def write_partial(path: Path, acc: "EvalAccumulator2D | EvalAccumulator3D") -> Path:
+    if path is None:
+        raise ValueError("path must not be None.")
+    if acc is None:
+        raise ValueError("acc must not be None.")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(acc.to_dict(), indent=2, sort_keys=True), encoding="utf-8")
+    return path
+
+
+def _read_partial(path: Path) -> dict:
+    if path is None:
+        raise ValueError("partial path must not be None.")
+    if path.exists() is not True:
+        raise FileNotFoundError(f"eval partial not found: {path}")
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def load_partials_2d(paths: list[Path]) -> EvalAccumulator2D:
+    if paths is None:
+        raise ValueError("paths must not be None.")
+    if not paths:
+        raise ValueError("at least one eval partial is required.")
+
+    merged: EvalAccumulator2D | None = None
+    for path in paths:
+        acc = EvalAccumulator2D.from_dict(_read_partial(path))
+        if merged is None:
+            merged = acc
+            continue
+        merged.merge(acc)
+    return merged
+
+
+def load_partials_3d(paths: list[Path]) -> EvalAccumulator3D:
+    if paths is None:
+        raise ValueError("paths must not be None.")
+    if not paths:
+        raise ValueError("at least one eval partial is required.")
+
+    merged: EvalAccumulator3D | None = None
+    for path in paths:
+        acc = EvalAccumulator3D.from_dict(_read_partial(path))
+        if merged is None:
+            merged = acc
+            continue
+        merged.merge(acc)
+    return merged
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import math
+
+import numpy as np
+from pydantic import BaseModel, ConfigDict, Field
+
+
+DEFAULT_RESAMPLES = 1000
+BOOTSTRAP_CONFIDENCE = 0.95
+BOOTSTRAP_SEED = 0
+
+# Upper bound on resample weights drawn per chunk; small enough to stay in cache.
+_CHUNK_ELEMENTS = 1 << 20
+
+# Poisson(1) draw for every 16-bit uniform: the inverse CDF at the bin centre.
+# Each probability is off by at most 2**-16 and the tail past 8 (~1e-6) is cut.
+_POISSON_CDF = np.cumsum([math.exp(-1.0) / math.factorial(k) for k in range(20)])
+_POISSON_LUT = np.searchsorted(_POISSON_CDF, (np.arange(1 << 16) + 0.5) / (1 << 16), side="right").astype(np.float64)
+
+
+class MetricInterval(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    lower: float
+    upper: float
+
+
+class BootstrapIntervals(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    num_resamples: int = Field(..., ge=1)
+    confidence: float = Field(..., gt=0.0, lt=1.0)
+    seed: int
+    precision: MetricInterval
+    recall: MetricInterval
+    f1: MetricInterval
+    mean_iou: MetricInterval | None = None
+
+
+def resample_sums(values: np.ndarray, num_resamples: int, seed: int = BOOTSTRAP_SEED) -> np.ndarray:
+    if values is None:
+        raise ValueError("values must not be None.")
+    if values.ndim != 2:
+        raise ValueError("values must be a 2D array of items by statistics.")
+    if num_resamples < 1:
+        raise ValueError("num_resamples must be one or greater.")
+
+    n, k = values.shape
+    if n == 0:
+        raise ValueError("values must not be empty.")
+
+    # Poisson bootstrap: each item gets an independent Poisson(1) weight per
+    # resample instead of a multinomial draw count, so a chunk of weights is
+    # one 16-bit draw and one table lookup, and every statistic is summed with
+    # a single float64 (resamples x items) @ (items x stats) product. Weights
+    # are small integers, so integer columns (tp, fp, fn, iou_count) sum
+    # exactly in any order up to 2**53; only iou_sum can round differently
+    # between BLAS builds.
+    rng = np.random.default_rng(seed)
+    table = np.asarray(values, dtype=np.float64)
+    out = np.empty((num_resamples, k), dtype=np.float64)
+    rows = max(1, _CHUNK_ELEMENTS // n)
+    for start in range(0, num_resamples, rows):
+        stop = min(num_resamples, start + rows)
+        draws = rng.integers(0, 1 << 16, size=(stop - start, n), dtype=np.uint16)
+        out[start:stop] = _POISSON_LUT[draws] @ table
+    return out
+
+
+def _ratio(num: np.ndarray, den: np.ndarray) -> np.ndarray:
+    out = np.zeros_like(num, dtype=np.float64)
+    np.divide(num, den, out=out, where=den != 0)
+    return out
+
+
+def _interval(samples: np.ndarray, confidence: float) -> MetricInterval:
+    alpha = (1.0 - confidence) / 2.0
+    lower, upper = np.quantile(samples, [alpha, 1.0 - alpha])
+    return MetricInterval(lower=float(lower), upper=float(upper))
+
+
+def bootstrap_intervals(
+    stats: np.ndarray,
+    num_resamples: int = DEFAULT_RESAMPLES,
+    confidence: float = BOOTSTRAP_CONFIDENCE,
+    seed: int = BOOTSTRAP_SEED,
+) -> BootstrapIntervals:
+    # stats rows are per image (or model): tp, fp, fn and optionally iou_sum, iou_count.
+    if stats is None:
+        raise ValueError("stats must not be None.")
+    if stats.ndim != 2 or stats.shape[1] not in (3, 5):
+        raise ValueError("stats must have columns tp, fp, fn[, iou_sum, iou_count].")
+
+    sums = resample_sums(stats, num_resamples, seed=seed)
+    tp, fp, fn = sums[:, 0], sums[:, 1], sums[:, 2]
+    precision = _ratio(tp, tp + fp)
+    recall = _ratio(tp, tp + fn)
+    f1 = _ratio(2.0 * precision * recall, precision + recall)
+
+    mean_iou = None
+    if stats.shape[1] == 5:
+        mean_iou = _interval(_ratio(sums[:, 3], sums[:, 4]), confidence)
+
+    return BootstrapIntervals(
+        num_resamples=num_resamples,
+        confidence=confidence,
+        seed=seed,
+        precision=_interval(precision, confidence),
+        recall=_interval(recall, confidence),
+        f1=_interval(f1, confidence),
+        mean_iou=mean_iou,
+    )
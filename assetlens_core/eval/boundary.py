@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import math
+
+import numpy as np
+
+from ..domain.mask_2d import Mask2D
+
+
+# Band width as a fraction of the image diagonal (Boundary IoU, Cheng et al. 2021).
+BOUNDARY_DILATION_RATIO = 0.02
+
+
+def boundary_width(width: int, height: int, ratio: float = BOUNDARY_DILATION_RATIO) -> int:
+    if width < 1 or height < 1:
+        raise ValueError("width and height must be one or greater.")
+    return max(1, int(round(ratio * math.hypot(width, height))))
+
+
+def _erode_axis(mask: np.ndarray, d: int, axis: int) -> np.ndarray:
+    # A pixel survives when all 2d+1 pixels centred on it along axis are set;
+    # pixels beyond the array count as unset. Window sums come from one cumsum.
+    n = mask.shape[axis]
+    pad = [(0, 0), (0, 0)]
+    pad[axis] = (d + 1, d)
+    cs = np.cumsum(np.pad(mask, pad).astype(np.int32), axis=axis)
+    hi = [slice(None), slice(None)]
+    lo = [slice(None), slice(None)]
+    hi[axis] = slice(2 * d + 1, n + 2 * d + 1)
+    lo[axis] = slice(0, n)
+    return (cs[tuple(hi)] - cs[tuple(lo)]) == 2 * d + 1
+
+
+def erode(mask: np.ndarray, d: int) -> np.ndarray:
+    if mask is None:
+        raise ValueError("mask must not be None.")
+    if d < 1:
+        raise ValueError("d must be one or greater.")
+    if mask.size == 0:
+        return mask.astype(bool)
+    # A (2d+1)^2 square is separable into a row pass and a column pass.
+    return _erode_axis(_erode_axis(mask.astype(bool), d, axis=1), d, axis=0)
+
+
+def boundary_band(mask: np.ndarray, d: int) -> np.ndarray:
+    local = mask.astype(bool)
+    return local & ~erode(local, d)
+
+
+def boundary_iou(a: Mask2D, b: Mask2D, d: int) -> float:
+    if a is None or b is None:
+        raise ValueError("masks must not be None.")
+    if (a.width, a.height) != (b.width, b.height):
+        raise ValueError(f"mask frames differ: {a.width}x{a.height} vs {b.width}x{b.height}")
+
+    # Both masks are empty outside the union of their boxes, so eroding the
+    # union crop with an unset border matches eroding the full frame.
+    x0 = min(a.x0, b.x0)
+    y0 = min(a.y0, b.y0)
+    x1 = max(a.x0 + a.box_w, b.x0 + b.box_w)
+    y1 = max(a.y0 + a.box_h, b.y0 + b.box_h)
+    if x1 <= x0 or y1 <= y0:
+        return 0.0
+
+    band_a = boundary_band(a.window(x0, y0, x1, y1), d)
+    band_b = boundary_band(b.window(x0, y0, x1, y1), d)
+    union = int(np.count_nonzero(band_a | band_b))
+    if union == 0:
+        return 0.0
+    return float(np.count_nonzero(band_a & band_b) / union)
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+
+from ..config.logging_utils import get_logger
+
+
+log = get_logger("assetlens.eval_cache")
+
+DEFAULT_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+
+class EvalCache:
+    def __init__(self, cache_dir: Path, max_bytes: int = DEFAULT_CACHE_MAX_BYTES) -> None:
+        if cache_dir is None:
+            raise ValueError("cache_dir must not be None.")
+        if max_bytes < 0:
+            raise ValueError("max_bytes must be zero or greater.")
+        self.cache_dir = cache_dir
+        self.max_bytes = int(max_bytes)
+        # Shard directories already created by this instance.
+        self._dirs: set[Path] = set()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> dict | None:
+        if key is None:
+            raise ValueError("key must not be None.")
+        path = self._path(key)
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError):
+            log.warning(f"Ignoring unreadable eval cache entry {path}")
+            return None
+        # Reads refresh mtime, which is the recency used for eviction.
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return payload
+
+    def put(self, key: str, payload: dict) -> None:
+        if key is None:
+            raise ValueError("key must not be None.")
+        if payload is None:
+            raise ValueError("payload must not be None.")
+        path = self._path(key)
+        if path.parent not in self._dirs:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._dirs.add(path.parent)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(payload, sort_keys=True), encoding="utf-8")
+        tmp_path.replace(path)
+
+    def evict(self) -> int:
+        if self.cache_dir.exists() is not True:
+            return 0
+
+        entries: list[tuple[int, str, Path, int]] = []
+        total = 0
+        for path in self.cache_dir.glob("*/*.json"):
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((int(st.st_mtime_ns), path.name, path, int(st.st_size)))
+            total += int(st.st_size)
+
+        removed = 0
+        entries.sort()
+        for _mtime, _name, path, size in entries:
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+        return removed
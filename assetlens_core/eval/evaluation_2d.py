@@ -1,13 +1,32 @@
 from __future__ import annotations
 
+import hashlib
+import itertools
 import json
+from collections.abc import Iterable, Iterator
+from contextlib import ExitStack
 from dataclasses import dataclass
 from pathlib import Path
+from typing import TextIO
 
 import numpy as np
 from pydantic import BaseModel, ConfigDict, Field
 
+from ..config.logging_utils import get_logger
+from ..config.parallel_utils import ordered_map
+from ..domain.labels_store import LabelsStore, labels_store_path
+from ..domain.mask_2d import Mask2D, mask_from_entry
 from ..domain.results_2d import Detection2D, SCHEMA_VERSION_2D
+from .accumulators import EvalAccumulator2D, MatchCounts, load_partials_2d, write_partial
+from .bootstrap import BootstrapIntervals, bootstrap_intervals
+from .boundary import boundary_iou, boundary_width
+from .eval_cache import DEFAULT_CACHE_MAX_BYTES, EvalCache
+from .iou_matrix import greedy_match_thresholds, iou_matrix, segment_iou_matrix
+from .labels_index import LabelsIndex, load_labels_index, read_entry, select_names
+from .pr_curves import IOU_THRESHOLDS, RECALL_POINTS
+
+
+log = get_logger("assetlens.eval_2d")
 
 
 @dataclass(frozen=True)
@@ -15,9 +34,7 @@ class GtMask:
     image_name: str
     label: str
     bbox: tuple[int, int, int, int]
-    mask_indices: list[int]
-    mask_width: int
-    mask_height: int
+    mask: Mask2D
 
 
 class PerLabelMetrics(BaseModel):
@@ -28,6 +45,27 @@ class PerLabelMetrics(BaseModel):
     precision_at_50: float = Field(0.0, ge=0.0, le=1.0)
     recall_at_50: float = Field(0.0, ge=0.0, le=1.0)
     f1_at_50: float = Field(0.0, ge=0.0, le=1.0)
+    ap_50_95: float = Field(0.0, ge=0.0, le=1.0)
+    ap_50: float = Field(0.0, ge=0.0, le=1.0)
+    ap_75: float = Field(0.0, ge=0.0, le=1.0)
+    ar_50_95: float = Field(0.0, ge=0.0, le=1.0)
+    boundary_iou: float | None = Field(None, ge=0.0, le=1.0)
+    tp: int = Field(0, ge=0)
+    fp: int = Field(0, ge=0)
+    fn: int = Field(0, ge=0)
+
+
+class SizeBucketMetrics(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    bucket: str
+    min_area: int = Field(0, ge=0)
+    max_area: int | None = None
+    mean_iou: float = Field(0.0, ge=0.0, le=1.0)
+    boundary_iou: float | None = Field(None, ge=0.0, le=1.0)
+    precision_at_50: float = Field(0.0, ge=0.0, le=1.0)
+    recall_at_50: float = Field(0.0, ge=0.0, le=1.0)
+    f1_at_50: float = Field(0.0, ge=0.0, le=1.0)
     tp: int = Field(0, ge=0)
     fp: int = Field(0, ge=0)
     fn: int = Field(0, ge=0)
@@ -54,8 +92,15 @@ class TwoDEvalSummary(BaseModel):
     precision_at_50: float = Field(0.0, ge=0.0, le=1.0)
     recall_at_50: float = Field(0.0, ge=0.0, le=1.0)
     f1_at_50: float = Field(0.0, ge=0.0, le=1.0)
+    ap_50_95: float = Field(0.0, ge=0.0, le=1.0)
+    ap_50: float = Field(0.0, ge=0.0, le=1.0)
+    ap_75: float = Field(0.0, ge=0.0, le=1.0)
+    ar_50_95: float = Field(0.0, ge=0.0, le=1.0)
+    boundary_iou: float | None = Field(None, ge=0.0, le=1.0)
     num_images: int = Field(0, ge=0)
     per_label: list[PerLabelMetrics] = Field(default_factory=list)
+    per_size: list[SizeBucketMetrics] = Field(default_factory=list)
+    confidence_intervals: BootstrapIntervals | None = None
 
 
 def _load_labels(path: Path) -> dict[str, list[dict]]:
@@ -102,9 +147,10 @@ def _parse_gt_list(image_name: str, dets: list[dict]) -> list[GtMask]:
         if len(bbox) != 4:
             raise ValueError(f"ground truth bbox must have 4 ints for {image_name}")
 
-        indices = obj.get("mask_indices", [])
-        if isinstance(indices, list) is not True:
-            raise ValueError(f"ground truth mask_indices must be a list for {image_name}")
+        if "mask_rle" not in obj:
+            indices = obj.get("mask_indices", [])
+            if isinstance(indices, list) is not True:
+                raise ValueError(f"ground truth mask_indices must be a list for {image_name}")
 
         mask_w = int(obj.get("mask_width", 0))
         mask_h = int(obj.get("mask_height", 0))
@@ -118,212 +164,650 @@ def _parse_gt_list(image_name: str, dets: list[dict]) -> list[GtMask]:
                 image_name=image_name,
                 label=str(label),
                 bbox=(int(bbox[0]), int(bbox[1]), int(bbox[2]), int(bbox[3])),
-                mask_indices=[int(x) for x in indices],
-                mask_width=mask_w,
-                mask_height=mask_h,
+                mask=mask_from_entry(obj, f"ground truth in {image_name}"),
             )
         )
     return out
 
 
-def _indices_to_mask(indices: list[int], width: int, height: int) -> np.ndarray:
-    if indices is None:
-        raise ValueError("indices must not be None.")
-    if width < 1:
-        raise ValueError("width must be one or greater.")
-    if height < 1:
-        raise ValueError("height must be one or greater.")
+def _safe_div(num: float, den: float) -> float:
+    if den == 0.0:
+        return 0.0
+    return float(num / den)
 
-    mask = np.zeros((height, width), dtype=bool)
-    if indices:
-        flat = np.array(indices, dtype=int)
-        valid = flat[(flat >= 0) & (flat < width * height)]
-        mask.ravel()[valid] = True
-    return mask
 
+class _JsonGtSource:
+    def __init__(self, labels_by_image: dict[str, list[dict]]) -> None:
+        if labels_by_image is None:
+            raise ValueError("labels_by_image must not be None.")
+        self.labels_by_image = labels_by_image
 
-def _iou(a: np.ndarray, b: np.ndarray) -> float:
-    if a is None:
-        raise ValueError("mask a must not be None.")
-    if b is None:
-        raise ValueError("mask b must not be None.")
+    def image_names(self) -> list[str]:
+        return sorted(self.labels_by_image.keys())
 
-    inter = float(np.logical_and(a, b).sum())
-    union = float(np.logical_or(a, b).sum())
-    if union == 0.0:
-        return 0.0
-    return float(inter / union)
+    def load(self, image_name: str) -> list[GtMask]:
+        return _parse_gt_list(image_name, self.labels_by_image[image_name])
 
 
-def _safe_div(num: float, den: float) -> float:
-    if den == 0.0:
-        return 0.0
-    return float(num / den)
+class _IndexedJsonGtSource:
+    def __init__(self, labels_path: Path, index: LabelsIndex) -> None:
+        if labels_path is None:
+            raise ValueError("labels path must not be None.")
+        if index is None:
+            raise ValueError("index must not be None.")
+        self.labels_path = labels_path
+        self.index = index
+
+    def image_names(self) -> list[str]:
+        return self.index.names()
+
+    def load(self, image_name: str) -> list[GtMask]:
+        return _parse_gt_list(image_name, read_entry(self.labels_path, self.index, image_name))
+
+
+class _StoreGtSource:
+    def __init__(self, store: LabelsStore) -> None:
+        if store is None:
+            raise ValueError("store must not be None.")
+        self.store = store
+
+    def image_names(self) -> list[str]:
+        return sorted(self.store.image_names())
+
+    def load(self, image_name: str) -> list[GtMask]:
+        return [
+            GtMask(image_name=image_name, label=label, bbox=bbox, mask=mask)
+            for label, bbox, mask in self.store.entries(image_name)
+        ]
+
+
+class _IdImageGtSource:
+    # Ground truth decoded on the fly from an asset's images_id/ views.
+    def __init__(self, asset_dir: Path) -> None:
+        if asset_dir is None:
+            raise ValueError("asset_dir must not be None.")
+        # Imported here so label-file evals do not load PIL and the dataset pipeline.
+        from ..pipelines.pipeline_3d_dataset import find_id_views
+
+        self.palette, self.id_paths = find_id_views(asset_dir)
+
+    def image_names(self) -> list[str]:
+        return sorted(self.id_paths.keys())
+
+    def load_with_segments(self, image_name: str) -> tuple[list[GtMask], np.ndarray]:
+        from ..pipelines.pipeline_3d_dataset import decode_id_view
+
+        # segments maps each pixel to its ground-truth index, so predictions are scored by gathering from it.
+        pairs, segments = decode_id_view(self.id_paths[image_name], self.palette)
+        out = [
+            GtMask(image_name=image_name, label=str(det["label"]), bbox=tuple(det["bbox"]), mask=mask)
+            for det, mask in pairs
+        ]
+        return out, segments
+
+    def load(self, image_name: str) -> list[GtMask]:
+        return self.load_with_segments(image_name)[0]
+
+
+_GtSource = "_JsonGtSource | _IndexedJsonGtSource | _StoreGtSource | _IdImageGtSource"
+
+
+def _open_gt_source(labels_path: Path, index_dir: Path | None = None) -> _GtSource:
+    if labels_path is None:
+        raise ValueError("labels path must not be None.")
+    if labels_path.exists() is not True:
+        raise FileNotFoundError(f"labels file not found: {labels_path}")
 
+    # An asset render directory is scored straight from its ID images.
+    if labels_path.is_dir():
+        return _IdImageGtSource(labels_path)
 
-def _match_and_score(pred_masks: list[np.ndarray], gt_masks: list[np.ndarray]) -> tuple[list[float], int, int, int]:
+    store_dir = labels_store_path(labels_path)
+    if (store_dir / "index.json").exists():
+        store = LabelsStore(store_dir)
+        if store.is_fresh_for(labels_path):
+            return _StoreGtSource(store)
+        log.warning(f"Ignoring stale labels store {store_dir}; reading {labels_path}")
+
+    # Partial evaluations parse only the selected images through a byte-offset index.
+    if index_dir is not None:
+        return _IndexedJsonGtSource(labels_path, load_labels_index(labels_path, "images", index_dir))
+    return _JsonGtSource(_load_labels(labels_path))
+
+
+@dataclass(frozen=True)
+class _LabelScore:
+    ious: list[float]
+    tp: int
+    fp: int
+    fn: int
+    scores: np.ndarray
+    matched: np.ndarray
+    num_gt: int
+    # Aligned with ious: boundary IoU (None unless requested) and the size
+    # bucket (by ground-truth area) of each match.
+    boundary_ious: list[float] | None
+    match_sizes: list[int]
+    # Size bucket of each unmatched prediction / ground truth.
+    fp_sizes: list[int]
+    fn_sizes: list[int]
+
+
+# (name, exclusive upper mask area) by pixel count, as in COCO.
+SIZE_BUCKETS: tuple[tuple[str, int | None], ...] = (("small", 32 * 32), ("medium", 96 * 96), ("large", None))
+
+
+def _size_bucket(area: int) -> int:
+    for i, (_name, upper) in enumerate(SIZE_BUCKETS):
+        if upper is None or area < upper:
+            return i
+    return len(SIZE_BUCKETS) - 1
+
+
+_GT_SOURCE_CACHE: dict[tuple[str, int, int, str], _GtSource] = {}
+
+
+def _cached_gt_source(labels_path: Path, index_dir: Path | None = None) -> _GtSource:
+    if labels_path is None:
+        raise ValueError("labels path must not be None.")
+    if labels_path.exists() is not True:
+        raise FileNotFoundError(f"labels file not found: {labels_path}")
+
+    # One source per process, so pool workers parse the labels once rather than per image.
+    st = labels_path.stat()
+    key = (str(labels_path.resolve()), int(st.st_size), int(st.st_mtime_ns), str(index_dir))
+    source = _GT_SOURCE_CACHE.get(key)
+    if source is None:
+        _GT_SOURCE_CACHE.clear()
+        source = _open_gt_source(labels_path, index_dir)
+        _GT_SOURCE_CACHE[key] = source
+    return source
+
+
+_EVAL_CACHES: dict[Path, EvalCache] = {}
+
+
+def _eval_cache(cache_dir: Path) -> EvalCache:
+    # One EvalCache per process and cache_dir, like the GT sources above.
+    cache = _EVAL_CACHES.get(cache_dir)
+    if cache is None:
+        _EVAL_CACHES.clear()
+        cache = EvalCache(cache_dir)
+        _EVAL_CACHES[cache_dir] = cache
+    return cache
+
+
+def _release_process_caches() -> None:
+    # Pool workers drop their caches when the pool exits; the parent drops its
+    # own once an eval returns instead of keeping the labels alive until the next.
+    _GT_SOURCE_CACHE.clear()
+    _EVAL_CACHES.clear()
+
+
+def _match_and_score(
+    iou: np.ndarray,
+    scores: np.ndarray,
+    pred_masks: list[Mask2D],
+    gt_masks: list[Mask2D],
+    boundary: bool = False,
+) -> _LabelScore:
+    if iou is None:
+        raise ValueError("iou must not be None.")
+    if scores is None:
+        raise ValueError("scores must not be None.")
     if pred_masks is None:
         raise ValueError("pred_masks must not be None.")
     if gt_masks is None:
         raise ValueError("gt_masks must not be None.")
 
-    if pred_masks:
-        pass
-    if not pred_masks:
-        return [], 0, 0, len(gt_masks)
+    num_pred, num_gt = iou.shape
+    order = np.argsort(-scores, kind="stable")
+    ranked = iou[order]
+    matches = greedy_match_thresholds(ranked, IOU_THRESHOLDS)
+
+    # Counts and IoUs at 0.50 feed the *_at_50 metrics.
+    hit = np.flatnonzero(matches[0] >= 0)
+    ious = ranked[hit, matches[0][hit]].tolist()
+    tp = len(ious)
+
+    pred_rows = order[hit].tolist()
+    gt_cols = matches[0][hit].tolist()
+    # Boundary IoU costs far more than the mask IoU, so it is only computed on request.
+    boundary_ious: list[float] | None = None
+    if boundary:
+        boundary_ious = []
+        if pred_rows:
+            d = boundary_width(gt_masks[0].width, gt_masks[0].height)
+            boundary_ious = [boundary_iou(pred_masks[i], gt_masks[j], d) for i, j in zip(pred_rows, gt_cols)]
+    matched_pred = set(pred_rows)
+    matched_gt = set(gt_cols)
+    return _LabelScore(
+        ious=ious,
+        tp=tp,
+        fp=num_pred - tp,
+        fn=num_gt - tp,
+        scores=scores[order],
+        matched=matches >= 0,
+        num_gt=num_gt,
+        boundary_ious=boundary_ious,
+        match_sizes=[_size_bucket(gt_masks[j].area) for j in gt_cols],
+        fp_sizes=[_size_bucket(m.area) for i, m in enumerate(pred_masks) if i not in matched_pred],
+        fn_sizes=[_size_bucket(m.area) for j, m in enumerate(gt_masks) if j not in matched_gt],
+    )
 
-    if gt_masks:
-        pass
-    if not gt_masks:
-        return [], 0, len(pred_masks), 0
-
-    unmatched_gt = set(range(len(gt_masks)))
-    ious: list[float] = []
-    tp = 0
-    fp = 0
-
-    for pred in pred_masks:
-        best_iou = 0.0
-        best_j: int | None = None
-        for j in list(unmatched_gt):
-            v = _iou(pred, gt_masks[j])
-            if v > best_iou:
-                best_iou = v
-                best_j = j
-        if best_j is not None:
-            if best_iou >= 0.50:
-                tp += 1
-                ious.append(best_iou)
-                unmatched_gt.remove(best_j)
-                continue
-        fp += 1
-
-    fn = len(unmatched_gt)
-    return ious, tp, fp, fn
-
-
-def _group_predictions(detections: list[Detection2D]) -> dict[str, list[Detection2D]]:
-    if detections is None:
-        raise ValueError("detections must not be None.")
 
-    out: dict[str, list[Detection2D]] = {}
-    for d in detections:
-        image_name = Path(d.image_path).name
-        if image_name not in out:
-            out[image_name] = []
-        out[image_name].append(d)
+def _indices_by_label(labels: list[str]) -> dict[str, list[int]]:
+    out: dict[str, list[int]] = {}
+    for i, label in enumerate(labels):
+        if label not in out:
+            out[label] = []
+        out[label].append(i)
     return out
 
 
-def evaluate_2d(labels_path: Path, detections: list[Detection2D], output_dir: Path) -> TwoDEvalSummary:
-    if labels_path is None:
-        raise ValueError("labels_path must not be None.")
+def _group_predictions(detections: Iterable[Detection2D]) -> Iterator[tuple[str, list[Detection2D]]]:
     if detections is None:
         raise ValueError("detections must not be None.")
-    if output_dir is None:
-        raise ValueError("output_dir must not be None.")
 
-    if detections:
-        pass
-    if not detections:
-        raise ValueError("detections must not be empty.")
+    # Groups follow the stream's own order (run_2d.jsonl is sorted by full
+    # path), so only contiguity per image name is required.
+    seen: set[str] = set()
+    current: str | None = None
+    bucket: list[Detection2D] = []
+    for d in detections:
+        image_name = Path(d.image_path).name
+        if image_name == current:
+            bucket.append(d)
+            continue
+        if image_name in seen:
+            raise ValueError(f"predictions for {image_name} must be contiguous in the stream.")
+        seen.add(image_name)
+        if current is not None:
+            yield current, bucket
+        current = image_name
+        bucket = [d]
+    if current is not None:
+        yield current, bucket
+
+
+def _pair_with_gt(
+    image_names: list[str], groups: Iterator[tuple[str, list[Detection2D]]]
+) -> Iterator[tuple[str, list[Detection2D]]]:
+    wanted = set(image_names)
+    found: set[str] = set()
+    for image_name, preds in groups:
+        # Predictions for unlabelled images are skipped.
+        if image_name not in wanted:
+            continue
+        found.add(image_name)
+        yield image_name, preds
+    for image_name in image_names:
+        if image_name not in found:
+            raise ValueError(f"Missing prediction for labelled image: {image_name}")
 
-    labels_by_image = _load_labels(labels_path)
-    pred_by_image = _group_predictions(detections)
-    image_names = sorted(labels_by_image.keys())
 
-    if image_names:
-        pass
-    if not image_names:
-        raise ValueError("labels file contains no images.")
+BACKGROUND_LABEL = "__background__"
 
-    run_id = detections[0].run_id
-    overall_ious: list[float] = []
-    overall_tp = 0
-    overall_fp = 0
-    overall_fn = 0
-    per_label_acc: dict[str, dict[str, object]] = {}
-    details: list[TwoDImageDetail] = []
 
-    for image_name in image_names:
-        if image_name not in pred_by_image:
-            raise ValueError(f"Missing prediction for labelled image: {image_name}")
+@dataclass(frozen=True)
+class _ImageScore:
+    image_name: str
+    per_label: dict[str, _LabelScore]
+    confusion: dict[tuple[str, str], int] | None = None
 
-        gt_list = _parse_gt_list(image_name, labels_by_image[image_name])
-        pred_list = pred_by_image[image_name]
 
-        labels_set = {g.label for g in gt_list} | {p.label for p in pred_list}
-        labels_sorted = sorted(labels_set)
+@dataclass(frozen=True)
+class _TaskSettings:
+    labels_path: Path
+    cache_dir: Path | None
+    confusion: bool
+    index_dir: Path | None = None
+    boundary: bool = False
+
+
+def _confusion_counts(
+    iou: np.ndarray, scores: np.ndarray, pred_labels: list[str], gt_labels: list[str]
+) -> dict[tuple[str, str], int]:
+    # Class-agnostic matching at 0.50; rows are keyed (ground truth, prediction).
+    order = np.argsort(-scores, kind="stable")
+    matches = greedy_match_thresholds(iou[order], (IOU_THRESHOLDS[0],))[0]
+
+    counts: dict[tuple[str, str], int] = {}
+    matched_gt = set()
+    for rank, i in enumerate(order.tolist()):
+        j = int(matches[rank])
+        if j >= 0:
+            key = (gt_labels[j], pred_labels[i])
+            matched_gt.add(j)
+        else:
+            key = (BACKGROUND_LABEL, pred_labels[i])
+        counts[key] = counts.get(key, 0) + 1
+    for j, label in enumerate(gt_labels):
+        if j not in matched_gt:
+            key = (label, BACKGROUND_LABEL)
+            counts[key] = counts.get(key, 0) + 1
+    return counts
+
+
+def _score_image(
+    image_name: str,
+    gt_list: list[GtMask],
+    pred_list: list[Detection2D],
+    confusion: bool = False,
+    segments: np.ndarray | None = None,
+    boundary: bool = False,
+) -> _ImageScore:
+    pred_labels = [p.label for p in pred_list]
+    gt_labels = [g.label for g in gt_list]
+    # Same-label pairs are all that per-label matching needs; the confusion pass
+    # also needs cross-label pairs, so it takes the full matrix instead.
+    pred_masks = [p.mask for p in pred_list]
+    gt_masks = [g.mask for g in gt_list]
+    if segments is not None:
+        iou = segment_iou_matrix(
+            pred_masks,
+            segments,
+            [m.area for m in gt_masks],
+            pred_labels=None if confusion else pred_labels,
+            gt_labels=None if confusion else gt_labels,
+        )
+    else:
+        iou = iou_matrix(
+            pred_masks,
+            gt_masks,
+            pred_labels=None if confusion else pred_labels,
+            gt_labels=None if confusion else gt_labels,
+        )
+    pred_by_label = _indices_by_label(pred_labels)
+    gt_by_label = _indices_by_label(gt_labels)
+
+    scores = np.array([p.score for p in pred_list], dtype=np.float64)
+
+    per_label: dict[str, _LabelScore] = {}
+    for label in sorted(set(pred_by_label) | set(gt_by_label)):
+        rows = pred_by_label.get(label, [])
+        cols = gt_by_label.get(label, [])
+        per_label[label] = _match_and_score(
+            iou[np.ix_(rows, cols)],
+            scores[rows],
+            [pred_masks[i] for i in rows],
+            [gt_masks[j] for j in cols],
+            boundary=boundary,
+        )
 
-        image_tp = 0
-        image_fp = 0
-        image_fn = 0
-        image_ious: list[float] = []
+    counts = None
+    if confusion:
+        counts = _confusion_counts(iou, scores, pred_labels, gt_labels)
+    return _ImageScore(image_name=image_name, per_label=per_label, confusion=counts)
 
-        for label in labels_sorted:
-            gt_for_label = [g for g in gt_list if g.label == label]
-            pred_for_label = [p for p in pred_list if p.label == label]
 
-            gt_masks = [
-                _indices_to_mask(g.mask_indices, g.mask_width, g.mask_height) for g in gt_for_label
-            ]
-            pred_masks = [
-                _indices_to_mask(p.mask_indices, p.mask_width, p.mask_height) for p in pred_for_label
-            ]
+# Bump when matching or the cached payload changes so old entries stop matching.
+_CACHE_FORMAT = "eval_2d/4"
 
-            ious, tp, fp, fn = _match_and_score(pred_masks=pred_masks, gt_masks=gt_masks)
 
-            image_ious.extend(ious)
-            image_tp += tp
-            image_fp += fp
-            image_fn += fn
+def _mask_bytes(mask: Mask2D) -> bytes:
+    header = np.array(
+        [mask.width, mask.height, mask.x0, mask.y0, mask.box_w, mask.box_h, mask.area],
+        dtype=np.int64,
+    )
+    return header.tobytes() + np.ascontiguousarray(mask.bits, dtype=np.uint8).tobytes()
+
+
+def _image_cache_key(
+    gt_list: list[GtMask], pred_list: list[Detection2D], confusion: bool, boundary: bool = False
+) -> str:
+    h = hashlib.sha256()
+    h.update(_CACHE_FORMAT.encode("utf-8"))
+    options = {"iou_thresholds": list(IOU_THRESHOLDS), "confusion": confusion, "boundary": boundary}
+    h.update(json.dumps(options).encode("utf-8"))
+    for tag, items in ((b"gt", gt_list), (b"pred", pred_list)):
+        h.update(tag + len(items).to_bytes(8, "little"))
+        for item in items:
+            h.update(json.dumps([item.label, list(item.bbox)]).encode("utf-8"))
+            if tag == b"pred":
+                h.update(repr(float(item.score)).encode("utf-8"))
+            h.update(_mask_bytes(item.mask))
+    return h.hexdigest()
+
+
+def _score_to_payload(score: _ImageScore) -> dict:
+    confusion = None
+    if score.confusion is not None:
+        confusion = [[gt, pred, n] for (gt, pred), n in sorted(score.confusion.items())]
+    per_label = {
+        label: {
+            "ious": ls.ious,
+            "tp": ls.tp,
+            "fp": ls.fp,
+            "fn": ls.fn,
+            "scores": ls.scores.tolist(),
+            "matched": ls.matched.astype(np.uint8).tolist(),
+            "num_gt": ls.num_gt,
+            "boundary_ious": ls.boundary_ious,
+            "match_sizes": ls.match_sizes,
+            "fp_sizes": ls.fp_sizes,
+            "fn_sizes": ls.fn_sizes,
+        }
+        for label, ls in score.per_label.items()
+    }
+    return {"per_label": per_label, "confusion": confusion}
+
+
+def _score_from_payload(image_name: str, payload: dict) -> _ImageScore:
+    per_label: dict[str, _LabelScore] = {}
+    for label in sorted(payload["per_label"].keys()):
+        entry = payload["per_label"][label]
+        scores = np.asarray(entry["scores"], dtype=np.float64)
+        per_label[label] = _LabelScore(
+            ious=[float(v) for v in entry["ious"]],
+            tp=int(entry["tp"]),
+            fp=int(entry["fp"]),
+            fn=int(entry["fn"]),
+            scores=scores,
+            matched=np.asarray(entry["matched"], dtype=bool).reshape(len(IOU_THRESHOLDS), scores.size),
+            num_gt=int(entry["num_gt"]),
+            boundary_ious=None if entry["boundary_ious"] is None else [float(v) for v in entry["boundary_ious"]],
+            match_sizes=[int(v) for v in entry["match_sizes"]],
+            fp_sizes=[int(v) for v in entry["fp_sizes"]],
+            fn_sizes=[int(v) for v in entry["fn_sizes"]],
+        )
+    confusion = None
+    if payload.get("confusion") is not None:
+        confusion = {(str(gt), str(pred)): int(n) for gt, pred, n in payload["confusion"]}
+    return _ImageScore(image_name=image_name, per_label=per_label, confusion=confusion)
+
+
+def _load_gt(settings: _TaskSettings, image_name: str) -> tuple[list[GtMask], np.ndarray | None]:
+    source = _cached_gt_source(settings.labels_path, settings.index_dir)
+    if isinstance(source, _IdImageGtSource):
+        return source.load_with_segments(image_name)
+    return source.load(image_name), None
+
+
+def _score_with_cache(
+    settings: _TaskSettings,
+    image_name: str,
+    gt_list: list[GtMask],
+    pred_list: list[Detection2D],
+    segments: np.ndarray | None = None,
+) -> tuple[_ImageScore, bool]:
+    if settings.cache_dir is None:
+        score = _score_image(
+            image_name, gt_list, pred_list, confusion=settings.confusion, segments=segments, boundary=settings.boundary
+        )
+        return score, False
 
-            if label not in per_label_acc:
-                per_label_acc[label] = {"ious": [], "tp": 0, "fp": 0, "fn": 0}
+    cache = _eval_cache(settings.cache_dir)
+    key = _image_cache_key(gt_list, pred_list, settings.confusion, settings.boundary)
+    payload = cache.get(key)
+    if payload is not None:
+        return _score_from_payload(image_name, payload), True
 
-            per_label_acc[label]["ious"].extend(ious)
-            per_label_acc[label]["tp"] = int(per_label_acc[label]["tp"]) + tp
-            per_label_acc[label]["fp"] = int(per_label_acc[label]["fp"]) + fp
-            per_label_acc[label]["fn"] = int(per_label_acc[label]["fn"]) + fn
+    score = _score_image(
+        image_name, gt_list, pred_list, confusion=settings.confusion, segments=segments, boundary=settings.boundary
+    )
+    cache.put(key, _score_to_payload(score))
+    return score, False
+
+
+def _score_task(item: tuple[_TaskSettings, str, list[Detection2D]]) -> tuple[_ImageScore, bool]:
+    settings, image_name, pred_list = item
+    gt_list, segments = _load_gt(settings, image_name)
+    return _score_with_cache(settings, image_name, gt_list, pred_list, segments)
+
+
+def _score_runs_task(
+    item: tuple[_TaskSettings, str, tuple[list[Detection2D], ...]]
+) -> list[tuple[_ImageScore, bool]]:
+    settings, image_name, pred_lists = item
+    # Ground truth is parsed and decoded once, then scored against every run.
+    gt_list, segments = _load_gt(settings, image_name)
+    return [_score_with_cache(settings, image_name, gt_list, preds, segments) for preds in pred_lists]
+
+
+class _EvalReducer:
+    def __init__(
+        self, run_id: str, details_file: TextIO, confusion: bool = False, bootstrap: int = 0, boundary: bool = False
+    ) -> None:
+        if run_id is None:
+            raise ValueError("run_id must not be None.")
+        if details_file is None:
+            raise ValueError("details_file must not be None.")
+
+        self.details_file = details_file
+        self.acc = EvalAccumulator2D(run_id)
+        self.acc.boundary = bool(boundary)
+        if confusion:
+            self.acc.confusion = {}
+        if bootstrap > 0:
+            self.acc.per_image = {}
+            self.acc.bootstrap = int(bootstrap)
+
+    def add(self, score: _ImageScore) -> TwoDImageDetail:
+        if score is None:
+            raise ValueError("score must not be None.")
+
+        image = MatchCounts()
+        image_ious: list[float] = []
+        for label, ls in score.per_label.items():
+            image_ious.extend(ls.ious)
+            image.add(ls.ious, ls.tp, ls.fp, ls.fn, ls.boundary_ious)
+
+            counts, pr = self.acc.label(label)
+            counts.add(ls.ious, ls.tp, ls.fp, ls.fn, ls.boundary_ious)
+            pr.add(ls.scores, ls.matched, ls.num_gt)
+
+            for k, b in enumerate(ls.match_sizes):
+                match_boundary = None if ls.boundary_ious is None else [ls.boundary_ious[k]]
+                self.acc.size(SIZE_BUCKETS[b][0]).add([ls.ious[k]], 1, 0, 0, match_boundary)
+            for b in ls.fp_sizes:
+                self.acc.size(SIZE_BUCKETS[b][0]).add([], 0, 1, 0)
+            for b in ls.fn_sizes:
+                self.acc.size(SIZE_BUCKETS[b][0]).add([], 0, 0, 1)
+        if self.acc.confusion is not None and score.confusion is not None:
+            self.acc.add_confusion(score.confusion)
 
         mean_iou_img = _safe_div(sum(image_ious), float(len(image_ious)))
-        prec_img = _safe_div(float(image_tp), float(image_tp + image_fp))
-        rec_img = _safe_div(float(image_tp), float(image_tp + image_fn))
+        prec_img = _safe_div(float(image.tp), float(image.tp + image.fp))
+        rec_img = _safe_div(float(image.tp), float(image.tp + image.fn))
         f1_img = _safe_div(2.0 * prec_img * rec_img, prec_img + rec_img)
 
-        details.append(
-            TwoDImageDetail(
-                schema_version=SCHEMA_VERSION_2D,
-                run_id=run_id,
-                image_path=image_name,
-                mean_iou=mean_iou_img,
-                precision_at_50=prec_img,
-                recall_at_50=rec_img,
-                f1_at_50=f1_img,
-            )
+        detail = TwoDImageDetail(
+            schema_version=SCHEMA_VERSION_2D,
+            run_id=self.acc.run_id,
+            image_path=score.image_name,
+            mean_iou=mean_iou_img,
+            precision_at_50=prec_img,
+            recall_at_50=rec_img,
+            f1_at_50=f1_img,
         )
+        self.details_file.write(json.dumps(detail.model_dump(), sort_keys=True) + "\n")
+
+        if self.acc.per_image is not None:
+            self.acc.per_image[score.image_name] = [
+                float(image.tp),
+                float(image.fp),
+                float(image.fn),
+                image.iou_sum.value(),
+                float(image.iou_count),
+            ]
 
-        overall_ious.extend(image_ious)
-        overall_tp += image_tp
-        overall_fp += image_fp
-        overall_fn += image_fn
-
-    mean_iou = _safe_div(sum(overall_ious), float(len(overall_ious)))
-    precision = _safe_div(float(overall_tp), float(overall_tp + overall_fp))
-    recall = _safe_div(float(overall_tp), float(overall_tp + overall_fn))
+        self.acc.num_images += 1
+        self.acc.images.add(score.image_name)
+        self.acc.overall.merge(image)
+        return detail
+
+
+def _pr_curves_payload(acc: EvalAccumulator2D) -> dict:
+    per_label: dict[str, dict] = {}
+    for label in sorted(acc.per_label.keys()):
+        pr = acc.per_label[label][1]
+        per_label[label] = {
+            "num_gt": pr.num_gt,
+            "ap": pr.average_precision().tolist(),
+            "precision": pr.interpolated_precision().tolist(),
+        }
+    return {
+        "schema_version": SCHEMA_VERSION_2D,
+        "run_id": acc.run_id,
+        "iou_thresholds": list(IOU_THRESHOLDS),
+        "recall_points": list(RECALL_POINTS),
+        "per_label": per_label,
+    }
+
+
+def _confusion_payload(acc: EvalAccumulator2D) -> dict:
+    counts: dict[str, dict[str, int]] = {}
+    labels: set[str] = set()
+    for (gt_label, pred_label), n in sorted(acc.confusion.items()):
+        if gt_label not in counts:
+            counts[gt_label] = {}
+        counts[gt_label][pred_label] = n
+        labels.add(gt_label)
+        labels.add(pred_label)
+    return {
+        "schema_version": SCHEMA_VERSION_2D,
+        "run_id": acc.run_id,
+        "iou_threshold": IOU_THRESHOLDS[0],
+        "background": BACKGROUND_LABEL,
+        "labels": sorted(labels),
+        "counts": counts,
+    }
+
+
+def _boundary_mean(acc: EvalAccumulator2D, counts: MatchCounts) -> float | None:
+    if acc.boundary is not True:
+        return None
+    return _safe_div(counts.boundary_sum.value(), float(counts.iou_count))
+
+
+def _summary_from_accumulator(acc: EvalAccumulator2D) -> TwoDEvalSummary:
+    if acc is None:
+        raise ValueError("acc must not be None.")
+
+    overall = acc.overall
+    mean_iou = _safe_div(overall.iou_sum.value(), float(overall.iou_count))
+    boundary = _boundary_mean(acc, overall)
+    precision = _safe_div(float(overall.tp), float(overall.tp + overall.fp))
+    recall = _safe_div(float(overall.tp), float(overall.tp + overall.fn))
     f1 = _safe_div(2.0 * precision * recall, precision + recall)
 
+    # Labels without ground truth have no defined AP and are left out of the means.
+    ap_rows: list[np.ndarray] = []
+    ar_rows: list[np.ndarray] = []
+
     per_label_metrics: list[PerLabelMetrics] = []
-    for label in sorted(per_label_acc.keys()):
-        acc = per_label_acc[label]
-        ious = list(acc["ious"])
-        tp = int(acc["tp"])
-        fp = int(acc["fp"])
-        fn = int(acc["fn"])
-
-        mean_iou_l = _safe_div(sum(ious), float(len(ious)))
-        prec_l = _safe_div(float(tp), float(tp + fp))
-        rec_l = _safe_div(float(tp), float(tp + fn))
+    for label in sorted(acc.per_label.keys()):
+        counts, pr = acc.per_label[label]
+        ap = pr.average_precision()
+        ar = pr.max_recall()
+        if pr.num_gt > 0:
+            ap_rows.append(ap)
+            ar_rows.append(ar)
+
+        mean_iou_l = _safe_div(counts.iou_sum.value(), float(counts.iou_count))
+        prec_l = _safe_div(float(counts.tp), float(counts.tp + counts.fp))
+        rec_l = _safe_div(float(counts.tp), float(counts.tp + counts.fn))
         f1_l = _safe_div(2.0 * prec_l * rec_l, prec_l + rec_l)
 
         per_label_metrics.append(
@@ -333,44 +817,438 @@ def evaluate_2d(labels_path: Path, detections: list[Detection2D], output_dir: Pa
                 precision_at_50=prec_l,
                 recall_at_50=rec_l,
                 f1_at_50=f1_l,
-                tp=tp,
-                fp=fp,
-                fn=fn,
+                ap_50_95=float(ap.mean()),
+                ap_50=float(ap[0]),
+                ap_75=float(ap[5]),
+                ar_50_95=float(ar.mean()),
+                boundary_iou=_boundary_mean(acc, counts),
+                tp=counts.tp,
+                fp=counts.fp,
+                fn=counts.fn,
+            )
+        )
+
+    per_size: list[SizeBucketMetrics] = []
+    lower = 0
+    for bucket, upper in SIZE_BUCKETS:
+        counts = acc.per_size.get(bucket, MatchCounts())
+        prec_s = _safe_div(float(counts.tp), float(counts.tp + counts.fp))
+        rec_s = _safe_div(float(counts.tp), float(counts.tp + counts.fn))
+        per_size.append(
+            SizeBucketMetrics(
+                bucket=bucket,
+                min_area=lower,
+                max_area=upper,
+                mean_iou=_safe_div(counts.iou_sum.value(), float(counts.iou_count)),
+                boundary_iou=_boundary_mean(acc, counts),
+                precision_at_50=prec_s,
+                recall_at_50=rec_s,
+                f1_at_50=_safe_div(2.0 * prec_s * rec_s, prec_s + rec_s),
+                tp=counts.tp,
+                fp=counts.fp,
+                fn=counts.fn,
             )
         )
+        if upper is not None:
+            lower = upper
 
-    summary = TwoDEvalSummary(
+    intervals = None
+    if acc.per_image:
+        stats = np.asarray([acc.per_image[name] for name in sorted(acc.per_image)], dtype=np.float64)
+        intervals = bootstrap_intervals(stats, num_resamples=acc.bootstrap)
+
+    ap_all = np.zeros(len(IOU_THRESHOLDS), dtype=np.float64)
+    ar_all = np.zeros(len(IOU_THRESHOLDS), dtype=np.float64)
+    if ap_rows:
+        ap_all = np.mean(ap_rows, axis=0)
+        ar_all = np.mean(ar_rows, axis=0)
+
+    return TwoDEvalSummary(
         schema_version=SCHEMA_VERSION_2D,
-        run_id=run_id,
+        run_id=acc.run_id,
         mean_iou=mean_iou,
         precision_at_50=precision,
         recall_at_50=recall,
         f1_at_50=f1,
-        num_images=len(image_names),
+        ap_50_95=float(ap_all.mean()),
+        ap_50=float(ap_all[0]),
+        ap_75=float(ap_all[5]),
+        ar_50_95=float(ar_all.mean()),
+        boundary_iou=boundary,
+        num_images=acc.num_images,
         per_label=per_label_metrics,
+        per_size=per_size,
+        confidence_intervals=intervals,
     )
 
-    _write_eval_outputs(output_dir=output_dir, summary=summary, details=details)
-    return summary
 
+def _select_image_names(
+    labels_path: Path,
+    output_dir: Path,
+    images: list[str] | None,
+    sample_fraction: float | None,
+    sample_seed: int,
+) -> tuple[list[str], Path | None]:
+    index_dir = None
+    if images is not None or sample_fraction is not None:
+        index_dir = output_dir / "labels_index"
+
+    gt_source = _cached_gt_source(labels_path, index_dir)
+    image_names = gt_source.image_names()
+
+    if image_names:
+        pass
+    if not image_names:
+        raise ValueError("labels file contains no images.")
 
-def _write_eval_outputs(output_dir: Path, summary: TwoDEvalSummary, details: list[TwoDImageDetail]) -> None:
+    if index_dir is not None:
+        image_names = select_names(image_names, include=images, sample_fraction=sample_fraction, seed=sample_seed)
+        if not image_names:
+            raise ValueError("image selection is empty.")
+        log.info(f"Evaluating {len(image_names)} selected images")
+    return image_names, index_dir
+
+
+def _evict_cache(cache_dir: Path, cache_max_bytes: int) -> None:
+    removed = EvalCache(cache_dir, max_bytes=cache_max_bytes).evict()
+    if removed:
+        log.info(f"Evicted {removed} least recently used entries from {cache_dir}")
+
+
+def _evaluate_groups(
+    labels_path: Path,
+    run_id: str,
+    groups: Iterator[tuple[str, list[Detection2D]]],
+    output_dir: Path,
+    workers: int = 1,
+    cache: bool = False,
+    cache_max_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+    confusion: bool = False,
+    images: list[str] | None = None,
+    sample_fraction: float | None = None,
+    sample_seed: int = 0,
+    bootstrap: int = 0,
+    boundary: bool = False,
+) -> TwoDEvalSummary:
+    if workers < 1:
+        raise ValueError("workers must be one or greater.")
+    if bootstrap < 0:
+        raise ValueError("bootstrap must be zero or greater.")
+    try:
+        cache_dir = None
+        if cache:
+            cache_dir = output_dir / "eval_2d_cache"
+        image_names, index_dir = _select_image_names(labels_path, output_dir, images, sample_fraction, sample_seed)
+
+        output_dir.mkdir(parents=True, exist_ok=True)
+        details_path = output_dir / "eval_2d_details.jsonl"
+        tmp_path = details_path.with_name(details_path.name + ".tmp")
+        try:
+            with tmp_path.open("w", encoding="utf-8") as f:
+                reducer = _EvalReducer(
+                    run_id=run_id, details_file=f, confusion=confusion, bootstrap=bootstrap, boundary=boundary
+                )
+                settings = _TaskSettings(
+                    labels_path=labels_path,
+                    cache_dir=cache_dir,
+                    confusion=confusion,
+                    index_dir=index_dir,
+                    boundary=boundary,
+                )
+                tasks = ((settings, name, preds) for name, preds in _pair_with_gt(image_names, groups))
+                # Images are scored independently and reduced in image order, so the
+                # output is identical for any worker count.
+                hits = 0
+                for score, hit in ordered_map(_score_task, tasks, workers=workers):
+                    reducer.add(score)
+                    hits += int(hit)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        tmp_path.replace(details_path)
+
+        if cache_dir is not None:
+            log.info(f"Reused cached scores for {hits}/{reducer.acc.num_images} images")
+            _evict_cache(cache_dir, cache_max_bytes)
+
+        write_partial(output_dir / "eval_2d_partial.json", reducer.acc)
+        return _write_from_accumulator(output_dir, reducer.acc)
+    finally:
+        _release_process_caches()
+
+
+def evaluate_2d(
+    labels_path: Path,
+    detections: list[Detection2D],
+    output_dir: Path,
+    workers: int = 1,
+    cache: bool = False,
+    cache_max_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+    confusion: bool = False,
+    images: list[str] | None = None,
+    sample_fraction: float | None = None,
+    sample_seed: int = 0,
+    bootstrap: int = 0,
+    boundary: bool = False,
+) -> TwoDEvalSummary:
+    if labels_path is None:
+        raise ValueError("labels_path must not be None.")
+    if detections is None:
+        raise ValueError("detections must not be None.")
     if output_dir is None:
         raise ValueError("output_dir must not be None.")
-    if summary is None:
-        raise ValueError("summary must not be None.")
-    if details is None:
-        raise ValueError("details must not be None.")
+
+    if detections:
+        pass
+    if not detections:
+        raise ValueError("detections must not be empty.")
+
+    pred_by_image: dict[str, list[Detection2D]] = {}
+    for d in detections:
+        image_name = Path(d.image_path).name
+        if image_name not in pred_by_image:
+            pred_by_image[image_name] = []
+        pred_by_image[image_name].append(d)
+
+    groups = iter(sorted(pred_by_image.items(), key=lambda kv: kv[0]))
+    return _evaluate_groups(
+        labels_path,
+        detections[0].run_id,
+        groups,
+        output_dir,
+        workers=workers,
+        cache=cache,
+        cache_max_bytes=cache_max_bytes,
+        confusion=confusion,
+        images=images,
+        sample_fraction=sample_fraction,
+        sample_seed=sample_seed,
+        bootstrap=bootstrap,
+        boundary=boundary,
+    )
+
+
+def evaluate_2d_stream(
+    labels_path: Path,
+    detections: Iterable[Detection2D],
+    output_dir: Path,
+    workers: int = 1,
+    cache: bool = False,
+    cache_max_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+    confusion: bool = False,
+    images: list[str] | None = None,
+    sample_fraction: float | None = None,
+    sample_seed: int = 0,
+    bootstrap: int = 0,
+    boundary: bool = False,
+) -> TwoDEvalSummary:
+    if labels_path is None:
+        raise ValueError("labels_path must not be None.")
+    if detections is None:
+        raise ValueError("detections must not be None.")
+    if output_dir is None:
+        raise ValueError("output_dir must not be None.")
+
+    stream = iter(detections)
+    first = next(stream, None)
+    if first is None:
+        raise ValueError("detections must not be empty.")
+
+    groups = _group_predictions(itertools.chain([first], stream))
+    return _evaluate_groups(
+        labels_path,
+        first.run_id,
+        groups,
+        output_dir,
+        workers=workers,
+        cache=cache,
+        cache_max_bytes=cache_max_bytes,
+        confusion=confusion,
+        images=images,
+        sample_fraction=sample_fraction,
+        sample_seed=sample_seed,
+        bootstrap=bootstrap,
+        boundary=boundary,
+    )
+
+
+def _compare_payload(
+    run_ids: list[str], summaries: dict[str, TwoDEvalSummary], per_image: list[dict]
+) -> dict:
+    baseline = summaries[run_ids[0]]
+    return {
+        "schema_version": SCHEMA_VERSION_2D,
+        "baseline_run_id": run_ids[0],
+        "run_ids": list(run_ids),
+        "runs": {run_id: summaries[run_id].model_dump() for run_id in run_ids},
+        "deltas": {
+            run_id: {
+                "mean_iou": summaries[run_id].mean_iou - baseline.mean_iou,
+                "precision_at_50": summaries[run_id].precision_at_50 - baseline.precision_at_50,
+                "recall_at_50": summaries[run_id].recall_at_50 - baseline.recall_at_50,
+                "f1_at_50": summaries[run_id].f1_at_50 - baseline.f1_at_50,
+                "ap_50_95": summaries[run_id].ap_50_95 - baseline.ap_50_95,
+            }
+            for run_id in run_ids
+        },
+        "per_image": per_image,
+    }
+
+
+def _image_comparison(image_name: str, details: list[TwoDImageDetail]) -> dict:
+    # Per-run values are listed in run_ids order; deltas are against the first run.
+    mean_iou = [d.mean_iou for d in details]
+    f1 = [d.f1_at_50 for d in details]
+    return {
+        "image_path": image_name,
+        "mean_iou": mean_iou,
+        "f1_at_50": f1,
+        "delta_mean_iou": [v - mean_iou[0] for v in mean_iou],
+        "delta_f1_at_50": [v - f1[0] for v in f1],
+    }
+
+
+def _row_name(row: tuple[tuple[str, list[Detection2D]], ...]) -> str:
+    image_name = row[0][0]
+    for other, _preds in row[1:]:
+        if other != image_name:
+            raise ValueError(f"runs must list images in the same order: {other} vs {image_name}")
+    return image_name
+
+
+def evaluate_2d_runs(
+    labels_path: Path,
+    runs: list[Iterable[Detection2D]],
+    output_dir: Path,
+    workers: int = 1,
+    cache: bool = False,
+    cache_max_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+    confusion: bool = False,
+    images: list[str] | None = None,
+    sample_fraction: float | None = None,
+    sample_seed: int = 0,
+    boundary: bool = False,
+) -> dict[str, TwoDEvalSummary]:
+    if labels_path is None:
+        raise ValueError("labels_path must not be None.")
+    if runs is None:
+        raise ValueError("runs must not be None.")
+    if output_dir is None:
+        raise ValueError("output_dir must not be None.")
+    if workers < 1:
+        raise ValueError("workers must be one or greater.")
+
+    if runs:
+        pass
+    if not runs:
+        raise ValueError("runs must not be empty.")
+
+    # Each run is a detection stream grouped by image, e.g. iter_run_2d(), and
+    # all runs must list images in the same order; the first run is the
+    # baseline for deltas.
+    run_ids: list[str] = []
+    run_groups: list[Iterator[tuple[str, list[Detection2D]]]] = []
+    for detections in runs:
+        stream = iter(detections)
+        first = next(stream, None)
+        if first is None:
+            raise ValueError("detections must not be empty.")
+        if first.run_id in run_ids:
+            raise ValueError(f"run_id appears more than once: {first.run_id}")
+        run_ids.append(first.run_id)
+        run_groups.append(_group_predictions(itertools.chain([first], stream)))
+
+    try:
+        cache_dir = None
+        if cache:
+            cache_dir = output_dir / "eval_2d_cache"
+        image_names, index_dir = _select_image_names(labels_path, output_dir, images, sample_fraction, sample_seed)
+        settings = _TaskSettings(
+            labels_path=labels_path, cache_dir=cache_dir, confusion=confusion, index_dir=index_dir, boundary=boundary
+        )
+
+        run_dirs = [output_dir / run_id for run_id in run_ids]
+        per_image: list[dict] = []
+        hits = 0
+        with ExitStack() as stack:
+            reducers: list[_EvalReducer] = []
+            tmp_paths: list[Path] = []
+            for run_id, run_dir in zip(run_ids, run_dirs):
+                run_dir.mkdir(parents=True, exist_ok=True)
+                tmp_path = run_dir / "eval_2d_details.jsonl.tmp"
+                tmp_paths.append(tmp_path)
+                stack.callback(tmp_path.unlink, missing_ok=True)
+                f = stack.enter_context(tmp_path.open("w", encoding="utf-8"))
+                reducers.append(_EvalReducer(run_id=run_id, details_file=f, confusion=confusion, boundary=boundary))
+
+            paired = zip(*(_pair_with_gt(image_names, groups) for groups in run_groups))
+            tasks = ((settings, _row_name(row), tuple(preds for _name, preds in row)) for row in paired)
+            for scored in ordered_map(_score_runs_task, tasks, workers=workers):
+                image_name = scored[0][0].image_name
+                details = [reducer.add(score) for reducer, (score, _hit) in zip(reducers, scored)]
+                hits += sum(int(hit) for _score, hit in scored)
+                per_image.append(_image_comparison(image_name, details))
+
+            for reducer in reducers:
+                reducer.details_file.close()
+            for tmp_path in tmp_paths:
+                tmp_path.replace(tmp_path.with_name("eval_2d_details.jsonl"))
+
+        if cache_dir is not None:
+            log.info(f"Reused cached scores for {hits}/{len(image_names) * len(run_ids)} image-run pairs")
+            _evict_cache(cache_dir, cache_max_bytes)
+
+        summaries: dict[str, TwoDEvalSummary] = {}
+        for reducer, run_dir in zip(reducers, run_dirs):
+            write_partial(run_dir / "eval_2d_partial.json", reducer.acc)
+            summaries[reducer.acc.run_id] = _write_from_accumulator(run_dir, reducer.acc)
+
+        compare_path = output_dir / "eval_2d_compare.json"
+        compare_path.write_text(
+            json.dumps(_compare_payload(run_ids, summaries, per_image), indent=2, sort_keys=True),
+            encoding="utf-8",
+        )
+        return summaries
+    finally:
+        _release_process_caches()
+
+
+def _write_from_accumulator(output_dir: Path, acc: EvalAccumulator2D) -> TwoDEvalSummary:
+    if output_dir is None:
+        raise ValueError("output_dir must not be None.")
+    if acc is None:
+        raise ValueError("acc must not be None.")
 
     output_dir.mkdir(parents=True, exist_ok=True)
 
+    summary = _summary_from_accumulator(acc)
     summary_path = output_dir / "eval_2d.json"
     summary_path.write_text(
         json.dumps(summary.model_dump(), indent=2, sort_keys=True),
         encoding="utf-8",
     )
 
-    details_path = output_dir / "eval_2d_details.jsonl"
-    with details_path.open("w", encoding="utf-8") as f:
-        for d in details:
-            f.write(json.dumps(d.model_dump(), sort_keys=True) + "\n")
+    curves_path = output_dir / "eval_2d_pr_curves.json"
+    curves_path.write_text(
+        json.dumps(_pr_curves_payload(acc), indent=2, sort_keys=True),
+        encoding="utf-8",
+    )
+
+    if acc.confusion is not None:
+        confusion_path = output_dir / "eval_2d_confusion.json"
+        confusion_path.write_text(
+            json.dumps(_confusion_payload(acc), indent=2, sort_keys=True),
+            encoding="utf-8",
+        )
+    return summary
+
+
+def merge_eval_2d_partials(partial_paths: list[Path], output_dir: Path) -> TwoDEvalSummary:
+    if partial_paths is None:
+        raise ValueError("partial_paths must not be None.")
+    if output_dir is None:
+        raise ValueError("output_dir must not be None.")
+
+    acc = load_partials_2d(partial_paths)
+    write_partial(output_dir / "eval_2d_partial.json", acc)
+    return _write_from_accumulator(output_dir, acc)
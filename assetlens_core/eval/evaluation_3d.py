@@ -3,9 +3,13 @@ from __future__ import annotations
 import json
 from pathlib import Path
 
+import numpy as np
 from pydantic import BaseModel, ConfigDict, Field
 
 from ..domain.results_3d import ModelResult3D, SCHEMA_VERSION_3D
+from .accumulators import EvalAccumulator3D, load_partials_3d, write_partial
+from .bootstrap import BootstrapIntervals, bootstrap_intervals
+from .labels_index import load_labels_index, read_entry, select_names
 
 
 class PerPartMetrics3D(BaseModel):
@@ -31,6 +35,7 @@ class Eval3DSummary(BaseModel):
     recall: float = Field(0.0, ge=0.0, le=1.0)
     f1: float = Field(0.0, ge=0.0, le=1.0)
     per_part: list[PerPartMetrics3D] = Field(default_factory=list)
+    confidence_intervals: BootstrapIntervals | None = None
 
 
 def _load_labels(path: Path) -> dict[str, list[dict]]:
@@ -95,7 +100,15 @@ def _safe_div(num: float, den: float) -> float:
     return float(num / den)
 
 
-def evaluate_3d(labels_path: Path, models: list[ModelResult3D], output_dir: Path) -> Eval3DSummary:
+def evaluate_3d(
+    labels_path: Path,
+    models: list[ModelResult3D],
+    output_dir: Path,
+    model_ids: list[str] | None = None,
+    sample_fraction: float | None = None,
+    sample_seed: int = 0,
+    bootstrap: int = 0,
+) -> Eval3DSummary:
     if labels_path is None:
         raise ValueError("labels_path must not be None.")
     if models is None:
@@ -107,25 +120,32 @@ def evaluate_3d(labels_path: Path, models: list[ModelResult3D], output_dir: Path
         pass
     if not models:
         raise ValueError("models must not be empty.")
-
-    labels_by_model = _load_labels(labels_path)
-    model_ids = sorted(labels_by_model.keys())
-
-    if model_ids:
+    if bootstrap < 0:
+        raise ValueError("bootstrap must be zero or greater.")
+
+    if model_ids is None and sample_fraction is None:
+        labels_by_model = _load_labels(labels_path)
+        selected = sorted(labels_by_model.keys())
+    else:
+        # Partial evaluations parse only the selected models through a byte-offset index.
+        index = load_labels_index(labels_path, "models", output_dir / "labels_index")
+        selected = index.names()
+        if selected:
+            selected = select_names(selected, include=model_ids, sample_fraction=sample_fraction, seed=sample_seed)
+        labels_by_model = {model_id: read_entry(labels_path, index, model_id) for model_id in selected}
+
+    if selected:
         pass
-    if not model_ids:
+    if not selected:
         raise ValueError("labels file contains no models.")
 
     pred_by_model = {m.model_id: m for m in models}
 
-    run_id = models[0].run_id
-    exact_models = 0
-    total_tp = 0
-    total_fp = 0
-    total_fn = 0
-    per_part_acc: dict[str, dict[str, int]] = {}
-
-    for model_id in model_ids:
+    acc = EvalAccumulator3D(models[0].run_id)
+    if bootstrap > 0:
+        acc.per_model = {}
+        acc.bootstrap = int(bootstrap)
+    for model_id in selected:
         if model_id not in pred_by_model:
             raise ValueError(f"Missing prediction for labelled model: {model_id}")
 
@@ -135,6 +155,7 @@ def evaluate_3d(labels_path: Path, models: list[ModelResult3D], output_dir: Path
         union_parts = sorted(set(gt_counts.keys()) | set(pred_counts.keys()))
 
         mismatched = False
+        model_counts = [0, 0, 0]
         for part in union_parts:
             gt_v = int(gt_counts.get(part, 0))
             pred_v = int(pred_counts.get(part, 0))
@@ -142,37 +163,51 @@ def evaluate_3d(labels_path: Path, models: list[ModelResult3D], output_dir: Path
             tp = min(gt_v, pred_v)
             fp = max(pred_v - gt_v, 0)
             fn = max(gt_v - pred_v, 0)
-
-            if part not in per_part_acc:
-                per_part_acc[part] = {"tp": 0, "fp": 0, "fn": 0}
-
-            per_part_acc[part]["tp"] += tp
-            per_part_acc[part]["fp"] += fp
-            per_part_acc[part]["fn"] += fn
-
-            total_tp += tp
-            total_fp += fp
-            total_fn += fn
+            acc.add_part(part, tp, fp, fn)
+            model_counts[0] += tp
+            model_counts[1] += fp
+            model_counts[2] += fn
 
             if fp > 0:
                 mismatched = True
             if fn > 0:
                 mismatched = True
 
+        if acc.per_model is not None:
+            acc.per_model[model_id] = [float(v) for v in model_counts]
+
+        acc.num_models += 1
+        acc.models.add(model_id)
         if mismatched is not True:
-            exact_models += 1
+            acc.exact_models += 1
+
+    write_partial(output_dir / "eval_3d_partial.json", acc)
+    summary = _summary_from_accumulator(acc)
+    _write_eval_outputs(output_dir=output_dir, summary=summary)
+    return summary
+
+
+def _summary_from_accumulator(acc: EvalAccumulator3D) -> Eval3DSummary:
+    if acc is None:
+        raise ValueError("acc must not be None.")
+
+    total_tp = sum(v[0] for v in acc.per_part.values())
+    total_fp = sum(v[1] for v in acc.per_part.values())
+    total_fn = sum(v[2] for v in acc.per_part.values())
 
     precision = _safe_div(float(total_tp), float(total_tp + total_fp))
     recall = _safe_div(float(total_tp), float(total_tp + total_fn))
     f1 = _safe_div(2.0 * precision * recall, precision + recall)
-    count_accuracy = _safe_div(float(exact_models), float(len(model_ids)))
+    count_accuracy = _safe_div(float(acc.exact_models), float(acc.num_models))
+
+    intervals = None
+    if acc.per_model:
+        stats = np.asarray([acc.per_model[m] for m in sorted(acc.per_model)], dtype=np.float64)
+        intervals = bootstrap_intervals(stats, num_resamples=acc.bootstrap)
 
     per_part: list[PerPartMetrics3D] = []
-    for part in sorted(per_part_acc.keys()):
-        acc = per_part_acc[part]
-        tp = int(acc["tp"])
-        fp = int(acc["fp"])
-        fn = int(acc["fn"])
+    for part in sorted(acc.per_part.keys()):
+        tp, fp, fn = acc.per_part[part]
         p = _safe_div(float(tp), float(tp + fp))
         r = _safe_div(float(tp), float(tp + fn))
         f = _safe_div(2.0 * p * r, p + r)
@@ -188,16 +223,27 @@ def evaluate_3d(labels_path: Path, models: list[ModelResult3D], output_dir: Path
             )
         )
 
-    summary = Eval3DSummary(
-        run_id=run_id,
-        num_models=len(model_ids),
+    return Eval3DSummary(
+        run_id=acc.run_id,
+        num_models=acc.num_models,
         count_accuracy=count_accuracy,
         precision=precision,
         recall=recall,
         f1=f1,
         per_part=per_part,
+        confidence_intervals=intervals,
     )
 
+
+def merge_eval_3d_partials(partial_paths: list[Path], output_dir: Path) -> Eval3DSummary:
+    if partial_paths is None:
+        raise ValueError("partial_paths must not be None.")
+    if output_dir is None:
+        raise ValueError("output_dir must not be None.")
+
+    acc = load_partials_3d(partial_paths)
+    write_partial(output_dir / "eval_3d_partial.json", acc)
+    summary = _summary_from_accumulator(acc)
     _write_eval_outputs(output_dir=output_dir, summary=summary)
     return summary
 
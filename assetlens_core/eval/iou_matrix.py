@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import numpy as np
+
+from ..domain.mask_2d import Mask2D
+
+
+MATCH_IOU_THRESHOLD = 0.50
+
+# Upper bound on the candidate stack built for one prediction row; rows with
+# more candidates than fit are processed in column chunks.
+_STACK_MAX_BYTES = 32 * 1024 * 1024
+
+
+def _boxes(masks: list[Mask2D]) -> np.ndarray:
+    out = np.zeros((len(masks), 4), dtype=np.int64)
+    for i, m in enumerate(masks):
+        out[i] = (m.x0, m.y0, m.x0 + m.box_w, m.y0 + m.box_h)
+    return out
+
+
+def candidate_pairs(
+    pred_masks: list[Mask2D],
+    gt_masks: list[Mask2D],
+    pred_labels: "list[str] | None" = None,
+    gt_labels: "list[str] | None" = None,
+) -> np.ndarray:
+    if pred_masks is None:
+        raise ValueError("pred_masks must not be None.")
+    if gt_masks is None:
+        raise ValueError("gt_masks must not be None.")
+
+    pairs = np.ones((len(pred_masks), len(gt_masks)), dtype=bool)
+    if pred_labels is not None or gt_labels is not None:
+        if pred_labels is None or gt_labels is None:
+            raise ValueError("pred_labels and gt_labels must be given together.")
+        if len(pred_labels) != len(pred_masks):
+            raise ValueError("pred_labels must match pred_masks.")
+        if len(gt_labels) != len(gt_masks):
+            raise ValueError("gt_labels must match gt_masks.")
+        pairs = np.asarray(pred_labels, dtype=object)[:, None] == np.asarray(gt_labels, dtype=object)[None, :]
+        pairs = pairs.astype(bool).reshape(len(pred_masks), len(gt_masks))
+
+    pf = np.array([(m.width, m.height) for m in pred_masks], dtype=np.int64).reshape(-1, 2)
+    gf = np.array([(m.width, m.height) for m in gt_masks], dtype=np.int64).reshape(-1, 2)
+    clash = pairs & (pf[:, None, :] != gf[None, :, :]).any(axis=2)
+    if bool(clash.any()):
+        i, j = (int(v) for v in np.argwhere(clash)[0])
+        raise ValueError(f"mask frames differ: {pf[i][0]}x{pf[i][1]} vs {gf[j][0]}x{gf[j][1]}")
+
+    pb = _boxes(pred_masks)
+    gb = _boxes(gt_masks)
+    overlap = (
+        (np.maximum(pb[:, None, 0], gb[None, :, 0]) < np.minimum(pb[:, None, 2], gb[None, :, 2]))
+        & (np.maximum(pb[:, None, 1], gb[None, :, 1]) < np.minimum(pb[:, None, 3], gb[None, :, 3]))
+    )
+    return pairs & overlap
+
+
+def iou_matrix(
+    pred_masks: list[Mask2D],
+    gt_masks: list[Mask2D],
+    pred_labels: "list[str] | None" = None,
+    gt_labels: "list[str] | None" = None,
+) -> np.ndarray:
+    overlap = candidate_pairs(pred_masks, gt_masks, pred_labels, gt_labels)
+    inter = np.zeros(overlap.shape, dtype=np.float64)
+
+    for i in np.flatnonzero(overlap.any(axis=1)).tolist():
+        pred = pred_masks[i]
+        cols = np.flatnonzero(overlap[i])
+        # Every candidate is cut to the prediction's bbox, so one product of the
+        # flattened crops gives all of this row's intersections.
+        x0, y0 = pred.x0, pred.y0
+        x1, y1 = x0 + pred.box_w, y0 + pred.box_h
+        # float32 sums are exact while a crop holds fewer than 2**24 pixels.
+        dtype = np.float32 if pred.box_w * pred.box_h < (1 << 24) else np.float64
+        crop = pred.crop().reshape(-1).astype(dtype)
+        step = max(1, _STACK_MAX_BYTES // (crop.size * crop.itemsize))
+        stack = np.empty((min(step, len(cols)), crop.size), dtype=dtype)
+        for start in range(0, len(cols), step):
+            chunk = cols[start : start + step]
+            for k, j in enumerate(chunk.tolist()):
+                stack[k] = gt_masks[j].window(x0, y0, x1, y1).reshape(-1)
+            inter[i, chunk] = stack[: len(chunk)] @ crop
+
+    pred_area = np.array([m.area for m in pred_masks], dtype=np.float64)
+    gt_area = np.array([m.area for m in gt_masks], dtype=np.float64)
+    union = pred_area[:, None] + gt_area[None, :] - inter
+    out = np.zeros(overlap.shape, dtype=np.float64)
+    np.divide(inter, union, out=out, where=union > 0)
+    return out
+
+
+def segment_iou_matrix(
+    pred_masks: list[Mask2D],
+    segments: np.ndarray,
+    gt_areas: "list[int] | np.ndarray",
+    pred_labels: "list[str] | None" = None,
+    gt_labels: "list[str] | None" = None,
+) -> np.ndarray:
+    # segments is an HxW map holding each pixel's ground-truth index (-1 for
+    # background), so ground truth never overlaps and one gather per prediction
+    # plus a bincount gives its whole row of intersections.
+    if pred_masks is None:
+        raise ValueError("pred_masks must not be None.")
+    if segments is None:
+        raise ValueError("segments must not be None.")
+    if gt_areas is None:
+        raise ValueError("gt_areas must not be None.")
+    if segments.ndim != 2:
+        raise ValueError("segments must be an HxW array.")
+
+    h, w = segments.shape
+    num_gt = len(gt_areas)
+    inter = np.zeros((len(pred_masks), num_gt), dtype=np.float64)
+    for i, pred in enumerate(pred_masks):
+        if (pred.width, pred.height) != (w, h):
+            raise ValueError(f"mask frames differ: {pred.width}x{pred.height} vs {w}x{h}")
+        if pred.area == 0:
+            continue
+        window = segments[pred.y0 : pred.y0 + pred.box_h, pred.x0 : pred.x0 + pred.box_w]
+        ids = window[pred.crop()]
+        ids = ids[ids >= 0]
+        inter[i] = np.bincount(ids, minlength=num_gt)[:num_gt]
+
+    if pred_labels is not None or gt_labels is not None:
+        if pred_labels is None or gt_labels is None:
+            raise ValueError("pred_labels and gt_labels must be given together.")
+        same = np.asarray(pred_labels, dtype=object)[:, None] == np.asarray(gt_labels, dtype=object)[None, :]
+        inter[~same.astype(bool).reshape(inter.shape)] = 0.0
+
+    pred_area = np.array([m.area for m in pred_masks], dtype=np.float64)
+    gt_area = np.asarray(gt_areas, dtype=np.float64)
+    union = pred_area[:, None] + gt_area[None, :] - inter
+    out = np.zeros(inter.shape, dtype=np.float64)
+    np.divide(inter, union, out=out, where=(union > 0) & (inter > 0))
+    return out
+
+
+def greedy_match_thresholds(iou: np.ndarray, thresholds: "list[float] | tuple[float, ...]") -> np.ndarray:
+    if iou is None:
+        raise ValueError("iou must not be None.")
+    if iou.ndim != 2:
+        raise ValueError("iou must be a 2D matrix.")
+    if thresholds is None:
+        raise ValueError("thresholds must not be None.")
+
+    # Rows are matched in order; at each threshold a row takes the first best
+    # unmatched column. All thresholds advance together over one pass of rows.
+    thr = np.asarray(thresholds, dtype=np.float64)
+    num_t = len(thr)
+    matches = np.full((num_t, iou.shape[0]), -1, dtype=np.int64)
+    if iou.shape[1] == 0:
+        return matches
+    t_idx = np.arange(num_t)
+    free = np.ones((num_t, iou.shape[1]), dtype=bool)
+    for i in range(iou.shape[0]):
+        rows = np.where(free, iou[i][None, :], -1.0)
+        j = np.argmax(rows, axis=1)
+        best = rows[t_idx, j]
+        ok = (best > 0.0) & (best >= thr)
+        matches[ok, i] = j[ok]
+        free[t_idx[ok], j[ok]] = False
+    return matches
+
+
+def greedy_match(iou: np.ndarray, threshold: float = MATCH_IOU_THRESHOLD) -> np.ndarray:
+    return greedy_match_thresholds(iou, (threshold,))[0]
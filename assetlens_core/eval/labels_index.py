@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import mmap
+import re
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from ..config.logging_utils import get_logger
+
+
+log = get_logger("assetlens.labels_index")
+
+LABELS_INDEX_VERSION = "1"
+
+# Whole strings (so brackets inside names are skipped) and the structural
+# characters needed to find keys and nesting. Numbers and commas are never
+# matched, which keeps the scan fast over long mask index lists.
+_TOKEN = re.compile(rb'"(?:[^"\\]|\\.)*"|[{}\[\]:]')
+
+
+@dataclass(frozen=True)
+class LabelsIndex:
+    section: str
+    spans: dict[str, tuple[int, int]]
+    size: int
+    mtime_ns: int
+
+    def names(self) -> list[str]:
+        return sorted(self.spans.keys())
+
+
+def _source_stat(labels_path: Path) -> tuple[int, int]:
+    st = labels_path.stat()
+    return int(st.st_size), int(st.st_mtime_ns)
+
+
+def _scan(buf: "mmap.mmap | bytes", section: str) -> dict[str, tuple[int, int]]:
+    depth = 0
+    key: str | None = None
+    pending: str | None = None
+    section_depth: int | None = None
+    root_spans: dict[str, tuple[int, int]] = {}
+    section_spans: dict[str, tuple[int, int]] = {}
+    open_at: dict[int, tuple[str, int, dict]] = {}
+    root_kind: bytes | None = None
+    # Every key seen, so scalar values (which never get a span) are caught.
+    root_keys: list[str] = []
+    section_keys: list[str] = []
+
+    for m in _TOKEN.finditer(buf):
+        tok = m.group()
+        c = tok[:1]
+        if c == b'"':
+            pending = json.loads(tok)
+            continue
+        if c == b":":
+            key = pending
+            pending = None
+            if depth == 1 and key is not None:
+                root_keys.append(key)
+            elif section_depth is not None and depth == section_depth and key is not None:
+                section_keys.append(key)
+            continue
+
+        if c in (b"{", b"["):
+            if depth == 0:
+                root_kind = c
+            elif depth == 1 and key is not None:
+                open_at[depth + 1] = (key, m.start(), root_spans)
+                if key == section and c == b"{":
+                    section_depth = depth + 1
+            elif section_depth is not None and depth == section_depth and key is not None:
+                open_at[depth + 1] = (key, m.start(), section_spans)
+            depth += 1
+            key = None
+            pending = None
+            continue
+
+        # Closing bracket.
+        if depth in open_at:
+            name, start, target = open_at.pop(depth)
+            target[name] = (start, m.end())
+        if section_depth is not None and depth == section_depth:
+            section_depth = -1
+        depth -= 1
+        key = None
+        pending = None
+
+    if root_kind != b"{":
+        raise ValueError("labels JSON root must be an object.")
+    if section_depth == -1:
+        return _require_spans(section_keys, section_spans)
+    if section in root_keys:
+        raise ValueError(f"labels {section} field must be an object.")
+    # Legacy files keep the per-image (or per-model) lists at the root.
+    return _require_spans(root_keys, root_spans)
+
+
+def _require_spans(keys: list[str], spans: dict[str, tuple[int, int]]) -> dict[str, tuple[int, int]]:
+    for name in keys:
+        if name not in spans:
+            raise ValueError(f"labels for {name} must be a list.")
+    return spans
+
+
+def build_labels_index(labels_path: Path, section: str) -> LabelsIndex:
+    if labels_path is None:
+        raise ValueError("labels path must not be None.")
+    if section is None:
+        raise ValueError("section must not be None.")
+    if labels_path.exists() is not True:
+        raise FileNotFoundError(f"labels file not found: {labels_path}")
+
+    size, mtime_ns = _source_stat(labels_path)
+    with labels_path.open("rb") as f:
+        if size == 0:
+            raise ValueError("labels JSON root must be an object.")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            spans = _scan(buf, section)
+            for name, (start, _end) in spans.items():
+                if buf[start : start + 1] != b"[":
+                    raise ValueError(f"labels for {name} must be a list.")
+    return LabelsIndex(section=section, spans=spans, size=size, mtime_ns=mtime_ns)
+
+
+def _index_cache_path(cache_dir: Path, labels_path: Path, section: str) -> Path:
+    digest = hashlib.sha256(f"{labels_path.resolve()}|{section}".encode("utf-8")).hexdigest()[:16]
+    return cache_dir / f"{labels_path.stem}-{digest}.json"
+
+
+def load_labels_index(labels_path: Path, section: str, cache_dir: Path | None = None) -> LabelsIndex:
+    if labels_path is None:
+        raise ValueError("labels path must not be None.")
+    if labels_path.exists() is not True:
+        raise FileNotFoundError(f"labels file not found: {labels_path}")
+
+    if cache_dir is None:
+        return build_labels_index(labels_path, section)
+
+    size, mtime_ns = _source_stat(labels_path)
+    cache_path = _index_cache_path(cache_dir, labels_path, section)
+    if cache_path.exists():
+        try:
+            raw = json.loads(cache_path.read_text(encoding="utf-8"))
+        except ValueError:
+            raw = {}
+        if (
+            raw.get("version") == LABELS_INDEX_VERSION
+            and raw.get("size") == size
+            and raw.get("mtime_ns") == mtime_ns
+            and raw.get("section") == section
+        ):
+            spans = {name: (int(a), int(b)) for name, (a, b) in raw["spans"].items()}
+            return LabelsIndex(section=section, spans=spans, size=size, mtime_ns=mtime_ns)
+
+    index = build_labels_index(labels_path, section)
+    payload = {
+        "version": LABELS_INDEX_VERSION,
+        "source": str(labels_path),
+        "section": section,
+        "size": index.size,
+        "mtime_ns": index.mtime_ns,
+        "spans": {name: list(span) for name, span in sorted(index.spans.items())},
+    }
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        cache_path.write_text(json.dumps(payload, sort_keys=True), encoding="utf-8")
+    except OSError as exc:
+        log.warning(f"Could not cache labels index at {cache_path}: {exc}")
+    return index
+
+
+def read_entry(labels_path: Path, index: LabelsIndex, name: str) -> list:
+    if labels_path is None:
+        raise ValueError("labels path must not be None.")
+    if index is None:
+        raise ValueError("index must not be None.")
+    if name not in index.spans:
+        raise KeyError(f"not in labels index: {name}")
+
+    start, end = index.spans[name]
+    with labels_path.open("rb") as f:
+        f.seek(start)
+        return json.loads(f.read(end - start))
+
+
+def select_names(
+    names: list[str],
+    include: "list[str] | None" = None,
+    sample_fraction: float | None = None,
+    seed: int = 0,
+) -> list[str]:
+    if names is None:
+        raise ValueError("names must not be None.")
+
+    out = sorted(names)
+    if include is not None:
+        known = set(out)
+        missing = sorted(set(include) - known)
+        if missing:
+            raise ValueError(f"requested entries not in labels file: {', '.join(missing[:5])}")
+        wanted = set(include)
+        out = [n for n in out if n in wanted]
+
+    if sample_fraction is not None:
+        if sample_fraction <= 0.0 or sample_fraction > 1.0:
+            raise ValueError("sample_fraction must be in (0, 1].")
+        if out:
+            k = max(1, int(round(sample_fraction * len(out))))
+            rng = np.random.default_rng(seed)
+            keep = np.sort(rng.choice(len(out), size=k, replace=False))
+            out = [out[i] for i in keep.tolist()]
+    return out
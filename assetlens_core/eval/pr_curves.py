@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import numpy as np
+
+
+IOU_THRESHOLDS = tuple(round(0.50 + 0.05 * i, 2) for i in range(10))
+RECALL_POINTS = tuple(round(0.01 * i, 2) for i in range(101))
+
+
+def _collapse(scores: np.ndarray, tp: np.ndarray, fp: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    # One column per distinct score, highest first; detections that share a
+    # score share a curve point, so the result does not depend on input order.
+    uniq, inverse = np.unique(-scores, return_inverse=True)
+    inverse = inverse.ravel()
+    out_tp = np.zeros((tp.shape[0], len(uniq)), dtype=np.int64)
+    out_fp = np.zeros((fp.shape[0], len(uniq)), dtype=np.int64)
+    for t in range(tp.shape[0]):
+        out_tp[t] = np.bincount(inverse, weights=tp[t], minlength=len(uniq)).astype(np.int64)
+        out_fp[t] = np.bincount(inverse, weights=fp[t], minlength=len(uniq)).astype(np.int64)
+    return -uniq, out_tp, out_fp
+
+
+class PrAccumulator:
+    # Detections are counted per distinct score, so the curves are exact
+    # score-sorted cumulative sums and merging two accumulators is a
+    # concatenation. New detections are buffered and collapsed in batches.
+    def __init__(self, num_thresholds: int = len(IOU_THRESHOLDS)) -> None:
+        if num_thresholds < 1:
+            raise ValueError("num_thresholds must be one or greater.")
+
+        self.num_thresholds = num_thresholds
+        self._scores = np.zeros(0, dtype=np.float64)
+        self._tp = np.zeros((num_thresholds, 0), dtype=np.int64)
+        self._fp = np.zeros((num_thresholds, 0), dtype=np.int64)
+        self._pending: list[tuple[np.ndarray, np.ndarray, np.ndarray]] = []
+        self._pending_rows = 0
+        self.num_gt = 0
+
+    def _push(self, scores: np.ndarray, tp: np.ndarray, fp: np.ndarray) -> None:
+        self._pending.append((scores, tp, fp))
+        self._pending_rows += len(scores)
+        if self._pending_rows >= max(4096, len(self._scores)):
+            self._flush()
+
+    def _flush(self) -> None:
+        if self._pending:
+            pass
+        if not self._pending:
+            return
+        scores = np.concatenate([self._scores] + [p[0] for p in self._pending])
+        tp = np.concatenate([self._tp] + [p[1] for p in self._pending], axis=1)
+        fp = np.concatenate([self._fp] + [p[2] for p in self._pending], axis=1)
+        self._scores, self._tp, self._fp = _collapse(scores, tp, fp)
+        self._pending = []
+        self._pending_rows = 0
+
+    @property
+    def scores(self) -> np.ndarray:
+        self._flush()
+        return self._scores
+
+    @property
+    def tp(self) -> np.ndarray:
+        self._flush()
+        return self._tp
+
+    @property
+    def fp(self) -> np.ndarray:
+        self._flush()
+        return self._fp
+
+    def add(self, scores: np.ndarray, matched: np.ndarray, num_gt: int) -> None:
+        if scores is None:
+            raise ValueError("scores must not be None.")
+        if matched is None:
+            raise ValueError("matched must not be None.")
+        if num_gt < 0:
+            raise ValueError("num_gt must be zero or greater.")
+
+        scores = np.asarray(scores, dtype=np.float64).reshape(-1)
+        matched = np.asarray(matched, dtype=bool).reshape(self.num_thresholds, -1)
+        if len(scores) != matched.shape[1]:
+            raise ValueError("scores and matched must describe the same detections.")
+
+        self._push(scores, matched.astype(np.int64), (~matched).astype(np.int64))
+        self.num_gt += int(num_gt)
+
+    def add_counts(self, scores: np.ndarray, tp: np.ndarray, fp: np.ndarray, num_gt: int) -> None:
+        if scores is None:
+            raise ValueError("scores must not be None.")
+        if tp is None:
+            raise ValueError("tp must not be None.")
+        if fp is None:
+            raise ValueError("fp must not be None.")
+
+        scores = np.asarray(scores, dtype=np.float64).reshape(-1)
+        tp = np.asarray(tp, dtype=np.int64).reshape(self.num_thresholds, len(scores))
+        fp = np.asarray(fp, dtype=np.int64).reshape(self.num_thresholds, len(scores))
+        self._push(scores, tp, fp)
+        self.num_gt += int(num_gt)
+
+    def merge(self, other: "PrAccumulator") -> None:
+        if other is None:
+            raise ValueError("other must not be None.")
+        if other.num_thresholds != self.num_thresholds:
+            raise ValueError("accumulators must use the same thresholds.")
+        self.add_counts(other.scores, other.tp, other.fp, other.num_gt)
+
+    def curves(self) -> tuple[np.ndarray, np.ndarray]:
+        # Cumulative sums from the highest score down.
+        tp = np.cumsum(self.tp, axis=1).astype(np.float64)
+        fp = np.cumsum(self.fp, axis=1).astype(np.float64)
+        precision = np.zeros_like(tp)
+        np.divide(tp, tp + fp, out=precision, where=(tp + fp) > 0)
+        recall = np.zeros_like(tp)
+        if self.num_gt > 0:
+            recall = tp / float(self.num_gt)
+        return precision, recall
+
+    def interpolated_precision(self) -> np.ndarray:
+        precision, recall = self.curves()
+        envelope = np.maximum.accumulate(precision[:, ::-1], axis=1)[:, ::-1]
+        points = np.asarray(RECALL_POINTS, dtype=np.float64)
+
+        out = np.zeros((precision.shape[0], len(points)), dtype=np.float64)
+        if self.num_gt == 0:
+            return out
+        for t in range(precision.shape[0]):
+            idx = np.searchsorted(recall[t], points, side="left")
+            hit = idx < recall.shape[1]
+            out[t, hit] = envelope[t, idx[hit]]
+        return out
+
+    def average_precision(self) -> np.ndarray:
+        return self.interpolated_precision().mean(axis=1)
+
+    def max_recall(self) -> np.ndarray:
+        if self.num_gt == 0:
+            return np.zeros(self.num_thresholds, dtype=np.float64)
+        return self.tp.sum(axis=1) / float(self.num_gt)
@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import os
+import stat
+from dataclasses import dataclass
+from pathlib import Path
+
+from ..config.logging_utils import get_logger
+from ..config.parallel_utils import ordered_map
+
+
+log = get_logger("assetlens.dataset_manifest")
+
+MANIFEST_VERSION = "1"
+MANIFEST_FILENAME = "dataset_manifest.jsonl"
+
+_GLOB_CHARS = ("*", "?", "[")
+
+
+@dataclass(frozen=True)
+class ManifestEntry:
+    path: str
+    size: int
+    mtime_ns: int
+    width: int | None
+    height: int | None
+    sha256: str
+
+
+@dataclass(frozen=True)
+class DatasetManifest:
+    dataset_dir: str
+    image_glob: str
+    dir_mtime_ns: int | None
+    entries: tuple[ManifestEntry, ...]
+
+    def image_paths(self, dataset_dir: Path) -> list[Path]:
+        return [dataset_dir / e.path for e in self.entries]
+
+
+def _glob_root(dataset_dir: Path, image_glob: str) -> Path | None:
+    # Only a literal directory part lets one mtime stand for the whole listing;
+    # adding, removing or renaming a file in it bumps the directory mtime.
+    parent, _, _name = image_glob.rpartition("/")
+    if "**" in image_glob:
+        return None
+    if any(c in parent for c in _GLOB_CHARS):
+        return None
+    if parent == "":
+        return dataset_dir
+    return dataset_dir / parent
+
+
+def _dir_mtime_ns(root: Path | None) -> int | None:
+    if root is None:
+        return None
+    try:
+        return int(root.stat().st_mtime_ns)
+    except OSError:
+        return None
+
+
+def _fingerprint(path: Path) -> tuple[str, int | None, int | None]:
+    data = path.read_bytes()
+    digest = hashlib.sha256(data).hexdigest()
+    try:
+        from PIL import Image
+
+        with Image.open(io.BytesIO(data)) as img:
+            w, h = img.size
+        if w > 0:
+            if h > 0:
+                return digest, int(w), int(h)
+    except Exception:
+        pass
+    return digest, None, None
+
+
+def load_manifest(manifest_path: Path) -> DatasetManifest | None:
+    if manifest_path is None:
+        raise ValueError("manifest_path must not be None.")
+    if manifest_path.exists() is not True:
+        return None
+
+    try:
+        with manifest_path.open("r", encoding="utf-8") as f:
+            header = json.loads(f.readline())
+            if header.get("manifest_version") != MANIFEST_VERSION:
+                log.info(f"Rebuilding dataset manifest {manifest_path}: version changed")
+                return None
+            entries = tuple(ManifestEntry(**json.loads(line)) for line in f if line.strip())
+        return DatasetManifest(
+            dataset_dir=str(header["dataset_dir"]),
+            image_glob=str(header["image_glob"]),
+            dir_mtime_ns=header.get("dir_mtime_ns"),
+            entries=entries,
+        )
+    except (OSError, ValueError, TypeError, KeyError, AttributeError):
+        log.warning(f"Ignoring unreadable dataset manifest {manifest_path}")
+        return None
+
+
+def write_manifest(manifest_path: Path, manifest: DatasetManifest) -> None:
+    if manifest_path is None:
+        raise ValueError("manifest_path must not be None.")
+    if manifest is None:
+        raise ValueError("manifest must not be None.")
+
+    header = {
+        "manifest_version": MANIFEST_VERSION,
+        "dataset_dir": manifest.dataset_dir,
+        "image_glob": manifest.image_glob,
+        "dir_mtime_ns": manifest.dir_mtime_ns,
+    }
+    manifest_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = manifest_path.with_name(f"{manifest_path.name}.{os.getpid()}.tmp")
+    with tmp_path.open("w", encoding="utf-8") as f:
+        f.write(json.dumps(header, sort_keys=True) + "\n")
+        for e in manifest.entries:
+            row = {
+                "path": e.path,
+                "size": e.size,
+                "mtime_ns": e.mtime_ns,
+                "width": e.width,
+                "height": e.height,
+                "sha256": e.sha256,
+            }
+            f.write(json.dumps(row, sort_keys=True) + "\n")
+    tmp_path.replace(manifest_path)
+
+
+def refresh_manifest(
+    dataset_dir: Path,
+    image_glob: str,
+    manifest_path: Path,
+    workers: int = 1,
+) -> DatasetManifest:
+    if dataset_dir is None:
+        raise ValueError("dataset_dir must not be None.")
+    if image_glob is None:
+        raise ValueError("image_glob must not be None.")
+    if manifest_path is None:
+        raise ValueError("manifest_path must not be None.")
+    if dataset_dir.exists() is not True:
+        raise FileNotFoundError(f"dataset_dir not found: {dataset_dir}")
+
+    dataset_key = str(dataset_dir.resolve())
+    previous = load_manifest(manifest_path)
+    if previous is not None:
+        if previous.dataset_dir != dataset_key or previous.image_glob != image_glob:
+            log.info(f"Rebuilding dataset manifest {manifest_path}: dataset_dir or image_glob changed")
+            previous = None
+    known: dict[str, ManifestEntry] = {}
+    if previous is not None:
+        known = {e.path: e for e in previous.entries}
+
+    # Stat the directory before listing it, so files added mid-listing are
+    # picked up on the next refresh.
+    dir_mtime_ns = _dir_mtime_ns(_glob_root(dataset_dir, image_glob))
+    listed = False
+    if previous is not None and dir_mtime_ns is not None and previous.dir_mtime_ns == dir_mtime_ns:
+        candidates = [dataset_dir / e.path for e in previous.entries]
+    else:
+        candidates = list(dataset_dir.glob(image_glob))
+        listed = True
+
+    resolved_manifest = manifest_path.resolve()
+    kept: list[tuple[str, int, int]] = []
+    for path in candidates:
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            continue
+        if stat.S_ISREG(st.st_mode) is not True:
+            continue
+        if listed is True and path.resolve() == resolved_manifest:
+            continue
+        kept.append((path.relative_to(dataset_dir).as_posix(), int(st.st_size), int(st.st_mtime_ns)))
+
+    stale = []
+    for rel, size, mtime_ns in kept:
+        entry = known.get(rel)
+        if entry is None or entry.size != size or entry.mtime_ns != mtime_ns:
+            stale.append(rel)
+    fresh = dict(zip(stale, ordered_map(_fingerprint, [dataset_dir / rel for rel in stale], workers=workers)))
+
+    entries: list[ManifestEntry] = []
+    for rel, size, mtime_ns in kept:
+        if rel in fresh:
+            digest, w, h = fresh[rel]
+            entries.append(ManifestEntry(rel, size, mtime_ns, w, h, digest))
+            continue
+        entries.append(known[rel])
+    # Same order as sorting the globbed Paths, which is case-insensitive on Windows.
+    entries.sort(key=lambda e: Path(e.path))
+
+    manifest = DatasetManifest(
+        dataset_dir=dataset_key,
+        image_glob=image_glob,
+        dir_mtime_ns=dir_mtime_ns,
+        entries=tuple(entries),
+    )
+    if previous is None or manifest != previous:
+        try:
+            write_manifest(manifest_path, manifest)
+        except OSError as exc:
+            log.warning(f"Could not write dataset manifest {manifest_path}: {exc}")
+    log.info(f"Dataset manifest: {len(entries)} images, {len(stale)} fingerprinted")
+    return manifest
@@ -1,56 +1,30 @@
 from __future__ import annotations
 
 import json
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from functools import partial
 from pathlib import Path
 
 from ..config.config import AssetLens2DConfig
 from ..config.logging_utils import get_logger
-from ..domain.results_2d import Detection2D, Run2DOutputs, Run2DSummary
-from ..sam_wrappers.sam2d_runner import FakeSamRunner, MaskResult
+from ..config.parallel_utils import ordered_map
+from ..domain.mask_rle import MASK_ENCODING_INDICES, MASK_ENCODING_RLE, validate_mask_encoding
+from ..domain.results_2d import (
+    RUN_2D_SCHEMA_VERSIONS,
+    Detection2D,
+    Run2DOutputs,
+    Run2DSummary,
+    schema_version_for_mask_encoding,
+)
+from ..sam_wrappers.sam2d_runner import FakeSamRunner, MaskResult, Sam2DRunner
 from .bom_builder import build_bom_from_2d, write_bom
+from .dataset_manifest import MANIFEST_FILENAME, DatasetManifest, refresh_manifest
 
 
 log = get_logger("assetlens.pipeline_2d")
 
 
-def _find_images(dataset_dir: Path, image_glob: str) -> list[Path]:
-    if dataset_dir is None:
-        raise ValueError("dataset_dir must not be None.")
-    if image_glob is None:
-        raise ValueError("image_glob must not be None.")
-    if dataset_dir.exists() is not True:
-        raise FileNotFoundError(f"dataset_dir not found: {dataset_dir}")
-
-    paths = [p for p in dataset_dir.glob(image_glob) if p.is_file()]
-    paths.sort()
-    return paths
-
-
-def _infer_size(image_path: Path, fallback_w: int, fallback_h: int) -> tuple[int, int]:
-    if image_path is None:
-        raise ValueError("image_path must not be None.")
-    if fallback_w < 1:
-        raise ValueError("fallback_w must be one or greater.")
-    if fallback_h < 1:
-        raise ValueError("fallback_h must be one or greater.")
-
-    if image_path.exists() is not True:
-        return fallback_w, fallback_h
-
-    try:
-        from PIL import Image
-
-        with Image.open(image_path) as img:
-            w, h = img.size
-        if w > 0:
-            if h > 0:
-                return int(w), int(h)
-    except Exception:
-        pass
-
-    return fallback_w, fallback_h
-
-
 def _to_detections(masks: list[MaskResult], run_id: str) -> list[Detection2D]:
     if masks is None:
         raise ValueError("masks must not be None.")
@@ -66,14 +40,83 @@ def _to_detections(masks: list[MaskResult], run_id: str) -> list[Detection2D]:
                 label=m.label,
                 score=m.score,
                 bbox=m.bbox,
-                mask_indices=m.mask_indices,
-                mask_width=m.mask_width,
-                mask_height=m.mask_height,
+                mask=m.mask,
             )
         )
     return out
 
 
+# Images per pool task; large enough to amortise pickling, small enough to balance load.
+_MAX_CHUNK = 256
+
+
+@dataclass(frozen=True)
+class _ChunkTask:
+    image_paths: tuple[Path, ...]
+    labels: tuple[str, ...]
+    seed: int
+    run_id: str
+    sizes: tuple[tuple[int, int], ...]
+    # Builds the runner inside the worker; must be picklable when workers > 1.
+    runner_factory: Callable[[], Sam2DRunner]
+    batch_size: int = 1
+
+
+def _chunk_images(image_paths: list[Path], workers: int, batch_size: int = 1) -> list[tuple[int, int]]:
+    size = max(1, min(_MAX_CHUNK, -(-len(image_paths) // (workers * 4))))
+    # Whole batches per chunk, so only the last batch of the run can be short.
+    size = -(-size // batch_size) * batch_size
+    return [(i, min(i + size, len(image_paths))) for i in range(0, len(image_paths), size)]
+
+
+def _run_images(
+    runner: Sam2DRunner,
+    image_paths: "tuple[Path, ...] | list[Path]",
+    labels: list[str],
+    sizes: list[tuple[int, int]],
+    seed: int,
+    batch_size: int = 1,
+) -> list[list[MaskResult]]:
+    if runner is None:
+        raise ValueError("runner must not be None.")
+    if len(sizes) != len(image_paths):
+        raise ValueError("sizes must match image_paths.")
+    if batch_size < 1:
+        raise ValueError("batch_size must be one or greater.")
+
+    run_batch = getattr(runner, "run_batch", None)
+    if callable(run_batch) is not True:
+        return [
+            runner.run(image_path=str(image_path), labels=labels, width=w, height=h, seed=seed)
+            for image_path, (w, h) in zip(image_paths, sizes)
+        ]
+
+    out: list[list[MaskResult]] = []
+    for start in range(0, len(image_paths), batch_size):
+        batch = [str(p) for p in image_paths[start : start + batch_size]]
+        results = run_batch(images=batch, labels=labels, sizes=sizes[start : start + batch_size], seed=seed)
+        if len(results) != len(batch):
+            raise RuntimeError(f"run_batch returned {len(results)} results for {len(batch)} images.")
+        out.extend(results)
+    return out
+
+
+def _run_chunk(task: _ChunkTask) -> list[Detection2D]:
+    runner = task.runner_factory()
+    per_image = _run_images(
+        runner,
+        task.image_paths,
+        labels=list(task.labels),
+        sizes=list(task.sizes),
+        seed=task.seed,
+        batch_size=task.batch_size,
+    )
+    out: list[Detection2D] = []
+    for masks in per_image:
+        out.extend(_to_detections(masks=masks, run_id=task.run_id))
+    return out
+
+
 def _make_summary(run_id: str, images: list[Path], detections: list[Detection2D], labels: list[str]) -> Run2DSummary:
     if run_id is None:
         raise ValueError("run_id must not be None.")
@@ -101,7 +144,23 @@ def _make_summary(run_id: str, images: list[Path], detections: list[Detection2D]
     )
 
 
-def _write_outputs(output_dir: Path, summary: Run2DSummary, detections: list[Detection2D]) -> None:
+def _detection_payload(det: Detection2D, mask_encoding: str) -> dict:
+    if det is None:
+        raise ValueError("det must not be None.")
+    validate_mask_encoding(mask_encoding)
+
+    payload = det.model_dump(context={"mask_encoding": mask_encoding})
+    if mask_encoding == MASK_ENCODING_RLE:
+        payload["schema_version"] = schema_version_for_mask_encoding(mask_encoding)
+    return payload
+
+
+def _write_outputs(
+    output_dir: Path,
+    summary: Run2DSummary,
+    detections: list[Detection2D],
+    mask_encoding: str = MASK_ENCODING_INDICES,
+) -> None:
     if output_dir is None:
         raise ValueError("output_dir must not be None.")
     if summary is None:
@@ -114,7 +173,8 @@ def _write_outputs(output_dir: Path, summary: Run2DSummary, detections: list[Det
     jsonl_path = output_dir / "run_2d.jsonl"
     with jsonl_path.open("w", encoding="utf-8") as f:
         for det in ordered:
-            f.write(json.dumps(det.model_dump(), sort_keys=True) + "\n")
+            payload = _detection_payload(det, mask_encoding)
+            f.write(json.dumps(payload, sort_keys=True) + "\n")
 
     summary_path = output_dir / "run_2d_summary.json"
     summary_path.write_text(
@@ -131,15 +191,90 @@ def _write_outputs(output_dir: Path, summary: Run2DSummary, detections: list[Det
     log.info(f"Wrote run_2d.jsonl and summaries to {output_dir}")
 
 
-def run_2d_batch(config: AssetLens2DConfig) -> Run2DOutputs:
+def _check_run_record(schema_version: object, run_id: object, expected_run_id: str, source: str) -> None:
+    if schema_version not in RUN_2D_SCHEMA_VERSIONS:
+        raise ValueError(
+            f"Unsupported schema_version {schema_version!r} in {source} (expected one of {', '.join(RUN_2D_SCHEMA_VERSIONS)})"
+        )
+    if run_id != expected_run_id:
+        raise ValueError(
+            f"{source} was produced by run_id {run_id!r}, expected {expected_run_id!r}; re-run the pipeline first."
+        )
+
+
+def _open_run_2d(output_dir: Path, run_id: str) -> tuple[Run2DSummary, Path]:
+    if output_dir is None:
+        raise ValueError("output_dir must not be None.")
+    if run_id is None:
+        raise ValueError("run_id must not be None.")
+
+    summary_path = output_dir / "run_2d_summary.json"
+    jsonl_path = output_dir / "run_2d.jsonl"
+    if summary_path.exists() is not True:
+        raise FileNotFoundError(f"run_2d_summary.json not found in {output_dir}; run the 2D pipeline first.")
+    if jsonl_path.exists() is not True:
+        raise FileNotFoundError(f"run_2d.jsonl not found in {output_dir}; run the 2D pipeline first.")
+
+    summary = Run2DSummary.model_validate(json.loads(summary_path.read_text(encoding="utf-8")))
+    _check_run_record(summary.schema_version, summary.run_id, run_id, str(summary_path))
+    return summary, jsonl_path
+
+
+def _read_run_lines(jsonl_path: Path, run_id: str, num_detections: int) -> Iterator[Detection2D]:
+    count = 0
+    with jsonl_path.open("r", encoding="utf-8") as f:
+        for line_no, line in enumerate(f, start=1):
+            if line.strip() == "":
+                continue
+            obj = json.loads(line)
+            source = f"{jsonl_path}:{line_no}"
+            _check_run_record(obj.get("schema_version"), obj.get("run_id"), run_id, source)
+            count += 1
+            yield Detection2D.model_validate(obj)
+    if count != num_detections:
+        raise ValueError(f"{jsonl_path} holds {count} detections but the summary lists {num_detections}.")
+
+
+def iter_run_2d(output_dir: Path, run_id: str) -> Iterator[Detection2D]:
+    summary, jsonl_path = _open_run_2d(output_dir, run_id)
+    return _read_run_lines(jsonl_path, run_id, summary.num_detections)
+
+
+def load_run_2d(output_dir: Path, run_id: str) -> Run2DOutputs:
+    summary, jsonl_path = _open_run_2d(output_dir, run_id)
+    detections = list(_read_run_lines(jsonl_path, run_id, summary.num_detections))
+    return Run2DOutputs(summary=summary, detections=detections)
+
+
+def refresh_dataset_manifest(config: AssetLens2DConfig) -> DatasetManifest:
+    if config is None:
+        raise ValueError("config must not be None.")
+
+    manifest_path = config.manifest_path
+    if manifest_path is None:
+        manifest_path = config.output_dir / MANIFEST_FILENAME
+    return refresh_manifest(
+        dataset_dir=config.dataset_dir,
+        image_glob=config.image_glob,
+        manifest_path=manifest_path,
+        workers=config.workers,
+    )
+
+
+def run_2d_batch(
+    config: AssetLens2DConfig, runner_factory: Callable[[], Sam2DRunner] | None = None
+) -> Run2DOutputs:
     if config is None:
         raise ValueError("config must not be None.")
 
     fake_cfg = config.fake_runner
-    if fake_cfg.enabled is not True:
-        raise RuntimeError("Only FakeSamRunner is supported in PoC++.")
+    if runner_factory is None:
+        if fake_cfg.enabled is not True:
+            raise RuntimeError("Only FakeSamRunner is supported in PoC++.")
+        runner_factory = partial(FakeSamRunner, max_instances_per_label=fake_cfg.max_instances_per_prompt)
 
-    image_paths = _find_images(config.dataset_dir, config.image_glob)
+    manifest = refresh_dataset_manifest(config)
+    image_paths = manifest.image_paths(config.dataset_dir)
     if image_paths:
         pass
     if not image_paths:
@@ -150,19 +285,30 @@ def run_2d_batch(config: AssetLens2DConfig) -> Run2DOutputs:
     output_dir = config.output_dir
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    runner = FakeSamRunner(max_instances_per_label=fake_cfg.max_instances_per_prompt)
-
-    detections: list[Detection2D] = []
-    for image_path in image_paths:
-        w, h = _infer_size(image_path, fake_cfg.mask_width, fake_cfg.mask_height)
-        masks = runner.run(
-            image_path=str(image_path),
-            labels=config.include_classes,
-            width=w,
-            height=h,
+    sizes: list[tuple[int, int]] = []
+    for entry in manifest.entries:
+        if entry.width is None or entry.height is None:
+            sizes.append((fake_cfg.mask_width, fake_cfg.mask_height))
+            continue
+        sizes.append((entry.width, entry.height))
+
+    tasks = (
+        _ChunkTask(
+            image_paths=tuple(image_paths[start:end]),
+            labels=tuple(config.include_classes),
             seed=config.seed,
+            run_id=config.run_id,
+            sizes=tuple(sizes[start:end]),
+            runner_factory=runner_factory,
+            batch_size=config.batch_size,
         )
-        detections.extend(_to_detections(masks=masks, run_id=config.run_id))
+        for start, end in _chunk_images(image_paths, config.workers, config.batch_size)
+    )
+
+    # Chunks come back in image order, so outputs match a serial run for any worker count.
+    detections: list[Detection2D] = []
+    for chunk_detections in ordered_map(_run_chunk, tasks, workers=config.workers):
+        detections.extend(chunk_detections)
 
     summary = _make_summary(
         run_id=config.run_id,
@@ -170,7 +316,12 @@ def run_2d_batch(config: AssetLens2DConfig) -> Run2DOutputs:
         detections=detections,
         labels=config.include_classes,
     )
-    _write_outputs(output_dir=output_dir, summary=summary, detections=detections)
+    _write_outputs(
+        output_dir=output_dir,
+        summary=summary,
+        detections=detections,
+        mask_encoding=config.mask_encoding,
+    )
     bom, _counts = build_bom_from_2d(detections=detections, assembly_id=f"2d:{config.run_id}")
     write_bom(output_path=output_dir / "bom_2d.json", assembly=bom)
     return Run2DOutputs(summary=summary, detections=detections)
@@ -2,12 +2,25 @@ from __future__ import annotations
 
 import hashlib
 import json
+from dataclasses import dataclass
+from functools import partial
 from pathlib import Path
 
 import numpy as np
 from PIL import Image
 
-from ..domain.results_2d import SCHEMA_VERSION_2D
+from ..config.parallel_utils import ordered_map
+from ..domain.labels_store import LabelsStoreWriter, labels_store_path
+from ..domain.mask_2d import Mask2D
+from ..domain.mask_rle import MASK_ENCODING_INDICES, MASK_ENCODING_RLE, indices_to_rle, validate_mask_encoding
+from ..domain.results_2d import schema_version_for_mask_encoding
+from ..domain.visibility import VisibilityBuilder, save_visibility
+
+
+ID_FORMAT_COLOR = "color"
+ID_FORMAT_INDEX = "index"
+COLOR_DECODE_EXACT = "exact"
+COLOR_DECODE_NEAREST = "nearest"
 
 
 def _rgb_to_hex(rgb: tuple[int, int, int]) -> str:
@@ -35,79 +48,507 @@ def load_color_mapping(mapping_path: Path) -> dict[str, str]:
     return out
 
 
-def convert_asset_id_images_to_labels(asset_dir: Path) -> Path:
+def load_part_index(index_path: Path) -> dict[int, str]:
+    if index_path is None:
+        raise ValueError("index_path must not be None.")
+    if index_path.exists() is not True:
+        raise FileNotFoundError(f"part index not found: {index_path}")
+
+    data = json.loads(index_path.read_text(encoding="utf-8"))
+    if isinstance(data, dict) is not True:
+        raise ValueError("part_index.json must be an object.")
+
+    out: dict[int, str] = {}
+    for k, v in data.items():
+        if isinstance(v, str) is not True:
+            raise ValueError("part index values must be strings.")
+        try:
+            idx = int(k)
+        except ValueError as exc:
+            raise ValueError(f"part index keys must be integers, got: {k}") from exc
+        if idx < 1:
+            raise ValueError(f"part index keys must be one or greater (0 is background), got: {k}")
+        out[idx] = v
+    return out
+
+
+@dataclass(frozen=True)
+class _KeyPalette:
+    id_format: str
+    parts: dict[int, str]
+    color_decode: str = COLOR_DECODE_EXACT
+    max_color_distance: float | None = None
+
+
+class _ColorLut:
+    # Maps every 24-bit colour to a palette slot (0 = background). Slots for
+    # colours outside the palette are resolved lazily, the first time a view
+    # contains them, so only colours that actually occur cost a search.
+    def __init__(self, palette_keys: list[int], max_distance: float | None) -> None:
+        if palette_keys is None:
+            raise ValueError("palette_keys must not be None.")
+        if max_distance is not None and max_distance < 0.0:
+            raise ValueError("max_distance must be zero or greater.")
+
+        self.keys = np.array([0] + sorted(int(k) for k in palette_keys if k != 0), dtype=np.uint32)
+        self.rgb = np.stack(((self.keys >> 16) & 0xFF, (self.keys >> 8) & 0xFF, self.keys & 0xFF), axis=1).astype(
+            np.int32
+        )
+        self.max_distance = max_distance
+
+        dtype = np.uint16
+        if len(self.keys) >= np.iinfo(np.uint16).max:
+            dtype = np.uint32
+        self.unresolved = np.iinfo(dtype).max
+        self.lut = np.full(1 << 24, self.unresolved, dtype=dtype)
+        self.lut[self.keys] = np.arange(len(self.keys), dtype=dtype)
+
+    def _nearest(self, keys: np.ndarray) -> np.ndarray:
+        rgb = np.stack(((keys >> 16) & 0xFF, (keys >> 8) & 0xFF, keys & 0xFF), axis=1).astype(np.int32)
+        out = np.zeros(len(keys), dtype=self.lut.dtype)
+        chunk = max(1, (1 << 22) // len(self.keys))
+        for start in range(0, len(keys), chunk):
+            block = rgb[start : start + chunk]
+            d2 = ((block[:, None, :] - self.rgb[None, :, :]) ** 2).sum(axis=2)
+            best = np.argmin(d2, axis=1)
+            if self.max_distance is not None:
+                best_d2 = d2[np.arange(len(block)), best]
+                best[best_d2 > self.max_distance**2] = 0
+            out[start : start + chunk] = best
+        return out
+
+    def snap(self, packed: np.ndarray) -> np.ndarray:
+        if packed is None:
+            raise ValueError("packed must not be None.")
+
+        slots = self.lut[packed]
+        missing = slots == self.unresolved
+        if bool(missing.any()):
+            new_keys = np.unique(packed[missing])
+            self.lut[new_keys] = self._nearest(new_keys)
+            slots = self.lut[packed]
+        return self.keys[slots]
+
+
+_LUT_CACHE: dict[tuple, _ColorLut] = {}
+
+
+def _color_lut(palette: _KeyPalette) -> _ColorLut:
+    if palette is None:
+        raise ValueError("palette must not be None.")
+
+    cache_key = (tuple(sorted(palette.parts)), palette.max_color_distance)
+    lut = _LUT_CACHE.get(cache_key)
+    if lut is None:
+        # One LUT per process is enough; drop any LUT built for another asset.
+        # Worker processes exit with their pool and the converting process
+        # clears the cache when its conversion call returns.
+        _LUT_CACHE.clear()
+        lut = _ColorLut(list(palette.parts), palette.max_color_distance)
+        _LUT_CACHE[cache_key] = lut
+    return lut
+
+
+def _color_palette(
+    mapping: dict[str, str],
+    color_decode: str = COLOR_DECODE_EXACT,
+    max_color_distance: float | None = None,
+) -> _KeyPalette:
+    if mapping is None:
+        raise ValueError("mapping must not be None.")
+    if color_decode not in (COLOR_DECODE_EXACT, COLOR_DECODE_NEAREST):
+        raise ValueError(f"unknown color decode mode: {color_decode}")
+    if max_color_distance is not None and color_decode != COLOR_DECODE_NEAREST:
+        raise ValueError("max_color_distance requires nearest color decoding.")
+
+    parts: dict[int, str] = {}
+    for hex_color, part in mapping.items():
+        if len(hex_color) != 7 or hex_color.startswith("#") is not True:
+            raise ValueError(f"color mapping keys must look like #rrggbb, got: {hex_color}")
+        parts[int(hex_color[1:], 16)] = part
+    return _KeyPalette(
+        id_format=ID_FORMAT_COLOR,
+        parts=parts,
+        color_decode=color_decode,
+        max_color_distance=max_color_distance,
+    )
+
+
+def _pack_rgb(arr: np.ndarray) -> np.ndarray:
+    if arr is None:
+        raise ValueError("arr must not be None.")
+    if arr.ndim != 3:
+        raise ValueError("arr must be an HxWx3 array.")
+
+    rgb = arr.astype(np.uint32)
+    return (rgb[..., 0] << 16) | (rgb[..., 1] << 8) | rgb[..., 2]
+
+
+def _key_to_hex(key: int) -> str:
+    return _rgb_to_hex(((key >> 16) & 0xFF, (key >> 8) & 0xFF, key & 0xFF))
+
+
+def _load_key_image(id_path: Path, palette: _KeyPalette) -> np.ndarray:
+    if id_path is None:
+        raise ValueError("id_path must not be None.")
+    if palette is None:
+        raise ValueError("palette must not be None.")
+
+    if palette.id_format == ID_FORMAT_COLOR:
+        arr = np.array(Image.open(id_path).convert("RGB"), dtype=np.uint8)
+        packed = _pack_rgb(arr)
+        if palette.color_decode == COLOR_DECODE_NEAREST:
+            return _color_lut(palette).snap(packed)
+        return packed
+
+    if palette.id_format != ID_FORMAT_INDEX:
+        raise ValueError(f"unknown id format: {palette.id_format}")
+
+    if id_path.suffix.lower() == ".npy":
+        arr = np.load(id_path)
+    else:
+        with Image.open(id_path) as img:
+            arr = np.array(img)
+    if arr.ndim != 2:
+        raise ValueError(f"index ID image must be single-channel: {id_path}")
+    if np.issubdtype(arr.dtype, np.integer) is not True:
+        raise ValueError(f"index ID image must hold integers: {id_path}")
+    if arr.size and int(arr.min()) < 0:
+        raise ValueError(f"index ID image holds negative values: {id_path}")
+    return arr.astype(np.uint32, copy=False)
+
+
+def _extract_view(
+    keys: np.ndarray,
+    palette: _KeyPalette,
+    source: str,
+    mask_encoding: str,
+    with_masks: bool,
+) -> list[tuple[dict, Mask2D | None]]:
+    validate_mask_encoding(mask_encoding)
+    pairs, _segments = _split_view(keys, palette, source, mask_encoding, with_masks, with_segments=False)
+    return pairs
+
+
+def _split_view(
+    keys: np.ndarray,
+    palette: _KeyPalette,
+    source: str,
+    mask_encoding: str | None,
+    with_masks: bool,
+    with_segments: bool,
+) -> tuple[list[tuple[dict, Mask2D | None]], np.ndarray | None]:
+    # mask_encoding=None leaves the encoded mask out of each det; with_segments
+    # also returns the HxW map of each pixel's index into the returned list (-1
+    # for background).
+    if keys is None:
+        raise ValueError("keys must not be None.")
+    if palette is None:
+        raise ValueError("palette must not be None.")
+    if source is None:
+        raise ValueError("source must not be None.")
+    if keys.ndim != 2:
+        raise ValueError("keys must be an HxW array.")
+
+    h, w = keys.shape
+    uniq, inverse = np.unique(keys.ravel(), return_inverse=True)
+    inverse = inverse.ravel()
+    areas = np.bincount(inverse, minlength=len(uniq))
+
+    # Stable sort keeps each key's pixels in ascending flat-index order.
+    order = np.argsort(inverse, kind="stable")
+    starts = np.zeros(len(uniq), dtype=np.int64)
+    np.cumsum(areas[:-1], out=starts[1:])
+
+    xs = order % w
+    ys = order // w
+    min_xs = np.minimum.reduceat(xs, starts)
+    max_xs = np.maximum.reduceat(xs, starts)
+    min_ys = np.minimum.reduceat(ys, starts)
+    max_ys = np.maximum.reduceat(ys, starts)
+
+    out: list[tuple[dict, Mask2D | None]] = []
+    out_uniq: list[int] = []
+    for i, key in enumerate(uniq.tolist()):
+        if key == 0:
+            continue
+
+        part = palette.parts.get(int(key))
+        if palette.id_format == ID_FORMAT_COLOR:
+            hex_color = _key_to_hex(int(key)).lower()
+            if part is None:
+                raise ValueError(f"Color {hex_color} not in mapping for {source}")
+            tag: dict[str, object] = {"color": hex_color}
+        else:
+            if part is None:
+                raise ValueError(f"Part index {key} not in part_index.json for {source}")
+            tag = {"part_index": int(key)}
+
+        start = int(starts[i])
+        area = int(areas[i])
+        min_x = int(min_xs[i])
+        min_y = int(min_ys[i])
+        bbox_w = int(max_xs[i]) - min_x + 1
+        bbox_h = int(max_ys[i]) - min_y + 1
+
+        det = {
+            "label": part,
+            "bbox": [min_x, min_y, bbox_w, bbox_h],
+            "mask_width": int(w),
+            "mask_height": int(h),
+            "area": area,
+            **tag,
+        }
+        run = order[start : start + area]
+        if mask_encoding == MASK_ENCODING_RLE:
+            det["mask_rle"] = indices_to_rle(run, w, h)
+        elif mask_encoding is not None:
+            det["mask_indices"] = run.tolist()
+
+        mask = None
+        if with_masks:
+            mask = Mask2D.from_indices(run, w, h)
+        out.append((det, mask))
+        out_uniq.append(i)
+
+    ranked = sorted(range(len(out)), key=lambda k: (out[k][0]["label"], out[k][0]["bbox"]))
+    segments = None
+    if with_segments:
+        position = np.full(len(uniq), -1, dtype=np.int32)
+        for pos, k in enumerate(ranked):
+            position[out_uniq[k]] = pos
+        segments = position[inverse].reshape(h, w)
+    return [out[k] for k in ranked], segments
+
+
+def extract_view_labels(
+    arr: np.ndarray,
+    mapping: dict[str, str],
+    source: str,
+    mask_encoding: str = MASK_ENCODING_INDICES,
+) -> list[dict]:
+    pairs = _extract_view(
+        keys=_pack_rgb(arr),
+        palette=_color_palette(mapping),
+        source=source,
+        mask_encoding=mask_encoding,
+        with_masks=False,
+    )
+    return [det for det, _mask in pairs]
+
+
+def _indent_json(obj: object, level: int) -> str:
+    text = json.dumps(obj, indent=2, sort_keys=True)
+    return text.replace("\n", "\n" + " " * level)
+
+
+class _StreamingLabelsWriter:
+    # Writes {"images": {...}, **extra} one image at a time, byte-identical to
+    # json.dumps(payload, indent=2, sort_keys=True) when images arrive sorted.
+    def __init__(self, path: Path, extra: dict[str, object]) -> None:
+        if path is None:
+            raise ValueError("path must not be None.")
+        if extra is None:
+            raise ValueError("extra must not be None.")
+        if "images" in extra:
+            raise ValueError("extra must not contain an images key.")
+
+        self.path = path
+        self.extra = extra
+        self.tmp_path = path.with_name(path.name + ".tmp")
+        self.last_name: str | None = None
+        self.count = 0
+        self.f = None
+
+    def __enter__(self) -> "_StreamingLabelsWriter":
+        self.f = self.tmp_path.open("w", encoding="utf-8")
+        self.f.write("{")
+        before = sorted(k for k in self.extra if k < "images")
+        for key in before:
+            self.f.write(f"\n  {json.dumps(key)}: {_indent_json(self.extra[key], 2)},")
+        self.f.write('\n  "images": {')
+        return self
+
+    def add_image(self, image_name: str, dets: list[dict]) -> None:
+        if image_name is None:
+            raise ValueError("image_name must not be None.")
+        if dets is None:
+            raise ValueError("dets must not be None.")
+        if self.last_name is not None and image_name <= self.last_name:
+            raise ValueError(f"images must be written in ascending name order: {image_name}")
+
+        if self.count > 0:
+            self.f.write(",")
+        self.f.write(f"\n    {json.dumps(image_name)}: {_indent_json(dets, 4)}")
+        self.last_name = image_name
+        self.count += 1
+
+    def __exit__(self, exc_type: object, exc: object, tb: object) -> None:
+        if exc_type is not None:
+            self.f.close()
+            self.tmp_path.unlink(missing_ok=True)
+            return
+
+        if self.count > 0:
+            self.f.write("\n  }")
+        else:
+            self.f.write("}")
+        after = sorted(k for k in self.extra if k > "images")
+        for key in after:
+            self.f.write(f",\n  {json.dumps(key)}: {_indent_json(self.extra[key], 2)}")
+        self.f.write("\n}")
+        self.f.close()
+        self.tmp_path.replace(self.path)
+
+
+def _convert_view(
+    id_path: Path,
+    palette: _KeyPalette,
+    mask_encoding: str,
+    with_masks: bool,
+) -> list[tuple[dict, Mask2D | None]]:
+    if id_path is None:
+        raise ValueError("id_path must not be None.")
+
+    return _extract_view(
+        keys=_load_key_image(id_path, palette),
+        palette=palette,
+        source=str(id_path),
+        mask_encoding=mask_encoding,
+        with_masks=with_masks,
+    )
+
+
+def _find_id_images(
+    asset_dir: Path,
+    id_format: str | None,
+    color_decode: str = COLOR_DECODE_EXACT,
+    max_color_distance: float | None = None,
+) -> tuple[_KeyPalette, list[Path]]:
     if asset_dir is None:
         raise ValueError("asset_dir must not be None.")
-    if asset_dir.exists() is not True:
-        raise FileNotFoundError(f"asset_dir not found: {asset_dir}")
 
     id_dir = asset_dir / "images_id"
     if id_dir.exists() is not True:
         raise FileNotFoundError(f"images_id not found under asset_dir: {id_dir}")
 
-    mapping_path = asset_dir / "color_to_part.json"
-    mapping = load_color_mapping(mapping_path)
+    index_path = asset_dir / "part_index.json"
+    if id_format is None:
+        id_format = ID_FORMAT_COLOR
+        if index_path.exists():
+            id_format = ID_FORMAT_INDEX
+    if id_format not in (ID_FORMAT_COLOR, ID_FORMAT_INDEX):
+        raise ValueError(f"unknown id format: {id_format}")
+
+    if id_format == ID_FORMAT_INDEX:
+        palette = _KeyPalette(id_format=ID_FORMAT_INDEX, parts=load_part_index(index_path))
+        id_paths = [p for p in id_dir.glob("view_*.npy") if p.is_file()]
+        if not id_paths:
+            id_paths = [p for p in id_dir.glob("view_*.png") if p.is_file()]
+    else:
+        mapping_path = asset_dir / "color_to_part.json"
+        palette = _color_palette(
+            load_color_mapping(mapping_path),
+            color_decode=color_decode,
+            max_color_distance=max_color_distance,
+        )
+        id_paths = [p for p in id_dir.glob("view_*.png") if p.is_file()]
 
-    id_paths = [p for p in id_dir.glob("view_*.png") if p.is_file()]
     id_paths.sort()
     if id_paths:
         pass
     if not id_paths:
         raise RuntimeError(f"No ID images found in {id_dir}")
+    return palette, id_paths
 
-    images_out: dict[str, list[dict]] = {}
 
-    for id_path in id_paths:
-        arr = np.array(Image.open(id_path).convert("RGB"), dtype=np.uint8)
-        h, w, _c = arr.shape
+def _view_image_name(id_path: Path) -> str:
+    # Labels are keyed by the RGB view they describe, which is always a PNG.
+    return f"{id_path.stem}.png"
 
-        flat = arr.reshape(-1, 3)
-        colors = np.unique(flat, axis=0)
 
-        dets: list[dict] = []
-        for color in colors:
-            rgb = (int(color[0]), int(color[1]), int(color[2]))
-            if rgb == (0, 0, 0):
-                continue
+def find_id_views(asset_dir: Path, id_format: str | None = None) -> tuple[_KeyPalette, dict[str, Path]]:
+    palette, id_paths = _find_id_images(asset_dir, id_format)
+    return palette, {_view_image_name(p): p for p in id_paths}
+
+
+def decode_id_view(id_path: Path, palette: _KeyPalette) -> tuple[list[tuple[dict, Mask2D]], np.ndarray]:
+    if id_path is None:
+        raise ValueError("id_path must not be None.")
+    if palette is None:
+        raise ValueError("palette must not be None.")
+
+    # Masks and a pixel -> part map only; no mask encoding is built.
+    return _split_view(
+        keys=_load_key_image(id_path, palette),
+        palette=palette,
+        source=str(id_path),
+        mask_encoding=None,
+        with_masks=True,
+        with_segments=True,
+    )
 
-            hex_color = _rgb_to_hex(rgb).lower()
-            part = mapping.get(hex_color)
-            if part is None:
-                raise ValueError(f"Color {hex_color} not in mapping for {id_path}")
-
-            mask = np.all(arr == color, axis=-1)
-            if bool(mask.any()) is not True:
-                continue
-
-            ys, xs = np.where(mask)
-            min_x = int(xs.min())
-            max_x = int(xs.max())
-            min_y = int(ys.min())
-            max_y = int(ys.max())
-
-            bbox_w = int(max_x - min_x + 1)
-            bbox_h = int(max_y - min_y + 1)
-
-            indices = (ys * w + xs).astype(int).tolist()
-
-            dets.append(
-                {
-                    "label": part,
-                    "bbox": [min_x, min_y, bbox_w, bbox_h],
-                    "mask_indices": indices,
-                    "mask_width": int(w),
-                    "mask_height": int(h),
-                    "area": int(mask.sum()),
-                    "color": hex_color,
-                }
-            )
-
-        dets.sort(key=lambda d: (d["label"], d["bbox"]))
-        images_out[id_path.name] = dets
+
+def convert_asset_id_images_to_labels(
+    asset_dir: Path,
+    mask_encoding: str = MASK_ENCODING_INDICES,
+    write_store: bool = True,
+    workers: int = 1,
+    id_format: str | None = None,
+    write_visibility: bool = True,
+    color_decode: str = COLOR_DECODE_EXACT,
+    max_color_distance: float | None = None,
+) -> Path:
+    if asset_dir is None:
+        raise ValueError("asset_dir must not be None.")
+    if workers < 1:
+        raise ValueError("workers must be one or greater.")
+    validate_mask_encoding(mask_encoding)
+    if asset_dir.exists() is not True:
+        raise FileNotFoundError(f"asset_dir not found: {asset_dir}")
+
+    palette, id_paths = _find_id_images(
+        asset_dir,
+        id_format,
+        color_decode=color_decode,
+        max_color_distance=max_color_distance,
+    )
 
     labels_path = asset_dir / "labels_2d.json"
-    payload = {"schema_version": SCHEMA_VERSION_2D, "images": images_out}
-    labels_path.write_text(json.dumps(payload, indent=2, sort_keys=True), encoding="utf-8")
+    store = None
+    if write_store:
+        store = LabelsStoreWriter(labels_store_path(labels_path))
+    visibility = None
+    if write_visibility:
+        visibility = VisibilityBuilder(list(palette.parts.values()))
+
+    extra: dict[str, object] = {"schema_version": schema_version_for_mask_encoding(mask_encoding)}
+    if mask_encoding != MASK_ENCODING_INDICES:
+        extra["mask_encoding"] = mask_encoding
+
+    convert_one = partial(
+        _convert_view,
+        palette=palette,
+        mask_encoding=mask_encoding,
+        with_masks=write_store,
+    )
+    try:
+        with _StreamingLabelsWriter(labels_path, extra=extra) as writer:
+            for id_path, pairs in zip(id_paths, ordered_map(convert_one, id_paths, workers=workers)):
+                image_name = _view_image_name(id_path)
+                writer.add_image(image_name, [det for det, _mask in pairs])
+                if store is not None:
+                    store.add_image(image_name, [(det["label"], det["bbox"], mask) for det, mask in pairs])
+                if visibility is not None:
+                    visibility.add_view(image_name, [det for det, _mask in pairs])
+                del pairs
+    finally:
+        _LUT_CACHE.clear()
+
+    if store is not None:
+        store.close(labels_path)
+    if visibility is not None:
+        save_visibility(asset_dir / "visibility.npz", visibility.build())
     return labels_path
 
 
@@ -5,7 +5,7 @@ from pathlib import Path
 
 from ..config.config import AssetLens3DConfig
 from ..config.logging_utils import get_logger
-from ..domain.results_3d import ModelResult3D, PartInstance3D, Run3DOutputs, Run3DSummary
+from ..domain.results_3d import ModelResult3D, PartInstance3D, Run3DOutputs, Run3DSummary, SCHEMA_VERSION_3D
 from ..sam_wrappers.sam3d_runner import Fake3DPartRunner, PartResult
 from .bom_builder import build_bom_from_3d, write_bom
 
@@ -70,6 +70,7 @@ def _make_summary(run_id: str, models: list[ModelResult3D], parts: list[str]) ->
         num_models=len(models),
         num_instances=num_instances,
         counts_by_part=counts,
+        model_paths={m.model_id: m.model_path for m in models},
     )
 
 
@@ -103,6 +104,62 @@ def _write_outputs(output_dir: Path, summary: Run3DSummary, models: list[ModelRe
     log.info(f"Wrote run_3d.jsonl and summary to {output_dir}")
 
 
+def _check_run_record(schema_version: object, run_id: object, expected_run_id: str, source: str) -> None:
+    if schema_version != SCHEMA_VERSION_3D:
+        raise ValueError(f"Unsupported schema_version {schema_version!r} in {source} (expected {SCHEMA_VERSION_3D})")
+    if run_id != expected_run_id:
+        raise ValueError(
+            f"{source} was produced by run_id {run_id!r}, expected {expected_run_id!r}; re-run the pipeline first."
+        )
+
+
+def load_run_3d(output_dir: Path, run_id: str) -> Run3DOutputs:
+    if output_dir is None:
+        raise ValueError("output_dir must not be None.")
+    if run_id is None:
+        raise ValueError("run_id must not be None.")
+
+    summary_path = output_dir / "run_3d_summary.json"
+    jsonl_path = output_dir / "run_3d.jsonl"
+    if summary_path.exists() is not True:
+        raise FileNotFoundError(f"run_3d_summary.json not found in {output_dir}; run the 3D pipeline first.")
+    if jsonl_path.exists() is not True:
+        raise FileNotFoundError(f"run_3d.jsonl not found in {output_dir}; run the 3D pipeline first.")
+
+    summary = Run3DSummary.model_validate(json.loads(summary_path.read_text(encoding="utf-8")))
+    _check_run_record(summary.schema_version, summary.run_id, run_id, str(summary_path))
+
+    # Models without instances have no rows, so the model list comes from the summary.
+    model_paths = dict(summary.model_paths)
+    instances: dict[str, list[PartInstance3D]] = {model_id: [] for model_id in model_paths}
+    with jsonl_path.open("r", encoding="utf-8") as f:
+        for line_no, line in enumerate(f, start=1):
+            if line.strip() == "":
+                continue
+            obj = json.loads(line)
+            source = f"{jsonl_path}:{line_no}"
+            _check_run_record(obj.pop("schema_version", None), obj.pop("run_id", None), run_id, source)
+            model_path = obj.pop("model_path")
+            model_id = obj["model_id"]
+            if model_id not in instances:
+                instances[model_id] = []
+                model_paths[model_id] = model_path
+            instances[model_id].append(PartInstance3D.model_validate(obj))
+
+    models = [
+        ModelResult3D(
+            run_id=run_id,
+            model_id=model_id,
+            model_path=model_paths[model_id],
+            part_instances=instances[model_id],
+        )
+        for model_id in sorted(instances)
+    ]
+    if summary.model_paths and len(models) != summary.num_models:
+        raise ValueError(f"{jsonl_path} covers {len(models)} models but the summary lists {summary.num_models}.")
+    return Run3DOutputs(summary=summary, models=models)
+
+
 def run_3d_batch(config: AssetLens3DConfig) -> Run3DOutputs:
     if config is None:
         raise ValueError("config must not be None.")
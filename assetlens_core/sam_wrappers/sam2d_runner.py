@@ -6,6 +6,8 @@ from typing import Protocol
 import hashlib
 import numpy as np
 
+from ..domain.mask_2d import Mask2D
+
 
 @dataclass(frozen=True)
 class MaskResult:
@@ -13,9 +15,7 @@ class MaskResult:
     label: str
     score: float
     bbox: tuple[int, int, int, int]
-    mask_indices: list[int]
-    mask_width: int
-    mask_height: int
+    mask: Mask2D
 
 
 class Sam2DRunner(Protocol):
@@ -30,6 +30,18 @@ class Sam2DRunner(Protocol):
         ...
 
 
+class Sam2DBatchRunner(Sam2DRunner, Protocol):
+    # Optional: results are one list per image, in input order.
+    def run_batch(
+        self,
+        images: list[str],
+        labels: list[str],
+        sizes: list[tuple[int, int]],
+        seed: int,
+    ) -> list[list[MaskResult]]:
+        ...
+
+
 def _stable_seed(key: str, seed: int) -> int:
     if key is None:
         raise ValueError("key must not be None.")
@@ -75,6 +87,26 @@ class FakeSamRunner:
             out.extend(self._predict_label(image_path=image_path, label=label, width=width, height=height, seed=seed))
         return out
 
+    def run_batch(
+        self,
+        images: list[str],
+        labels: list[str],
+        sizes: list[tuple[int, int]],
+        seed: int,
+    ) -> list[list[MaskResult]]:
+        if images is None:
+            raise ValueError("images must not be None.")
+        if sizes is None:
+            raise ValueError("sizes must not be None.")
+        if len(sizes) != len(images):
+            raise ValueError("sizes must match images.")
+
+        # Per-image seeding keeps batched output identical to run().
+        return [
+            self.run(image_path=image_path, labels=labels, width=w, height=h, seed=seed)
+            for image_path, (w, h) in zip(images, sizes)
+        ]
+
     def _predict_label(
         self,
         image_path: str,
@@ -132,16 +164,10 @@ class FakeSamRunner:
         x = int(rng.integers(0, max_x + 1))
         y = int(rng.integers(0, max_y + 1))
 
-        xs = np.arange(x, x + rect_w, dtype=int)
-        ys = np.arange(y, y + rect_h, dtype=int)
-        flat = (ys[:, None] * width + xs[None, :]).ravel()
-
         return MaskResult(
             image_path=image_path,
             label=label,
             score=score,
             bbox=(x, y, rect_w, rect_h),
-            mask_indices=flat.tolist(),
-            mask_width=width,
-            mask_height=height,
+            mask=Mask2D.from_box(x, y, rect_w, rect_h, width, height),
         )
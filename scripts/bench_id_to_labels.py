@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import argparse
+import json
+import time
+
+import numpy as np
+
+from assetlens_core.pipelines.pipeline_3d_dataset import extract_view_labels
+
+
+def make_id_image(res: int, parts: int, seed: int) -> tuple[np.ndarray, dict[str, str]]:
+    if res < 8:
+        raise ValueError("res must be 8 or greater.")
+    if parts < 1:
+        raise ValueError("parts must be one or greater.")
+    if seed < 0:
+        raise ValueError("seed must be zero or greater.")
+
+    rng = np.random.default_rng(int(seed))
+
+    palette: list[tuple[int, int, int]] = []
+    used: set[tuple[int, int, int]] = set()
+    while len(palette) < parts:
+        rgb = tuple(int(v) for v in rng.integers(1, 255, size=3))
+        if rgb in used:
+            continue
+        used.add(rgb)
+        palette.append(rgb)
+
+    # Nearest-seed partition of the frame, with a background border.
+    seeds_xy = rng.integers(0, res, size=(parts, 2))
+    ys, xs = np.mgrid[0:res, 0:res]
+    owner = np.zeros((res, res), dtype=np.int64)
+    best = np.full((res, res), np.iinfo(np.int64).max, dtype=np.int64)
+    for i, (sx, sy) in enumerate(seeds_xy.tolist()):
+        d = (xs - sx) ** 2 + (ys - sy) ** 2
+        closer = d < best
+        best[closer] = d[closer]
+        owner[closer] = i
+
+    colors = np.array(palette, dtype=np.uint8)
+    arr = colors[owner]
+    margin = max(res // 16, 1)
+    arr[:margin] = 0
+    arr[-margin:] = 0
+
+    mapping = {f"#{r:02x}{g:02x}{b:02x}": f"part_{i:05d}" for i, (r, g, b) in enumerate(palette)}
+    return arr, mapping
+
+
+def legacy_view_labels(arr: np.ndarray, mapping: dict[str, str], source: str) -> list[dict]:
+    if arr is None:
+        raise ValueError("arr must not be None.")
+    if mapping is None:
+        raise ValueError("mapping must not be None.")
+
+    h, w, _c = arr.shape
+    flat = arr.reshape(-1, 3)
+    colors = np.unique(flat, axis=0)
+
+    dets: list[dict] = []
+    for color in colors:
+        rgb = (int(color[0]), int(color[1]), int(color[2]))
+        if rgb == (0, 0, 0):
+            continue
+
+        hex_color = f"#{rgb[0]:02x}{rgb[1]:02x}{rgb[2]:02x}"
+        part = mapping.get(hex_color)
+        if part is None:
+            raise ValueError(f"Color {hex_color} not in mapping for {source}")
+
+        mask = np.all(arr == color, axis=-1)
+        if bool(mask.any()) is not True:
+            continue
+
+        ys, xs = np.where(mask)
+        min_x = int(xs.min())
+        max_x = int(xs.max())
+        min_y = int(ys.min())
+        max_y = int(ys.max())
+
+        dets.append(
+            {
+                "label": part,
+                "bbox": [min_x, min_y, int(max_x - min_x + 1), int(max_y - min_y + 1)],
+                "mask_indices": (ys * w + xs).astype(int).tolist(),
+                "mask_width": int(w),
+                "mask_height": int(h),
+                "area": int(mask.sum()),
+                "color": hex_color,
+            }
+        )
+
+    dets.sort(key=lambda d: (d["label"], d["bbox"]))
+    return dets
+
+
+def run_benchmark(res: int, parts: int, seed: int, repeats: int) -> dict[str, float]:
+    if repeats < 1:
+        raise ValueError("repeats must be one or greater.")
+
+    arr, mapping = make_id_image(res=res, parts=parts, seed=seed)
+
+    legacy_s = float("inf")
+    legacy_out: list[dict] = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        legacy_out = legacy_view_labels(arr=arr, mapping=mapping, source="bench")
+        legacy_s = min(legacy_s, time.perf_counter() - t0)
+
+    fast_s = float("inf")
+    fast_out: list[dict] = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        fast_out = extract_view_labels(arr=arr, mapping=mapping, source="bench")
+        fast_s = min(fast_s, time.perf_counter() - t0)
+
+    legacy_json = json.dumps(legacy_out, indent=2, sort_keys=True)
+    fast_json = json.dumps(fast_out, indent=2, sort_keys=True)
+    if legacy_json != fast_json:
+        raise AssertionError("vectorized converter output differs from the legacy loop.")
+
+    return {
+        "res": float(res),
+        "parts": float(parts),
+        "legacy_s": legacy_s,
+        "vectorized_s": fast_s,
+        "speedup": legacy_s / fast_s if fast_s > 0.0 else float("inf"),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--res", type=int, default=512)
+    parser.add_argument("--parts", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=123)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    result = run_benchmark(res=args.res, parts=args.parts, seed=args.seed, repeats=args.repeats)
+    print(
+        f"res={args.res} parts={args.parts} legacy={result['legacy_s']:.3f}s "
+        f"vectorized={result['vectorized_s']:.3f}s speedup={result['speedup']:.1f}x"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,7 @@ import sys
 from pathlib import Path
 
 import bpy
+import numpy as np
 from mathutils import Vector
 
 
@@ -26,6 +27,7 @@ def _parse_args() -> argparse.Namespace:
     parser.add_argument("--views", type=int, default=12)
     parser.add_argument("--res", type=int, default=1024)
     parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--id-format", choices=["color", "index"], default="color")
     return parser.parse_args(args)
 
 
@@ -121,6 +123,57 @@ def _assign_unique_colors(meshes: list[bpy.types.Object], seed: int) -> tuple[di
     return colors, id_mats
 
 
+def _assign_pass_indices(meshes: list[bpy.types.Object]) -> dict[int, str]:
+    out: dict[int, str] = {}
+    for i, obj in enumerate(meshes, start=1):
+        obj.pass_index = i
+        out[i] = obj.name
+    return out
+
+
+def _setup_index_pass() -> None:
+    scene = bpy.context.scene
+    prev_engine = scene.render.engine
+
+    # Render Layers only exposes IndexOB while the engine is Cycles and the
+    # pass is enabled, so both must be set before the links are built.
+    scene.render.engine = "CYCLES"
+    bpy.context.view_layer.use_pass_object_index = True
+    scene.use_nodes = True
+    tree = scene.node_tree
+    tree.nodes.clear()
+    layers = tree.nodes.new(type="CompositorNodeRLayers")
+    composite = tree.nodes.new(type="CompositorNodeComposite")
+    viewer = tree.nodes.new(type="CompositorNodeViewer")
+    tree.links.new(layers.outputs["Image"], composite.inputs["Image"])
+    tree.links.new(layers.outputs["IndexOB"], viewer.inputs["Image"])
+    scene.render.engine = prev_engine
+
+
+def _render_index_map(path: Path, num_parts: int) -> None:
+    scene = bpy.context.scene
+    prev_engine = scene.render.engine
+
+    # The object-index pass is only produced by Cycles; one sample is enough
+    # because the pass stores the nearest object, not a filtered colour.
+    scene.render.engine = "CYCLES"
+    scene.cycles.samples = 1
+    bpy.ops.render.render(write_still=False)
+    scene.render.engine = prev_engine
+
+    img = bpy.data.images["Viewer Node"]
+    w, h = img.size
+    buf = np.empty(w * h * 4, dtype=np.float32)
+    img.pixels.foreach_get(buf)
+    index = np.rint(buf.reshape(h, w, 4)[..., 0])
+
+    dtype = np.uint16
+    if num_parts >= np.iinfo(np.uint16).max:
+        dtype = np.uint32
+    # Blender images are stored bottom-up.
+    np.save(path, np.flipud(index).astype(dtype))
+
+
 def _capture_original_materials(meshes: list[bpy.types.Object]) -> dict[str, list[bpy.types.Material | None]]:
     out: dict[str, list[bpy.types.Material | None]] = {}
     for obj in meshes:
@@ -203,6 +256,7 @@ def main() -> None:
     views = int(args.views)
     res = int(args.res)
     seed = int(args.seed)
+    id_format = str(args.id_format)
 
     if glb_path.exists() is not True:
         raise FileNotFoundError(f"GLB not found: {glb_path}")
@@ -225,8 +279,11 @@ def main() -> None:
     meshes = _get_mesh_objects()
     colors, id_mats = _assign_unique_colors(meshes, seed=seed)
     originals = _capture_original_materials(meshes)
+    part_index = _assign_pass_indices(meshes)
 
     _setup_render(res=res)
+    if id_format == "index":
+        _setup_index_pass()
     _ensure_light()
     cam = _ensure_camera()
 
@@ -243,16 +300,22 @@ def main() -> None:
         bpy.context.scene.render.filepath = str(rgb_dir / f"{name}.png")
         bpy.ops.render.render(write_still=True)
 
+        if id_format == "index":
+            _render_index_map(id_dir / f"{name}.npy", num_parts=len(part_index))
+            continue
+
         _assign_id_materials(meshes, id_mats)
         bpy.context.scene.render.filepath = str(id_dir / f"{name}.png")
         bpy.ops.render.render(write_still=True)
 
-    mapping = {}
-    for obj_name, rgb in colors.items():
-        hex_color = f"#{rgb[0]:02x}{rgb[1]:02x}{rgb[2]:02x}"
-        mapping[hex_color.lower()] = obj_name
-
-    _write_json(out_dir / "color_to_part.json", mapping)
+    if id_format == "index":
+        _write_json(out_dir / "part_index.json", {str(i): obj_name for i, obj_name in part_index.items()})
+    else:
+        mapping = {}
+        for obj_name, rgb in colors.items():
+            hex_color = f"#{rgb[0]:02x}{rgb[1]:02x}{rgb[2]:02x}"
+            mapping[hex_color.lower()] = obj_name
+        _write_json(out_dir / "color_to_part.json", mapping)
     _write_json(out_dir / "camera_metadata.json", cameras)
     _write_json(out_dir / "scene_graph.json", _build_scene_graph(meshes))
 
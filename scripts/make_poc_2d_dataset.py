@@ -62,9 +62,9 @@ def make_dataset(out_dir: Path, n: int, seed: int, width: int, height: int) -> N
                     "label": m.label,
                     "score": m.score,
                     "bbox": list(m.bbox),
-                    "mask_indices": m.mask_indices,
-                    "mask_width": m.mask_width,
-                    "mask_height": m.mask_height,
+                    "mask_indices": m.mask.to_list(),
+                    "mask_width": m.mask.width,
+                    "mask_height": m.mask.height,
                 }
             )
         labels[name] = dets
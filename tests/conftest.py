@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import json
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from assetlens_core.domain.mask_2d import Mask2D
+from assetlens_core.domain.results_2d import Detection2D
+from scripts.bench_id_to_labels import make_id_image
+
+
+@dataclass(frozen=True)
+class BoxFrame:
+    width: int
+    height: int
+
+    def gt(self, label: str, box: tuple[int, int, int, int]) -> dict:
+        return {
+            "label": label,
+            "bbox": list(box),
+            "mask_indices": Mask2D.from_box(*box, self.width, self.height).to_list(),
+            "mask_width": self.width,
+            "mask_height": self.height,
+        }
+
+    def pred(
+        self,
+        label: str,
+        box: tuple[int, int, int, int],
+        image: str = "a.png",
+        score: float = 0.9,
+    ) -> Detection2D:
+        return Detection2D(
+            run_id="test",
+            image_path=f"images/{image}",
+            label=label,
+            score=score,
+            bbox=box,
+            mask=Mask2D.from_box(*box, self.width, self.height),
+        )
+
+
+def make_id_asset(asset_dir: Path, views: int, res: int, parts: int, seed: int = 0) -> dict[str, str]:
+    id_dir = asset_dir / "images_id"
+    id_dir.mkdir(parents=True)
+    mapping: dict[str, str] = {}
+    for view in range(views):
+        arr, view_mapping = make_id_image(res=res, parts=parts, seed=seed + view)
+        Image.fromarray(arr).save(id_dir / f"view_{view:03d}.png")
+        mapping.update(view_mapping)
+    (asset_dir / "color_to_part.json").write_text(json.dumps(mapping), encoding="utf-8")
+    return mapping
+
+
+@pytest.fixture
+def box_frame() -> Callable[[int, int], BoxFrame]:
+    return BoxFrame
+
+
+@pytest.fixture
+def id_image() -> Callable[..., tuple[np.ndarray, dict[str, str]]]:
+    return make_id_image
+
+
+@pytest.fixture
+def id_asset() -> Callable[..., dict[str, str]]:
+    return make_id_asset
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from assetlens_core.pipelines import pipeline_3d_dataset
+from assetlens_core.pipelines.pipeline_3d_dataset import convert_asset_id_images_to_labels
+
+
+def _write_asset(asset_dir: Path, img: np.ndarray) -> None:
+    id_dir = asset_dir / "images_id"
+    id_dir.mkdir(parents=True)
+    Image.fromarray(img).save(id_dir / "view_000.png")
+    (asset_dir / "color_to_part.json").write_text(
+        json.dumps({"#ff0000": "part_a", "#0000ff": "part_b"}), encoding="utf-8"
+    )
+
+
+def test_color_lut_tolerant_decode(tmp_path: Path) -> None:
+    img = np.zeros((4, 6, 3), dtype=np.uint8)
+    img[0:2, 0:3] = (255, 0, 0)
+    img[2:4, 3:6] = (0, 0, 255)
+    img[1, 3] = (240, 10, 12)
+    img[3, 0] = (8, 6, 9)
+    img[0, 5] = (128, 0, 128)
+
+    exact_dir = tmp_path / "exact"
+    _write_asset(exact_dir, img)
+    with pytest.raises(ValueError):
+        convert_asset_id_images_to_labels(asset_dir=exact_dir)
+
+    nearest_dir = tmp_path / "nearest"
+    _write_asset(nearest_dir, img)
+    labels_path = convert_asset_id_images_to_labels(
+        asset_dir=nearest_dir, color_decode="nearest", max_color_distance=100.0
+    )
+    dets = json.loads(labels_path.read_text(encoding="utf-8"))["images"]["view_000.png"]
+
+    assert [d["label"] for d in dets] == ["part_a", "part_b"]
+    assert dets[0]["bbox"] == [0, 0, 4, 2]
+    assert dets[0]["area"] == 7
+    assert dets[0]["color"] == "#ff0000"
+    assert dets[1]["area"] == 6
+    assert pipeline_3d_dataset._LUT_CACHE == {}
+
+    with pytest.raises(ValueError, match="max_color_distance requires nearest"):
+        convert_asset_id_images_to_labels(asset_dir=nearest_dir, max_color_distance=100.0)
+
+
+def test_color_lut_matches_exact_on_clean_images(tmp_path: Path) -> None:
+    img = np.zeros((4, 6, 3), dtype=np.uint8)
+    img[0:2, 0:3] = (255, 0, 0)
+    img[2:4, 3:6] = (0, 0, 255)
+
+    exact_dir = tmp_path / "exact"
+    nearest_dir = tmp_path / "nearest"
+    _write_asset(exact_dir, img)
+    _write_asset(nearest_dir, img)
+
+    exact = convert_asset_id_images_to_labels(asset_dir=exact_dir)
+    nearest = convert_asset_id_images_to_labels(asset_dir=nearest_dir, color_decode="nearest")
+    assert nearest.read_bytes() == exact.read_bytes()
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import hashlib
+import os
+from pathlib import Path
+
+import pytest
+from PIL import Image
+
+from assetlens_core.config.config import AssetLens2DConfig, load_yaml_config
+from assetlens_core.pipelines import dataset_manifest
+from assetlens_core.pipelines.dataset_manifest import load_manifest, refresh_manifest
+from assetlens_core.pipelines.pipeline_2d_assets import run_2d_batch
+
+
+def _counting(monkeypatch: pytest.MonkeyPatch) -> list[Path]:
+    calls: list[Path] = []
+    real = dataset_manifest._fingerprint
+
+    def fingerprint(path: Path) -> tuple[str, int | None, int | None]:
+        calls.append(path)
+        return real(path)
+
+    monkeypatch.setattr(dataset_manifest, "_fingerprint", fingerprint)
+    return calls
+
+
+def test_manifest_refreshes_only_changed_files(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    dataset = tmp_path / "dataset"
+    images = dataset / "images"
+    images.mkdir(parents=True)
+    for i in range(3):
+        Image.new("RGB", (20 + i, 10 + i)).save(images / f"img_{i}.png")
+    (images / "notes.txt").write_text("not an image", encoding="utf-8")
+    manifest_path = tmp_path / "manifest.jsonl"
+    calls = _counting(monkeypatch)
+
+    manifest = refresh_manifest(dataset, "images/*.png", manifest_path)
+    assert [e.path for e in manifest.entries] == ["images/img_0.png", "images/img_1.png", "images/img_2.png"]
+    assert [(e.width, e.height) for e in manifest.entries] == [(20, 10), (21, 11), (22, 12)]
+    assert manifest.entries[1].sha256 == hashlib.sha256((images / "img_1.png").read_bytes()).hexdigest()
+    assert load_manifest(manifest_path) == manifest
+    assert len(calls) == 3
+
+    calls.clear()
+    assert refresh_manifest(dataset, "images/*.png", manifest_path) == manifest
+    assert calls == []
+
+    Image.new("RGB", (40, 30)).save(images / "img_1.png")
+    st = (images / "img_1.png").stat()
+    os.utime(images / "img_1.png", ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    Image.new("RGB", (8, 8)).save(images / "img_3.png")
+    (images / "img_0.png").unlink()
+    manifest = refresh_manifest(dataset, "images/*.png", manifest_path)
+    assert [e.path for e in manifest.entries] == ["images/img_1.png", "images/img_2.png", "images/img_3.png"]
+    assert (manifest.entries[0].width, manifest.entries[0].height) == (40, 30)
+    assert sorted(p.name for p in calls) == ["img_1.png", "img_3.png"]
+
+    calls.clear()
+    manifest_path.write_text("{not json\n", encoding="utf-8")
+    assert refresh_manifest(dataset, "images/*.png", manifest_path) == manifest
+    assert len(calls) == 3
+
+    # Entries keep the order of the sorted glob, as the pipeline always listed images.
+    Image.new("RGB", (8, 8)).save(images / "B_upper.png")
+    manifest = refresh_manifest(dataset, "images/*.png", manifest_path)
+    assert manifest.image_paths(dataset) == sorted(images.glob("*.png"))
+
+
+def test_run_2d_batch_reads_sizes_from_manifest(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    dataset = tmp_path / "dataset"
+    (dataset / "images").mkdir(parents=True)
+    for i in range(4):
+        Image.new("RGB", (24 + i, 20)).save(dataset / "images" / f"img_{i}.png")
+
+    out = tmp_path / "out"
+    base = load_yaml_config(Path("config_2d.yaml"), AssetLens2DConfig).model_dump(exclude={"run_id"})
+    config = AssetLens2DConfig.model_validate({**base, "dataset_dir": dataset, "output_dir": out})
+    calls = _counting(monkeypatch)
+
+    first = run_2d_batch(config)
+    assert (out / "dataset_manifest.jsonl").exists()
+    assert len(calls) == 4
+    assert first.detections
+    assert {d.mask.width for d in first.detections} <= {24, 25, 26, 27}
+
+    calls.clear()
+    expected = (out / "run_2d.jsonl").read_bytes()
+    second = run_2d_batch(config)
+    assert calls == []
+    assert second.detections == first.detections
+    assert (out / "run_2d.jsonl").read_bytes() == expected
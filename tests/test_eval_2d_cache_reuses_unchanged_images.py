@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+from assetlens_core.config.config import AssetLens2DConfig, load_yaml_config
+from assetlens_core.domain.mask_2d import Mask2D
+from assetlens_core.eval.eval_cache import EvalCache
+from assetlens_core.eval.evaluation_2d import evaluate_2d
+from assetlens_core.pipelines.pipeline_2d_assets import run_2d_batch
+
+
+def _cache_files(output_dir: Path) -> list[Path]:
+    return sorted((output_dir / "eval_2d_cache").glob("*/*.json"))
+
+
+def test_eval_2d_cache_reuses_unchanged_images(tmp_path: Path) -> None:
+    cfg = load_yaml_config(Path("config_2d.yaml"), AssetLens2DConfig)
+    cfg = cfg.model_copy(update={"output_dir": tmp_path / "run"})
+    labels = Path("poc_data/2d_cells/labels_2d.json")
+    detections = run_2d_batch(cfg).detections
+    out = tmp_path / "eval"
+
+    # Caching is off unless asked for.
+    evaluate_2d(labels_path=labels, detections=detections, output_dir=out)
+    expected = (out / "eval_2d.json").read_bytes()
+    assert _cache_files(out) == []
+
+    evaluate_2d(labels_path=labels, detections=detections, output_dir=out, cache=True)
+    first = _cache_files(out)
+    assert len(first) == 2
+    evaluate_2d(labels_path=labels, detections=detections, output_dir=out, cache=True)
+    assert _cache_files(out) == first
+    assert (out / "eval_2d.json").read_bytes() == expected
+
+    # Changing one image's predictions adds one entry and leaves the other reused.
+    d = detections[0]
+    changed = [d.model_copy(update={"mask": Mask2D.from_box(0, 0, 3, 3, d.mask.width, d.mask.height)})]
+    evaluate_2d(labels_path=labels, detections=changed + detections[1:], output_dir=out, cache=True)
+    assert len(_cache_files(out)) == 3
+
+
+def test_eval_cache_evicts_least_recently_used(tmp_path: Path) -> None:
+    cache = EvalCache(tmp_path / "cache", max_bytes=0)
+    cache.put("aa11", {"x": 1})
+    cache.put("bb22", {"x": 2})
+    for key in ("aa11", "bb22"):
+        os.utime(tmp_path / "cache" / key[:2] / f"{key}.json", (1_000_000, 1_000_000))
+    # Reading aa11 makes it the most recently used entry.
+    assert cache.get("aa11") == {"x": 1}
+
+    cache.max_bytes = (tmp_path / "cache" / "aa" / "aa11.json").stat().st_size
+    assert cache.evict() == 1
+    assert cache.get("bb22") is None
+    assert cache.get("aa11") == {"x": 1}
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from assetlens_core.config.config import AssetLens2DConfig, load_yaml_config
+from assetlens_core.eval.evaluation_2d import evaluate_2d_runs, evaluate_2d_stream
+from assetlens_core.pipelines.pipeline_2d_assets import iter_run_2d, run_2d_batch
+
+
+LABELS = Path("poc_data/2d_cells/labels_2d.json")
+
+
+def _run(tmp_path: Path, seed: int) -> AssetLens2DConfig:
+    cfg = load_yaml_config(Path("config_2d.yaml"), AssetLens2DConfig)
+    cfg = cfg.model_copy(update={"output_dir": tmp_path / f"run_{seed}", "seed": seed, "run_id": f"seed-{seed}"})
+    run_2d_batch(cfg)
+    return cfg
+
+
+def test_eval_2d_runs_match_separate_evals(tmp_path: Path) -> None:
+    cfgs = [_run(tmp_path, seed) for seed in (123, 7)]
+    out = tmp_path / "compare"
+    summaries = evaluate_2d_runs(
+        labels_path=LABELS,
+        runs=[iter_run_2d(cfg.output_dir, cfg.run_id) for cfg in cfgs],
+        output_dir=out,
+        workers=2,
+    )
+    assert list(summaries) == ["seed-123", "seed-7"]
+
+    for cfg in cfgs:
+        single = tmp_path / f"single_{cfg.run_id}"
+        expected = evaluate_2d_stream(
+            labels_path=LABELS, detections=iter_run_2d(cfg.output_dir, cfg.run_id), output_dir=single
+        )
+        assert summaries[cfg.run_id] == expected
+        for name in ("eval_2d.json", "eval_2d_details.jsonl"):
+            assert (out / cfg.run_id / name).read_bytes() == (single / name).read_bytes()
+
+    report = json.loads((out / "eval_2d_compare.json").read_text(encoding="utf-8"))
+    assert report["baseline_run_id"] == "seed-123"
+    assert report["deltas"]["seed-123"]["f1_at_50"] == 0.0
+    assert report["deltas"]["seed-7"]["f1_at_50"] == pytest.approx(
+        summaries["seed-7"].f1_at_50 - summaries["seed-123"].f1_at_50
+    )
+    first = report["per_image"][0]
+    assert len(first["f1_at_50"]) == 2
+    assert first["delta_f1_at_50"][1] == pytest.approx(first["f1_at_50"][1] - first["f1_at_50"][0])
+    assert len(report["per_image"]) == summaries["seed-7"].num_images
+
+
+def test_eval_2d_runs_reject_duplicate_run_ids(tmp_path: Path) -> None:
+    cfg = _run(tmp_path, 123)
+    with pytest.raises(ValueError, match="more than once"):
+        evaluate_2d_runs(
+            labels_path=LABELS,
+            runs=[iter_run_2d(cfg.output_dir, cfg.run_id), iter_run_2d(cfg.output_dir, cfg.run_id)],
+            output_dir=tmp_path / "compare",
+        )
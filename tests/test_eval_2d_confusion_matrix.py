@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import json
+from collections.abc import Callable
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from assetlens_core.eval.evaluation_2d import evaluate_2d
+
+if TYPE_CHECKING:
+    from conftest import BoxFrame
+
+
+W = 40
+H = 40
+
+
+def test_eval_2d_confusion_matrix(tmp_path: Path, box_frame: Callable[[int, int], BoxFrame]) -> None:
+    frame = box_frame(W, H)
+    labels = tmp_path / "labels.json"
+    gts = [frame.gt("arm", (0, 0, 10, 10)), frame.gt("base", (20, 20, 10, 10)), frame.gt("tool", (0, 30, 5, 5))]
+    labels.write_text(json.dumps({"images": {"a.png": gts}}), encoding="utf-8")
+    detections = [
+        frame.pred("tool", (0, 0, 10, 10), score=0.9),
+        frame.pred("base", (20, 20, 10, 9), score=0.8),
+        frame.pred("arm", (30, 0, 6, 6), score=0.3),
+    ]
+
+    plain = evaluate_2d(labels_path=labels, detections=detections, output_dir=tmp_path / "plain")
+    assert (tmp_path / "plain" / "eval_2d_confusion.json").exists() is False
+
+    summary = evaluate_2d(labels_path=labels, detections=detections, output_dir=tmp_path / "out", confusion=True)
+    assert summary == plain
+
+    raw = json.loads((tmp_path / "out" / "eval_2d_confusion.json").read_text(encoding="utf-8"))
+    assert raw["counts"] == {
+        "__background__": {"arm": 1},
+        "arm": {"tool": 1},
+        "base": {"base": 1},
+        "tool": {"__background__": 1},
+    }
+    assert raw["labels"] == ["__background__", "arm", "base", "tool"]
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+from collections.abc import Callable
+from pathlib import Path
+
+import numpy as np
+
+from assetlens_core.domain.mask_2d import Mask2D
+from assetlens_core.domain.results_2d import Detection2D
+from assetlens_core.eval.evaluation_2d import evaluate_2d
+from assetlens_core.eval.iou_matrix import iou_matrix, segment_iou_matrix
+from assetlens_core.pipelines.pipeline_3d_dataset import convert_asset_id_images_to_labels, decode_id_view, find_id_views
+
+
+def _asset(tmp_path: Path, id_asset: Callable[..., dict[str, str]]) -> tuple[Path, list[Detection2D]]:
+    asset_dir = tmp_path / "asset"
+    id_asset(asset_dir, views=3, res=48, parts=5)
+
+    labels_path = convert_asset_id_images_to_labels(asset_dir=asset_dir, write_store=False, write_visibility=False)
+    raw = json.loads(labels_path.read_text(encoding="utf-8"))
+    rng = np.random.default_rng(2)
+    detections: list[Detection2D] = []
+    for image_name, dets in sorted(raw["images"].items()):
+        for d in dets:
+            mask = Mask2D.from_indices(d["mask_indices"], d["mask_width"], d["mask_height"])
+            indices = mask.to_indices()
+            keep = indices[rng.random(indices.size) < rng.uniform(0.3, 1.0)]
+            detections.append(
+                Detection2D(
+                    run_id="ids",
+                    image_path=f"images_rgb/{image_name}",
+                    label=d["label"] if rng.random() < 0.8 else "other",
+                    score=float(rng.uniform(0.1, 0.9)),
+                    bbox=tuple(d["bbox"]),
+                    mask=Mask2D.from_indices(keep, d["mask_width"], d["mask_height"]),
+                )
+            )
+    return asset_dir, detections
+
+
+def test_segment_iou_matrix_matches_mask_iou() -> None:
+    rng = np.random.default_rng(0)
+    segments = rng.integers(-1, 4, size=(20, 24)).astype(np.int32)
+    gt = [Mask2D.from_dense(segments == j) for j in range(4)]
+    pred = [Mask2D.from_dense(rng.random((20, 24)) < p) for p in (0.1, 0.5, 0.9)]
+    pred.append(Mask2D.empty(24, 20))
+
+    expected = iou_matrix(pred, gt)
+    actual = segment_iou_matrix(pred, segments, [m.area for m in gt])
+    assert np.allclose(actual, expected, rtol=0, atol=1e-12)
+
+    labels = ["a", "b", "a", "b"]
+    expected = iou_matrix(pred, gt, pred_labels=["a", "b", "b", "a"], gt_labels=labels)
+    actual = segment_iou_matrix(pred, segments, [m.area for m in gt], ["a", "b", "b", "a"], labels)
+    assert np.allclose(actual, expected, rtol=0, atol=1e-12)
+
+
+def test_eval_2d_from_id_images_matches_labels_json(tmp_path: Path, id_asset: Callable[..., dict[str, str]]) -> None:
+    asset_dir, detections = _asset(tmp_path, id_asset)
+    for confusion in (False, True):
+        from_json = tmp_path / f"json_{confusion}"
+        from_ids = tmp_path / f"ids_{confusion}"
+        evaluate_2d(
+            labels_path=asset_dir / "labels_2d.json", detections=detections, output_dir=from_json, confusion=confusion
+        )
+        summary = evaluate_2d(labels_path=asset_dir, detections=detections, output_dir=from_ids, confusion=confusion)
+        assert summary.num_images == 3
+        for name in ("eval_2d.json", "eval_2d_details.jsonl", "eval_2d_pr_curves.json"):
+            assert (from_ids / name).read_bytes() == (from_json / name).read_bytes()
+
+
+def test_eval_2d_import_does_not_load_dataset_pipeline() -> None:
+    code = (
+        "import sys\n"
+        "import assetlens_core.eval.evaluation_2d\n"
+        "assert 'PIL' not in sys.modules\n"
+        "assert 'assetlens_core.pipelines.pipeline_3d_dataset' not in sys.modules\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_decode_id_view_skips_mask_encoding(tmp_path: Path, id_asset: Callable[..., dict[str, str]]) -> None:
+    id_asset(tmp_path, views=1, res=32, parts=5)
+    palette, views = find_id_views(tmp_path)
+    pairs, segments = decode_id_view(views["view_000.png"], palette)
+
+    assert pairs
+    assert all("mask_rle" not in det and "mask_indices" not in det for det, _mask in pairs)
+    expected = np.full(segments.shape, -1, dtype=np.int32)
+    for j, (_det, mask) in enumerate(pairs):
+        expected.reshape(-1)[mask.to_indices()] = j
+    assert np.array_equal(segments, expected)
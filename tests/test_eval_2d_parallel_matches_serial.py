@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from assetlens_core.config.config import AssetLens2DConfig, load_yaml_config
+from assetlens_core.eval import evaluation_2d
+from assetlens_core.eval.evaluation_2d import evaluate_2d
+from assetlens_core.pipelines.pipeline_2d_assets import run_2d_batch
+
+
+def test_eval_2d_parallel_matches_serial(tmp_path: Path) -> None:
+    cfg = load_yaml_config(Path("config_2d.yaml"), AssetLens2DConfig)
+    cfg = cfg.model_copy(update={"output_dir": tmp_path / "out"})
+    labels = Path("poc_data/2d_cells/labels_2d.json")
+    outputs = run_2d_batch(cfg)
+
+    evaluate_2d(labels_path=labels, detections=outputs.detections, output_dir=tmp_path / "serial")
+    # The parent does not keep the parsed labels alive after the eval returns.
+    assert evaluation_2d._GT_SOURCE_CACHE == {}
+    evaluate_2d(labels_path=labels, detections=outputs.detections, output_dir=tmp_path / "parallel", workers=2)
+
+    for name in ("eval_2d.json", "eval_2d_details.jsonl", "eval_2d_pr_curves.json"):
+        expected = (tmp_path / "serial" / name).read_bytes()
+        assert (tmp_path / "parallel" / name).read_bytes() == expected
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from assetlens_core.config.config import AssetLens2DConfig, load_yaml_config
+from assetlens_core.eval.evaluation_2d import evaluate_2d, evaluate_2d_stream
+from assetlens_core.pipelines.pipeline_2d_assets import iter_run_2d, run_2d_batch
+
+
+def test_eval_2d_streaming_matches_in_memory(tmp_path: Path) -> None:
+    cfg = load_yaml_config(Path("config_2d.yaml"), AssetLens2DConfig)
+    cfg = cfg.model_copy(update={"output_dir": tmp_path / "out"})
+    labels = Path("poc_data/2d_cells/labels_2d.json")
+
+    outputs = run_2d_batch(cfg)
+    evaluate_2d(labels_path=labels, detections=outputs.detections, output_dir=tmp_path / "mem")
+    evaluate_2d_stream(labels_path=labels, detections=iter_run_2d(cfg.output_dir, cfg.run_id), output_dir=tmp_path / "stream")
+
+    for name in ("eval_2d.json", "eval_2d_details.jsonl"):
+        expected = (tmp_path / "mem" / name).read_bytes()
+        assert (tmp_path / "stream" / name).read_bytes() == expected
+
+
+def test_eval_2d_streaming_accepts_nested_run_order(tmp_path: Path) -> None:
+    cfg = load_yaml_config(Path("config_2d.yaml"), AssetLens2DConfig)
+    cfg = cfg.model_copy(update={"output_dir": tmp_path / "out"})
+    outputs = run_2d_batch(cfg)
+    labels = Path("poc_data/2d_cells/labels_2d.json")
+
+    # Sorted by full path (as run_2d.jsonl is), which puts names out of order.
+    nested = {"cell_001.png": "b/cell_001.png", "cell_002.png": "a/cell_002.png"}
+    moved = [d.model_copy(update={"image_path": nested[Path(d.image_path).name]}) for d in outputs.detections]
+    moved.sort(key=lambda d: Path(d.image_path))
+    evaluate_2d(labels_path=labels, detections=moved, output_dir=tmp_path / "mem")
+    evaluate_2d_stream(labels_path=labels, detections=moved, output_dir=tmp_path / "stream")
+    expected = (tmp_path / "mem" / "eval_2d.json").read_bytes()
+    assert (tmp_path / "stream" / "eval_2d.json").read_bytes() == expected
+
+    split = moved + [d for d in moved if d.image_path.startswith("a/")][:1]
+    with pytest.raises(ValueError, match="must be contiguous"):
+        evaluate_2d_stream(labels_path=labels, detections=split, output_dir=tmp_path / "eval")
+    assert (tmp_path / "eval" / "eval_2d_details.jsonl").exists() is False
+
+
+def test_iter_run_2d_checks_detection_count(tmp_path: Path) -> None:
+    cfg = load_yaml_config(Path("config_2d.yaml"), AssetLens2DConfig)
+    cfg = cfg.model_copy(update={"output_dir": tmp_path / "out"})
+    run_2d_batch(cfg)
+
+    jsonl = cfg.output_dir / "run_2d.jsonl"
+    lines = jsonl.read_text(encoding="utf-8").splitlines(keepends=True)
+    jsonl.write_text("".join(lines[:-1]), encoding="utf-8")
+    with pytest.raises(ValueError, match="detections but the summary lists"):
+        list(iter_run_2d(cfg.output_dir, cfg.run_id))
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import json
+from collections.abc import Callable
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import pytest
+
+from assetlens_core.eval.evaluation_2d import evaluate_2d
+
+if TYPE_CHECKING:
+    from conftest import BoxFrame
+
+
+W = 32
+H = 32
+
+
+def _write_labels(path: Path, images: dict[str, list[dict]]) -> Path:
+    path.write_text(json.dumps({"images": images}), encoding="utf-8")
+    return path
+
+
+def test_eval_ap_from_score_sorted_curve(tmp_path: Path, box_frame: Callable[[int, int], BoxFrame]) -> None:
+    frame = box_frame(W, H)
+    labels = _write_labels(
+        tmp_path / "labels.json",
+        {"a.png": [frame.gt("part", (0, 0, 8, 8))], "b.png": [frame.gt("part", (10, 10, 8, 8))]},
+    )
+    detections = [
+        frame.pred("part", (20, 20, 4, 4), image="a.png", score=0.7),
+        frame.pred("part", (0, 0, 8, 8), image="a.png", score=0.9),
+        frame.pred("part", (10, 10, 8, 8), image="b.png", score=0.6),
+    ]
+    summary = evaluate_2d(labels_path=labels, detections=detections, output_dir=tmp_path / "out")
+
+    # Ranked: tp (0.9), fp (0.7), tp (0.6) -> precision 1.0 up to recall 0.5, then 2/3.
+    expected = (51 * 1.0 + 50 * (2.0 / 3.0)) / 101
+    assert summary.ap_50 == pytest.approx(expected)
+    assert summary.ap_50_95 == pytest.approx(expected)
+    assert summary.ar_50_95 == pytest.approx(1.0)
+    assert summary.per_label[0].ap_75 == pytest.approx(expected)
+
+    curves = json.loads((tmp_path / "out" / "eval_2d_pr_curves.json").read_text(encoding="utf-8"))
+    assert len(curves["iou_thresholds"]) == 10
+    assert len(curves["per_label"]["part"]["precision"][0]) == 101
+
+
+def test_eval_ap_ranks_close_scores_exactly(tmp_path: Path, box_frame: Callable[[int, int], BoxFrame]) -> None:
+    frame = box_frame(W, H)
+    labels = _write_labels(
+        tmp_path / "labels.json",
+        {"a.png": [frame.gt("part", (0, 0, 8, 8))], "b.png": [frame.gt("part", (10, 10, 8, 8))]},
+    )
+    detections = [
+        frame.pred("part", (0, 0, 8, 8), image="a.png", score=0.90004),
+        frame.pred("part", (20, 20, 4, 4), image="a.png", score=0.90001),
+        frame.pred("part", (10, 10, 8, 8), image="b.png", score=0.90002),
+    ]
+    summary = evaluate_2d(labels_path=labels, detections=detections, output_dir=tmp_path / "out")
+
+    # Both true positives outrank the false positive, however close the scores.
+    assert summary.ap_50 == pytest.approx(1.0)
+
+
+def test_eval_matches_by_score_and_threshold(tmp_path: Path, box_frame: Callable[[int, int], BoxFrame]) -> None:
+    frame = box_frame(W, H)
+    labels = _write_labels(tmp_path / "labels.json", {"a.png": [frame.gt("part", (0, 0, 10, 10))]})
+    detections = [
+        # Listed first but scored lower, so the exact match takes the ground truth.
+        frame.pred("part", (0, 0, 10, 7), image="a.png", score=0.2),
+        frame.pred("part", (0, 0, 10, 10), image="a.png", score=0.8),
+    ]
+    summary = evaluate_2d(labels_path=labels, detections=detections, output_dir=tmp_path / "out")
+    assert summary.mean_iou == pytest.approx(1.0)
+    assert summary.precision_at_50 == pytest.approx(0.5)
+
+    # IoU 0.7 counts at 0.50..0.70 only.
+    detections = [frame.pred("part", (0, 0, 10, 7), image="a.png", score=0.5)]
+    summary = evaluate_2d(labels_path=labels, detections=detections, output_dir=tmp_path / "out2")
+    assert summary.ap_50 == pytest.approx(1.0)
+    assert summary.ap_75 == pytest.approx(0.0)
+    assert summary.ap_50_95 == pytest.approx(0.5)
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import json
+import math
+from collections.abc import Callable
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from assetlens_core.eval.bootstrap import bootstrap_intervals, resample_sums
+from assetlens_core.eval.evaluation_2d import evaluate_2d, merge_eval_2d_partials
+
+if TYPE_CHECKING:
+    from conftest import BoxFrame
+
+
+W = 16
+H = 16
+
+
+def _poisson_inverse_cdf(u: float) -> int:
+    k = 0
+    cdf = math.exp(-1.0)
+    while cdf < u:
+        k += 1
+        cdf += math.exp(-1.0) / math.factorial(k)
+    return k
+
+
+def test_resample_sums_match_poisson_weight_loop() -> None:
+    rng = np.random.default_rng(1)
+    # Counts far above 2**24 must still sum exactly.
+    counts = rng.integers(0, 1 << 30, size=(37, 3))
+    sums = resample_sums(counts.astype(np.float64), num_resamples=50, seed=7)
+
+    draws = np.random.default_rng(7).integers(0, 1 << 16, size=(50, 37), dtype=np.uint16)
+    weights = [[_poisson_inverse_cdf((int(u) + 0.5) / (1 << 16)) for u in row] for row in draws]
+    rows = counts.tolist()
+    expected = [[sum(w * rows[i][c] for i, w in enumerate(row)) for c in range(3)] for row in weights]
+    assert sums.astype(np.int64).tolist() == expected
+
+    # One weight per item: Poisson(1) has mean and variance 1.
+    ones = resample_sums(np.ones((1000, 1)), num_resamples=200, seed=3) / 1000
+    assert abs(ones.mean() - 1.0) < 0.01
+    assert abs(ones.var() * 1000 - 1.0) < 0.25
+
+    intervals = bootstrap_intervals(counts.astype(np.float64), num_resamples=200)
+    assert intervals.mean_iou is None
+    assert 0.0 <= intervals.precision.lower <= intervals.precision.upper <= 1.0
+
+
+def test_eval_2d_bootstrap_intervals_merge_like_full(tmp_path: Path, box_frame: Callable[[int, int], BoxFrame]) -> None:
+    frame = box_frame(W, H)
+    images = {f"img_{i:02d}.png": [frame.gt("part", (i % 8, i % 8, 6, 6))] for i in range(20)}
+    labels = tmp_path / "labels.json"
+    labels.write_text(json.dumps({"images": images}), encoding="utf-8")
+    detections = [frame.pred("part", (i % 8, i % 8, 6, 2 + i % 5), image=name, score=0.5) for i, name in enumerate(sorted(images))]
+
+    plain = evaluate_2d(labels_path=labels, detections=detections, output_dir=tmp_path / "plain")
+    assert plain.confidence_intervals is None
+
+    full = evaluate_2d(labels_path=labels, detections=detections, output_dir=tmp_path / "full", bootstrap=300)
+    ci = full.confidence_intervals
+    assert ci is not None
+    assert ci.num_resamples == 300
+    assert ci.precision.lower <= full.precision_at_50 <= ci.precision.upper
+    assert ci.mean_iou.lower <= full.mean_iou <= ci.mean_iou.upper
+    assert ci.precision.lower < ci.precision.upper
+
+    written = json.loads((tmp_path / "full" / "eval_2d.json").read_text(encoding="utf-8"))
+    assert written["confidence_intervals"]["f1"] == ci.f1.model_dump()
+
+    names = sorted(images)
+    partials: list[Path] = []
+    for k in range(2):
+        out = tmp_path / f"shard_{k}"
+        evaluate_2d(
+            labels_path=labels, detections=detections, output_dir=out, images=names[k::2], bootstrap=300
+        )
+        partials.append(out / "eval_2d_partial.json")
+    merged = merge_eval_2d_partials(partials, tmp_path / "merged")
+    assert merged.confidence_intervals == ci
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from assetlens_core.config.config import AssetLens2DConfig, AssetLens3DConfig, load_yaml_config
+from assetlens_core.eval.evaluation_2d import evaluate_2d
+from assetlens_core.eval.evaluation_3d import evaluate_3d
+from assetlens_core.pipelines.pipeline_2d_assets import load_run_2d, run_2d_batch
+from assetlens_core.pipelines.pipeline_3d_parts import load_run_3d, run_3d_batch
+
+
+def test_eval_2d_from_run_matches_in_memory(tmp_path: Path) -> None:
+    cfg = load_yaml_config(Path("config_2d.yaml"), AssetLens2DConfig)
+    cfg = cfg.model_copy(update={"output_dir": tmp_path / "out"})
+    labels = Path("poc_data/2d_cells/labels_2d.json")
+
+    outputs = run_2d_batch(cfg)
+    expected = evaluate_2d(labels_path=labels, detections=outputs.detections, output_dir=tmp_path / "mem")
+
+    loaded = load_run_2d(cfg.output_dir, cfg.run_id)
+    assert loaded.summary == outputs.summary
+    # run_2d.jsonl is written in (image_path, label, bbox) order.
+    ordered = sorted(outputs.detections, key=lambda d: (d.image_path, d.label, d.bbox))
+    assert loaded.detections == ordered
+
+    actual = evaluate_2d(labels_path=labels, detections=loaded.detections, output_dir=tmp_path / "run")
+    assert actual == expected
+
+
+def test_eval_3d_from_run_matches_in_memory(tmp_path: Path) -> None:
+    cfg = load_yaml_config(Path("config_3d.yaml"), AssetLens3DConfig)
+    cfg = cfg.model_copy(update={"output_dir": tmp_path / "out"})
+
+    outputs = run_3d_batch(cfg)
+    loaded = load_run_3d(cfg.output_dir, cfg.run_id)
+    assert loaded.models == outputs.models
+
+    expected = evaluate_3d(labels_path=cfg.labels_path, models=outputs.models, output_dir=tmp_path / "mem")
+    actual = evaluate_3d(labels_path=cfg.labels_path, models=loaded.models, output_dir=tmp_path / "run")
+    assert actual == expected
+
+
+def test_load_run_rejects_other_run_id(tmp_path: Path) -> None:
+    cfg = load_yaml_config(Path("config_2d.yaml"), AssetLens2DConfig)
+    cfg = cfg.model_copy(update={"output_dir": tmp_path / "out"})
+    run_2d_batch(cfg)
+
+    with pytest.raises(ValueError, match="run_id"):
+        load_run_2d(cfg.output_dir, "not-this-run")
+    with pytest.raises(FileNotFoundError):
+        load_run_2d(tmp_path / "missing", cfg.run_id)
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import json
+from collections.abc import Callable
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from assetlens_core.config.config import AssetLens3DConfig, load_yaml_config
+from assetlens_core.domain.mask_2d import Mask2D
+from assetlens_core.domain.results_2d import Detection2D
+from assetlens_core.eval.evaluation_2d import evaluate_2d, merge_eval_2d_partials
+from assetlens_core.eval.evaluation_3d import evaluate_3d, merge_eval_3d_partials
+from assetlens_core.pipelines.pipeline_3d_dataset import convert_asset_id_images_to_labels
+from assetlens_core.pipelines.pipeline_3d_parts import run_3d_batch
+
+
+def _labels_and_detections(tmp_path: Path, id_asset: Callable[..., dict[str, str]]) -> tuple[dict, list[Detection2D]]:
+    asset_dir = tmp_path / "asset"
+    id_asset(asset_dir, views=4, res=32, parts=6)
+    labels_path = convert_asset_id_images_to_labels(asset_dir=asset_dir, write_store=False)
+    raw = json.loads(labels_path.read_text(encoding="utf-8"))
+
+    rng = np.random.default_rng(5)
+    detections: list[Detection2D] = []
+    for image_name, dets in sorted(raw["images"].items()):
+        for d in dets:
+            mask = Mask2D.from_indices(d["mask_indices"], d["mask_width"], d["mask_height"])
+            indices = mask.to_indices()
+            keep = indices[rng.random(indices.size) < rng.uniform(0.4, 1.0)]
+            detections.append(
+                Detection2D(
+                    run_id="merge",
+                    image_path=f"images_rgb/{image_name}",
+                    label=d["label"],
+                    score=float(rng.uniform(0.05, 0.95)),
+                    bbox=tuple(d["bbox"]),
+                    mask=Mask2D.from_indices(keep, d["mask_width"], d["mask_height"]),
+                )
+            )
+    return raw, detections
+
+
+def test_eval_2d_partials_merge_matches_full(tmp_path: Path, id_asset: Callable[..., dict[str, str]]) -> None:
+    raw, detections = _labels_and_detections(tmp_path, id_asset)
+    full_labels = tmp_path / "labels_full.json"
+    full_labels.write_text(json.dumps(raw), encoding="utf-8")
+    evaluate_2d(labels_path=full_labels, detections=detections, output_dir=tmp_path / "full")
+
+    names = sorted(raw["images"])
+    partials: list[Path] = []
+    for k, shard in enumerate((names[:1], names[1:])):
+        shard_labels = tmp_path / f"labels_{k}.json"
+        shard_labels.write_text(json.dumps({"images": {n: raw["images"][n] for n in shard}}), encoding="utf-8")
+        out = tmp_path / f"shard_{k}"
+        evaluate_2d(labels_path=shard_labels, detections=detections, output_dir=out)
+        partials.append(out / "eval_2d_partial.json")
+
+    summary = merge_eval_2d_partials(partials, tmp_path / "merged")
+    assert summary.num_images == len(names)
+    assert summary.per_label[0].tp > 0
+    for name in ("eval_2d.json", "eval_2d_pr_curves.json"):
+        expected = (tmp_path / "full" / name).read_bytes()
+        assert (tmp_path / "merged" / name).read_bytes() == expected
+    with pytest.raises(ValueError, match="overlap on"):
+        merge_eval_2d_partials([partials[1], tmp_path / "full" / "eval_2d_partial.json"], tmp_path / "twice")
+
+
+def test_eval_3d_partials_merge_matches_full(tmp_path: Path) -> None:
+    cfg = load_yaml_config(Path("config_3d.yaml"), AssetLens3DConfig)
+    cfg = cfg.model_copy(update={"output_dir": tmp_path / "out"})
+    outputs = run_3d_batch(cfg)
+    evaluate_3d(labels_path=cfg.labels_path, models=outputs.models, output_dir=tmp_path / "full")
+
+    raw = json.loads(cfg.labels_path.read_text(encoding="utf-8"))
+    partials: list[Path] = []
+    for model_id in sorted(raw["models"]):
+        shard_labels = tmp_path / f"{model_id}.json"
+        shard_labels.write_text(json.dumps({"models": {model_id: raw["models"][model_id]}}), encoding="utf-8")
+        out = tmp_path / f"shard_{model_id}"
+        evaluate_3d(labels_path=shard_labels, models=outputs.models, output_dir=out)
+        partials.append(out / "eval_3d_partial.json")
+
+    merge_eval_3d_partials(partials, tmp_path / "merged")
+    with pytest.raises(ValueError, match="overlap on"):
+        merge_eval_3d_partials([partials[0], partials[0]], tmp_path / "twice")
+    for name in ("eval_3d.json", "eval_3d_partial.json"):
+        expected = (tmp_path / "full" / name).read_bytes()
+        assert (tmp_path / "merged" / name).read_bytes() == expected
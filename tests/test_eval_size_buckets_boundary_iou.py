@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import json
+from collections.abc import Callable
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import numpy as np
+import pytest
+
+from assetlens_core.domain.mask_2d import Mask2D
+from assetlens_core.eval.boundary import boundary_iou, erode
+from assetlens_core.eval.evaluation_2d import evaluate_2d, merge_eval_2d_partials
+
+if TYPE_CHECKING:
+    from conftest import BoxFrame
+
+
+W = 128
+H = 128
+
+
+def test_erode_matches_shifted_and() -> None:
+    mask = np.random.default_rng(0).random((23, 31)) < 0.85
+    d = 2
+    padded = np.pad(mask, d)
+    expected = np.ones_like(mask)
+    for dy in range(-d, d + 1):
+        for dx in range(-d, d + 1):
+            expected &= padded[d + dy : d + dy + mask.shape[0], d + dx : d + dx + mask.shape[1]]
+    assert np.array_equal(erode(mask, d), expected)
+
+
+def test_boundary_iou_is_stricter_for_large_masks() -> None:
+    a = Mask2D.from_box(10, 10, 100, 100, W, H)
+    b = Mask2D.from_box(14, 10, 100, 100, W, H)
+    assert boundary_iou(a, a, 3) == pytest.approx(1.0)
+    assert boundary_iou(a, b, 3) < a.iou(b)
+
+
+def test_eval_2d_reports_size_buckets_and_boundary_iou(tmp_path: Path, box_frame: Callable[[int, int], BoxFrame]) -> None:
+    frame = box_frame(W, H)
+    labels = tmp_path / "labels.json"
+    gt = [frame.gt("bolt", (0, 0, 8, 8)), frame.gt("panel", (20, 20, 40, 40)), frame.gt("door", (20, 20, 100, 100))]
+    labels.write_text(json.dumps({"images": {"a.png": gt}}), encoding="utf-8")
+    detections = [
+        frame.pred("bolt", (0, 0, 8, 8)),
+        frame.pred("door", (20, 20, 100, 100)),
+        frame.pred("bolt", (100, 0, 5, 5)),
+    ]
+    plain = evaluate_2d(labels_path=labels, detections=detections, output_dir=tmp_path / "plain")
+    assert plain.boundary_iou is None
+    assert all(b.boundary_iou is None for b in plain.per_size)
+
+    summary = evaluate_2d(labels_path=labels, detections=detections, output_dir=tmp_path / "out", boundary=True)
+    assert summary.model_dump(exclude={"boundary_iou", "per_size", "per_label"}) == plain.model_dump(
+        exclude={"boundary_iou", "per_size", "per_label"}
+    )
+
+    by_bucket = {b.bucket: b for b in summary.per_size}
+    assert list(by_bucket) == ["small", "medium", "large"]
+    assert (by_bucket["small"].tp, by_bucket["small"].fp, by_bucket["small"].fn) == (1, 1, 0)
+    assert (by_bucket["medium"].tp, by_bucket["medium"].fn) == (0, 1)
+    assert by_bucket["large"].tp == 1
+    assert by_bucket["large"].min_area == 96 * 96
+    assert by_bucket["small"].boundary_iou == pytest.approx(1.0)
+    assert summary.boundary_iou == pytest.approx(1.0)
+
+    written = json.loads((tmp_path / "out" / "eval_2d.json").read_text(encoding="utf-8"))
+    assert written["per_size"][0]["bucket"] == "small"
+
+    # Partials with and without boundary IoU do not mix.
+    with pytest.raises(ValueError, match="boundary IoU"):
+        merge_eval_2d_partials(
+            [tmp_path / "plain" / "eval_2d_partial.json", tmp_path / "out" / "eval_2d_partial.json"], tmp_path / "mixed"
+        )
@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from pathlib import Path
+
+
+from assetlens_core.domain.labels_store import labels_store_path
+from assetlens_core.pipelines.pipeline_3d_dataset import convert_asset_id_images_to_labels
+
+
+def test_id_to_labels_parallel_matches_serial(tmp_path: Path, id_asset: Callable[..., dict[str, str]]) -> None:
+    serial_dir = tmp_path / "serial"
+    parallel_dir = tmp_path / "parallel"
+    id_asset(serial_dir, views=5, res=32, parts=6)
+    id_asset(parallel_dir, views=5, res=32, parts=6)
+
+    serial = convert_asset_id_images_to_labels(asset_dir=serial_dir, workers=1)
+    parallel = convert_asset_id_images_to_labels(asset_dir=parallel_dir, workers=3)
+
+    assert parallel.read_bytes() == serial.read_bytes()
+    for name in ("image_offsets.npy", "mask_offsets.npy", "mask_bits.npy", "label_ids.npy"):
+        assert (labels_store_path(parallel) / name).read_bytes() == (labels_store_path(serial) / name).read_bytes()
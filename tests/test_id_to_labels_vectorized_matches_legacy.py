@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+import json
+from collections.abc import Callable
+
+import numpy as np
+
+from assetlens_core.pipelines.pipeline_3d_dataset import extract_view_labels
+from scripts.bench_id_to_labels import legacy_view_labels
+
+
+def test_id_to_labels_vectorized_matches_legacy(
+    id_image: Callable[..., tuple[np.ndarray, dict[str, str]]],
+) -> None:
+    arr, mapping = id_image(res=48, parts=17, seed=5)
+
+    legacy = legacy_view_labels(arr=arr, mapping=mapping, source="synthetic")
+    fast = extract_view_labels(arr=arr, mapping=mapping, source="synthetic")
+
+    assert len(fast) > 0
+    assert json.dumps(fast, indent=2, sort_keys=True) == json.dumps(legacy, indent=2, sort_keys=True)
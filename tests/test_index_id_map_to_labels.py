@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+from assetlens_core.pipelines.pipeline_3d_dataset import convert_asset_id_images_to_labels
+
+
+def test_index_id_map_to_labels(tmp_path: Path) -> None:
+    ids = np.zeros((6, 7), dtype=np.uint16)
+    ids[0:2, 0:3] = 2
+    ids[3:6, 4:7] = 1
+    ids[5, 0] = 300
+
+    npy_dir = tmp_path / "npy"
+    (npy_dir / "images_id").mkdir(parents=True)
+    np.save(npy_dir / "images_id" / "view_000.npy", ids)
+
+    png_dir = tmp_path / "png"
+    (png_dir / "images_id").mkdir(parents=True)
+    Image.fromarray(ids).save(png_dir / "images_id" / "view_000.png")
+
+    part_index = {"1": "bracket", "2": "arm", "300": "bolt"}
+    for asset_dir in (npy_dir, png_dir):
+        (asset_dir / "part_index.json").write_text(json.dumps(part_index), encoding="utf-8")
+
+    npy_labels = json.loads(convert_asset_id_images_to_labels(asset_dir=npy_dir).read_text(encoding="utf-8"))
+    png_labels = json.loads(convert_asset_id_images_to_labels(asset_dir=png_dir).read_text(encoding="utf-8"))
+
+    assert npy_labels == png_labels
+    dets = npy_labels["images"]["view_000.png"]
+    assert [d["label"] for d in dets] == ["arm", "bolt", "bracket"]
+    assert dets[0]["bbox"] == [0, 0, 3, 2]
+    assert dets[1]["part_index"] == 300
+    assert dets[1]["mask_indices"] == [35]
+    assert dets[2]["area"] == 9
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from assetlens_core.domain.mask_2d import Mask2D
+from assetlens_core.eval import iou_matrix as iou_matrix_module
+from assetlens_core.eval.iou_matrix import greedy_match, iou_matrix
+
+
+def _random_masks(rng: np.random.Generator, n: int, w: int, h: int) -> list[Mask2D]:
+    out: list[Mask2D] = []
+    for _ in range(n):
+        x0 = int(rng.integers(0, w - 4))
+        y0 = int(rng.integers(0, h - 4))
+        bw = int(rng.integers(1, min(24, w - x0) + 1))
+        bh = int(rng.integers(1, min(24, h - y0) + 1))
+        local = rng.random((bh, bw)) < 0.7
+        out.append(Mask2D.from_local(local, x0, y0, w, h))
+    # Exact duplicates produce IoU ties.
+    out.append(out[0])
+    return out
+
+
+def _legacy_match(preds: list[Mask2D], gts: list[Mask2D]) -> list[int]:
+    unmatched = set(range(len(gts)))
+    out: list[int] = []
+    for pred in preds:
+        best_iou = 0.0
+        best_j: int | None = None
+        for j in sorted(unmatched):
+            v = pred.iou(gts[j])
+            if v > best_iou:
+                best_iou = v
+                best_j = j
+        if best_j is not None and best_iou >= 0.50:
+            unmatched.remove(best_j)
+            out.append(best_j)
+            continue
+        out.append(-1)
+    return out
+
+
+def test_iou_matrix_matches_pairwise() -> None:
+    rng = np.random.default_rng(11)
+    preds = _random_masks(rng, 40, 96, 80)
+    gts = _random_masks(rng, 35, 96, 80)
+
+    iou = iou_matrix(preds, gts)
+    expected = np.array([[p.iou(g) for g in gts] for p in preds])
+    assert iou.shape == (len(preds), len(gts))
+    assert np.array_equal(iou, expected)
+
+    assert greedy_match(iou).tolist() == _legacy_match(preds, gts)
+    assert greedy_match(iou_matrix(gts, gts)).tolist() == _legacy_match(gts, gts)
+
+
+def test_iou_matrix_chunks_large_rows(monkeypatch: pytest.MonkeyPatch) -> None:
+    rng = np.random.default_rng(5)
+    preds = _random_masks(rng, 12, 64, 48)
+    preds.append(Mask2D.from_box(0, 0, 64, 48, 64, 48))
+    gts = _random_masks(rng, 30, 64, 48)
+
+    expected = iou_matrix(preds, gts)
+    # Room for three full-frame float32 rows splits the full-frame prediction into chunks.
+    monkeypatch.setattr(iou_matrix_module, "_STACK_MAX_BYTES", 3 * 64 * 48 * 4)
+    assert np.array_equal(iou_matrix(preds, gts), expected)
+
+
+def test_iou_matrix_skips_other_labels() -> None:
+    a = Mask2D.from_box(0, 0, 10, 10, 32, 32)
+    b = Mask2D.from_box(2, 2, 10, 10, 32, 32)
+
+    iou = iou_matrix([a, a], [b], pred_labels=["x", "y"], gt_labels=["x"])
+    assert iou[0, 0] == pytest.approx(a.iou(b))
+    assert iou[1, 0] == 0.0
+
+    assert iou_matrix([], [b]).shape == (0, 1)
+    with pytest.raises(ValueError, match="frames differ"):
+        iou_matrix([a], [Mask2D.from_box(0, 0, 4, 4, 16, 16)])
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import json
+from collections.abc import Callable
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import pytest
+
+from assetlens_core.config.config import AssetLens3DConfig, load_yaml_config
+from assetlens_core.eval.evaluation_2d import evaluate_2d
+from assetlens_core.eval.evaluation_3d import evaluate_3d
+from assetlens_core.eval.labels_index import build_labels_index, load_labels_index, read_entry, select_names
+from assetlens_core.pipelines.pipeline_3d_parts import run_3d_batch
+
+if TYPE_CHECKING:
+    from conftest import BoxFrame
+
+
+W = 16
+H = 16
+
+
+def test_labels_index_spans_parse_to_entries(tmp_path: Path, box_frame: Callable[[int, int], BoxFrame]) -> None:
+    frame = box_frame(W, H)
+    images = {
+        'odd "name" {[.png': [frame.gt("part", (0, 0, 4, 4))],
+        "b.png": [frame.gt("part", (1, 1, 5, 5)), frame.gt("bolt", (8, 8, 2, 2))],
+        "empty.png": [],
+    }
+    labels = tmp_path / "labels.json"
+    labels.write_text(json.dumps({"schema_version": "x", "images": images}, indent=2), encoding="utf-8")
+
+    index = build_labels_index(labels, "images")
+    assert index.names() == sorted(images)
+    for name, dets in images.items():
+        assert read_entry(labels, index, name) == dets
+
+    # Legacy files keep the images at the root.
+    legacy = tmp_path / "legacy.json"
+    legacy.write_text(json.dumps(images), encoding="utf-8")
+    assert read_entry(legacy, build_labels_index(legacy, "images"), "b.png") == images["b.png"]
+
+    cache_dir = tmp_path / "index"
+    load_labels_index(labels, "images", cache_dir)
+    assert len(list(cache_dir.glob("*.json"))) == 1
+    assert load_labels_index(labels, "images", cache_dir) == index
+
+    bad = tmp_path / "bad.json"
+    bad.write_text(json.dumps({"images": {"a.png": {"label": "x"}}}), encoding="utf-8")
+    with pytest.raises(ValueError, match="must be a list"):
+        build_labels_index(bad, "images")
+    # Scalar values never get a span; they must fail like the full loader does.
+    for payload in ({**images, "schema_version": "x"}, {"images": {"a.png": 3, "b.png": []}}):
+        bad.write_text(json.dumps(payload), encoding="utf-8")
+        with pytest.raises(ValueError, match="must be a list"):
+            build_labels_index(bad, "images")
+
+
+def test_select_names_filters_and_samples() -> None:
+    names = [f"img_{i:03d}.png" for i in range(100)]
+    assert select_names(names, include=["img_005.png", "img_001.png"]) == ["img_001.png", "img_005.png"]
+    sample = select_names(names, sample_fraction=0.1, seed=3)
+    assert len(sample) == 10
+    assert sample == sorted(sample)
+    assert select_names(names, sample_fraction=0.1, seed=3) == sample
+    with pytest.raises(ValueError, match="not in labels file"):
+        select_names(names, include=["missing.png"])
+
+
+def test_eval_2d_subset_matches_subset_labels(tmp_path: Path, box_frame: Callable[[int, int], BoxFrame]) -> None:
+    frame = box_frame(W, H)
+    images = {f"img_{i}.png": [frame.gt("part", (i, i, 4, 4))] for i in range(6)}
+    labels = tmp_path / "labels.json"
+    labels.write_text(json.dumps({"images": images}), encoding="utf-8")
+    detections = [frame.pred("part", (i, i, 4, 3 + i % 2), image=name) for i, name in enumerate(sorted(images))]
+
+    wanted = ["img_1.png", "img_4.png"]
+    subset = evaluate_2d(labels_path=labels, detections=detections, output_dir=tmp_path / "subset", images=wanted)
+
+    subset_labels = tmp_path / "subset_labels.json"
+    subset_labels.write_text(json.dumps({"images": {n: images[n] for n in wanted}}), encoding="utf-8")
+    expected = evaluate_2d(labels_path=subset_labels, detections=detections, output_dir=tmp_path / "expected")
+
+    assert subset.num_images == 2
+    assert subset.model_dump() == expected.model_dump()
+    assert list((tmp_path / "subset" / "labels_index").glob("*.json"))
+
+    sampled = evaluate_2d(labels_path=labels, detections=detections, output_dir=tmp_path / "sampled", sample_fraction=0.5)
+    assert sampled.num_images == 3
+
+
+def test_eval_3d_model_subset(tmp_path: Path) -> None:
+    cfg = load_yaml_config(Path("config_3d.yaml"), AssetLens3DConfig)
+    cfg = cfg.model_copy(update={"output_dir": tmp_path / "out"})
+    outputs = run_3d_batch(cfg)
+    raw = json.loads(cfg.labels_path.read_text(encoding="utf-8"))
+    model_id = sorted(raw["models"])[0]
+
+    summary = evaluate_3d(
+        labels_path=cfg.labels_path, models=outputs.models, output_dir=tmp_path / "subset", model_ids=[model_id]
+    )
+    shard = tmp_path / "shard.json"
+    shard.write_text(json.dumps({"models": {model_id: raw["models"][model_id]}}), encoding="utf-8")
+    expected = evaluate_3d(labels_path=shard, models=outputs.models, output_dir=tmp_path / "expected")
+    assert summary.num_models == 1
+    assert summary.model_dump() == expected.model_dump()
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import json
+import shutil
+from collections.abc import Callable
+from pathlib import Path
+
+import numpy as np
+
+from assetlens_core.domain.labels_store import labels_store_path
+from assetlens_core.domain.results_2d import Detection2D
+from assetlens_core.eval.evaluation_2d import _open_gt_source, _StoreGtSource, evaluate_2d
+from assetlens_core.pipelines.pipeline_3d_dataset import convert_asset_id_images_to_labels
+
+
+def _detections_from_labels(labels_path: Path) -> list[Detection2D]:
+    raw = json.loads(labels_path.read_text(encoding="utf-8"))
+    out: list[Detection2D] = []
+    for image_name, dets in sorted(raw["images"].items()):
+        for i, d in enumerate(dets):
+            indices = d["mask_indices"]
+            if i % 2 == 1:
+                indices = indices[: len(indices) // 2]
+            out.append(
+                Detection2D(
+                    run_id="store",
+                    image_path=f"images_rgb/{image_name}",
+                    label=d["label"],
+                    score=0.9,
+                    bbox=tuple(d["bbox"]),
+                    mask_indices=indices,
+                    mask_width=d["mask_width"],
+                    mask_height=d["mask_height"],
+                )
+            )
+    return out
+
+
+def test_labels_store_sidecar_matches_json(tmp_path: Path, id_asset: Callable[..., dict[str, str]]) -> None:
+    asset_dir = tmp_path / "asset"
+    id_asset(asset_dir, views=3, res=24, parts=5)
+    labels_path = convert_asset_id_images_to_labels(asset_dir=asset_dir)
+    store_dir = labels_store_path(labels_path)
+
+    offsets = np.load(store_dir / "mask_offsets.npy", mmap_mode="r")
+    assert isinstance(offsets, np.memmap)
+    assert isinstance(_open_gt_source(labels_path), _StoreGtSource)
+
+    detections = _detections_from_labels(labels_path)
+    evaluate_2d(labels_path=labels_path, detections=detections, output_dir=tmp_path / "store")
+
+    shutil.rmtree(store_dir)
+    evaluate_2d(labels_path=labels_path, detections=detections, output_dir=tmp_path / "json")
+
+    for name in ("eval_2d.json", "eval_2d_details.jsonl"):
+        assert (tmp_path / "store" / name).read_bytes() == (tmp_path / "json" / name).read_bytes()
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import json
+from collections.abc import Callable
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+from assetlens_core.pipelines.pipeline_3d_dataset import (
+    _StreamingLabelsWriter,
+    convert_asset_id_images_to_labels,
+    extract_view_labels,
+)
+
+
+def test_labels_streaming_writer_matches_json_dumps(tmp_path: Path) -> None:
+    images = {"a.png": [{"label": "x", "bbox": [0, 1, 2, 3], "nested": {"k": [1, 2]}}], "b.png": []}
+    extra = {"height": 4, "schema_version": "0.2.0", "seed": {"v": [1]}}
+
+    path = tmp_path / "labels.json"
+    with _StreamingLabelsWriter(path, extra=extra) as writer:
+        for name in sorted(images):
+            writer.add_image(name, images[name])
+    assert path.read_text(encoding="utf-8") == json.dumps({**extra, "images": images}, indent=2, sort_keys=True)
+
+    empty = tmp_path / "empty.json"
+    with _StreamingLabelsWriter(empty, extra={"schema_version": "0.2.0"}):
+        pass
+    assert empty.read_text(encoding="utf-8") == json.dumps(
+        {"images": {}, "schema_version": "0.2.0"}, indent=2, sort_keys=True
+    )
+
+
+def test_converter_streams_same_bytes_as_single_dump(tmp_path: Path, id_asset: Callable[..., dict[str, str]]) -> None:
+    asset_dir = tmp_path / "asset"
+    id_dir = asset_dir / "images_id"
+    mapping = id_asset(asset_dir, views=3, res=20, parts=4, seed=10)
+
+    expected: dict[str, list[dict]] = {}
+    for view in range(3):
+        arr = np.array(Image.open(id_dir / f"view_{view:03d}.png").convert("RGB"), dtype=np.uint8)
+        expected[f"view_{view:03d}.png"] = extract_view_labels(arr=arr, mapping=mapping, source="x")
+
+    labels_path = convert_asset_id_images_to_labels(asset_dir=asset_dir, write_store=False)
+    payload = {"schema_version": "0.2.0", "images": expected}
+    assert labels_path.read_text(encoding="utf-8") == json.dumps(payload, indent=2, sort_keys=True)
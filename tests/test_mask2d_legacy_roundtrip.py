@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import json
+import pickle
+
+import numpy as np
+
+from assetlens_core.domain.mask_2d import Mask2D
+from assetlens_core.domain.results_2d import Detection2D
+
+
+def test_mask2d_legacy_roundtrip() -> None:
+    rng = np.random.default_rng(11)
+    w, h = 37, 21
+    dense_a = np.zeros((h, w), dtype=bool)
+    dense_a[3:15, 5:30] = rng.random((12, 25)) > 0.3
+    dense_b = np.zeros((h, w), dtype=bool)
+    dense_b[8:20, 20:36] = True
+
+    a = Mask2D.from_indices(np.flatnonzero(dense_a).tolist(), w, h)
+    b = Mask2D.from_dense(dense_b)
+
+    assert a.to_list() == np.flatnonzero(dense_a).tolist()
+    assert Mask2D.from_rle(a.to_rle(), w, h) == a
+    assert b.bbox == (20, 8, 16, 12)
+    assert b.nbytes() == 12 * 2
+
+    dense_iou = float((dense_a & dense_b).sum()) / float((dense_a | dense_b).sum())
+    assert abs(a.iou(b) - dense_iou) < 1e-12
+    assert pickle.loads(pickle.dumps(a)) == a
+
+
+def test_detection2d_serializes_legacy_mask_fields() -> None:
+    legacy = {
+        "schema_version": "0.2.0",
+        "run_id": "r",
+        "image_path": "img.png",
+        "label": "robots",
+        "score": 0.5,
+        "bbox": [1, 1, 2, 1],
+        "mask_indices": [9, 10],
+        "mask_width": 8,
+        "mask_height": 4,
+    }
+    det = Detection2D.model_validate(legacy)
+
+    assert det.mask.bbox == (1, 1, 2, 1)
+    assert json.dumps(det.model_dump(), sort_keys=True) == json.dumps(
+        {**legacy, "bbox": (1, 1, 2, 1)}, sort_keys=True
+    )
+    assert det.model_dump(context={"mask_encoding": "rle"})["mask_rle"] == [9, 2, 21]
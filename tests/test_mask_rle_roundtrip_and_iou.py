@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+from assetlens_core.domain.mask_rle import indices_to_rle, rle_area, rle_iou, rle_to_indices
+from assetlens_core.eval.evaluation_2d import _load_labels, _parse_gt_list
+from assetlens_core.pipelines.pipeline_3d_dataset import convert_asset_id_images_to_labels
+
+
+def test_mask_rle_roundtrip_and_iou() -> None:
+    rng = np.random.default_rng(3)
+    w, h = 13, 9
+    a = rng.random((h, w)) > 0.6
+    b = rng.random((h, w)) > 0.4
+    b[0, 0] = True
+    b[-1, -1] = True
+
+    rle_a = indices_to_rle(np.flatnonzero(a), w, h)
+    rle_b = indices_to_rle(np.flatnonzero(b), w, h)
+
+    assert sum(rle_b) == w * h
+    assert rle_to_indices(rle_a).tolist() == np.flatnonzero(a).tolist()
+    assert rle_area(rle_b) == int(b.sum())
+
+    dense = float(np.logical_and(a, b).sum()) / float(np.logical_or(a, b).sum())
+    assert abs(rle_iou(rle_a, rle_b) - dense) < 1e-12
+    assert rle_iou(indices_to_rle([], w, h), rle_a) == 0.0
+
+
+def test_rle_labels_parse_like_index_labels(tmp_path: Path) -> None:
+    asset_dir = tmp_path / "asset"
+    id_dir = asset_dir / "images_id"
+    id_dir.mkdir(parents=True)
+
+    img = np.zeros((6, 5, 3), dtype=np.uint8)
+    img[0:2, 1:4] = (255, 0, 0)
+    img[3:6, 0:2] = (0, 255, 0)
+    img[5, 4] = (255, 0, 0)
+    Image.fromarray(img).save(id_dir / "view_000.png")
+    (asset_dir / "color_to_part.json").write_text(
+        json.dumps({"#ff0000": "part_a", "#00ff00": "part_b"}), encoding="utf-8"
+    )
+
+    idx_labels = _load_labels(convert_asset_id_images_to_labels(asset_dir=asset_dir))
+    idx_gt = _parse_gt_list("view_000.png", idx_labels["view_000.png"])
+
+    rle_path = convert_asset_id_images_to_labels(asset_dir=asset_dir, mask_encoding="rle")
+    raw = json.loads(rle_path.read_text(encoding="utf-8"))
+    assert raw["mask_encoding"] == "rle"
+    assert "mask_indices" not in raw["images"]["view_000.png"][0]
+
+    rle_gt = _parse_gt_list("view_000.png", raw["images"]["view_000.png"])
+    assert [g.mask for g in rle_gt] == [g.mask for g in idx_gt]
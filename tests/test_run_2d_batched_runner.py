@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+from functools import partial
+from pathlib import Path
+
+import pytest
+
+from assetlens_core.config.config import AssetLens2DConfig, load_yaml_config
+from assetlens_core.pipelines.pipeline_2d_assets import _run_images, run_2d_batch
+from assetlens_core.sam_wrappers.sam2d_runner import FakeSamRunner, MaskResult
+
+
+LABELS = ["grippers", "robots"]
+
+
+class _SingleRunner:
+    def __init__(self) -> None:
+        self.calls: list[str] = []
+
+    def run(self, image_path: str, labels: list[str], width: int, height: int, seed: int) -> list[MaskResult]:
+        self.calls.append(image_path)
+        return FakeSamRunner(2).run(image_path=image_path, labels=labels, width=width, height=height, seed=seed)
+
+
+class _BatchRunner(_SingleRunner):
+    def __init__(self, drop_last: bool = False) -> None:
+        super().__init__()
+        self.batches: list[int] = []
+        self.drop_last = drop_last
+
+    def run_batch(
+        self, images: list[str], labels: list[str], sizes: list[tuple[int, int]], seed: int
+    ) -> list[list[MaskResult]]:
+        self.batches.append(len(images))
+        out = FakeSamRunner(2).run_batch(images=images, labels=labels, sizes=sizes, seed=seed)
+        if self.drop_last:
+            return out[:-1]
+        return out
+
+
+def test_run_images_uses_run_batch_when_available() -> None:
+    paths = [Path(f"img_{i}.png") for i in range(7)]
+    sizes = [(32, 24)] * 7
+
+    single = _SingleRunner()
+    expected = _run_images(single, paths, LABELS, sizes, seed=3, batch_size=3)
+    assert len(single.calls) == 7
+
+    batched = _BatchRunner()
+    assert _run_images(batched, paths, LABELS, sizes, seed=3, batch_size=3) == expected
+    assert batched.batches == [3, 3, 1]
+    assert batched.calls == []
+
+    with pytest.raises(RuntimeError, match="run_batch returned"):
+        _run_images(_BatchRunner(drop_last=True), paths, LABELS, sizes, seed=3, batch_size=3)
+
+
+def test_run_2d_batch_size_does_not_change_outputs(tmp_path: Path) -> None:
+    out = tmp_path / "out"
+    base = load_yaml_config(Path("config_2d.yaml"), AssetLens2DConfig).model_dump(exclude={"run_id"})
+    one = AssetLens2DConfig.model_validate({**base, "output_dir": out, "batch_size": 1})
+    five = AssetLens2DConfig.model_validate({**base, "output_dir": out, "batch_size": 5})
+    assert five.run_id == one.run_id
+
+    expected = run_2d_batch(one)
+    expected_jsonl = (out / "run_2d.jsonl").read_bytes()
+    actual = run_2d_batch(five)
+    assert actual.detections == expected.detections
+    assert (out / "run_2d.jsonl").read_bytes() == expected_jsonl
+
+
+def test_run_2d_batch_uses_runner_factory(tmp_path: Path) -> None:
+    base = load_yaml_config(Path("config_2d.yaml"), AssetLens2DConfig).model_dump(exclude={"run_id"})
+    base["fake_runner"]["max_instances_per_prompt"] = 2
+    config = AssetLens2DConfig.model_validate({**base, "output_dir": tmp_path / "out", "batch_size": 2})
+    expected = run_2d_batch(config).detections
+
+    # Run-only and batched runners both go through the pipeline and match the default runner.
+    runners: list[_SingleRunner] = []
+
+    def factory(cls: type[_SingleRunner]) -> _SingleRunner:
+        runners.append(cls())
+        return runners[-1]
+
+    assert run_2d_batch(config, runner_factory=partial(factory, _SingleRunner)).detections == expected
+    assert run_2d_batch(config, runner_factory=partial(factory, _BatchRunner)).detections == expected
+    single, batched = runners
+    assert len(single.calls) == 2
+    assert batched.calls == []
+    assert batched.batches == [2]
@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from PIL import Image
+
+from assetlens_core.config.config import AssetLens2DConfig, load_yaml_config
+from assetlens_core.pipelines.pipeline_2d_assets import run_2d_batch
+
+
+def test_run_2d_parallel_matches_serial(tmp_path: Path) -> None:
+    dataset = tmp_path / "dataset"
+    (dataset / "images").mkdir(parents=True)
+    for i in range(30):
+        Image.new("RGB", (24 + i % 5, 20 + i % 3)).save(dataset / "images" / f"img_{i:03d}.png")
+
+    out = tmp_path / "out"
+    base = load_yaml_config(Path("config_2d.yaml"), AssetLens2DConfig).model_dump(exclude={"run_id"})
+    serial = AssetLens2DConfig.model_validate({**base, "dataset_dir": dataset, "output_dir": out})
+    parallel = AssetLens2DConfig.model_validate({**base, "dataset_dir": dataset, "output_dir": out, "workers": 3})
+    # workers only changes how the run executes, not what it produces.
+    assert parallel.run_id == serial.run_id
+
+    names = ("run_2d.jsonl", "run_2d_summary.json", "bom_2d.json")
+    expected = run_2d_batch(serial)
+    expected_bytes = {name: (out / name).read_bytes() for name in names}
+    actual = run_2d_batch(parallel)
+    assert actual.detections == expected.detections
+    for name in names:
+        assert (out / name).read_bytes() == expected_bytes[name]
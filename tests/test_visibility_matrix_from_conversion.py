@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import numpy as np
+
+from assetlens_core.domain.visibility import load_visibility
+from assetlens_core.pipelines.pipeline_3d_dataset import convert_asset_id_images_to_labels
+
+
+def test_visibility_matrix_from_conversion(tmp_path: Path) -> None:
+    asset_dir = tmp_path / "asset"
+    id_dir = asset_dir / "images_id"
+    id_dir.mkdir(parents=True)
+
+    view_0 = np.zeros((5, 5), dtype=np.uint16)
+    view_0[0:2, 0:2] = 1
+    view_0[4, 4] = 2
+    view_1 = np.zeros((5, 5), dtype=np.uint16)
+    view_1[1:4, 2:3] = 1
+    np.save(id_dir / "view_000.npy", view_0)
+    np.save(id_dir / "view_001.npy", view_1)
+    (asset_dir / "part_index.json").write_text(
+        json.dumps({"1": "arm", "2": "bolt", "3": "hidden_pin"}), encoding="utf-8"
+    )
+
+    convert_asset_id_images_to_labels(asset_dir=asset_dir)
+    vis = load_visibility(asset_dir / "visibility.npz")
+
+    assert vis.parts == ["arm", "bolt", "hidden_pin"]
+    assert vis.views == ["view_000.png", "view_001.png"]
+    assert vis.area.tolist() == [[4, 3], [1, 0], [0, 0]]
+    assert vis.bbox[0, 1].tolist() == [2, 1, 1, 3]
+    assert vis.bbox[1, 1].tolist() == [-1, -1, -1, -1]
+    assert vis.views_showing("bolt") == ["view_000.png"]
+    assert vis.never_visible() == ["hidden_pin"]
+    assert vis.best_view("arm") == "view_000.png"